@@ -0,0 +1,222 @@
+# backend/app/backplane.py
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Set
+from sqlalchemy.engine import make_url
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (tenant_id, payload) -> local sockets par deliver
+MessageHandler = Callable[[str, str], None]
+
+
+class Backplane:
+    """
+    Workers ke beech broadcast pub/sub ka interface.
+
+    ConnectionManager apne local sockets ko khud deliver karta hai; backplane ka kaam
+    sirf doosre workers tak message pahunchana hai, aur sirf un tenants ke liye jinke
+    sockets us worker par khule hain (subscribe/unsubscribe).
+    """
+
+    async def start(self, on_message: MessageHandler) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def publish(self, tenant_id: str, payload: str) -> None:
+        pass
+
+    async def subscribe(self, tenant_id: str) -> None:
+        pass
+
+    def unsubscribe(self, tenant_id: str) -> None:
+        """
+        Synchronous: tenant turant "not wanted" ho jata hai, asli UNLISTEN baad mein background
+        mein. Isliye iske baad aaya subscribe() hamesha jeet-ta hai.
+        """
+
+
+class InMemoryBackplane(Backplane):
+    """
+    Single-process default: local delivery kaafi hai, publish kuch nahi karta.
+    """
+
+
+class PostgresBackplane(Backplane):
+    """
+    Postgres LISTEN/NOTIFY par backplane; har tenant ka apna channel.
+
+    NOTIFY payload 8000 bytes tak limited hai, isliye bade messages chunks mein jaate
+    hain aur receiver unhe wapas jodta hai. Apne hi worker ke messages (origin) ignore
+    hote hain kyunki woh pehle hi locally deliver ho chuke hain.
+    """
+
+    CHANNEL_PREFIX = "taskflow_tenant_"
+    CHUNK_BYTES = 7000  # Header ke liye 8000 mein se jagah chhodi hai
+    MAX_PARTIAL_MESSAGES = 1000
+
+    def __init__(self, dsn: str, pool_size: int = 4):
+        self.dsn = dsn
+        self.pool_size = pool_size
+        self.origin = uuid.uuid4().hex[:12]
+        self._on_message: Optional[MessageHandler] = None
+        self._listener = None
+        self._pool = None
+        self._wanted: Set[str] = set()
+        self._listening: Set[str] = set()
+        self._lock = asyncio.Lock()
+        self._partial: "OrderedDict[str, List[Optional[str]]]" = OrderedDict()
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._background: Set[asyncio.Task] = set()  # pending UNLISTEN tasks ka strong reference
+        self._stopping = False
+
+    async def start(self, on_message: MessageHandler) -> None:
+        import asyncpg
+
+        self._on_message = on_message
+        self._stopping = False
+        self._pool = await asyncpg.create_pool(self.dsn, min_size=1, max_size=self.pool_size)
+        await self._connect_listener()
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        if self._listener is not None:
+            await self._listener.close()
+            self._listener = None
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+        self._listening.clear()
+
+    async def publish(self, tenant_id: str, payload: str) -> None:
+        if self._pool is None:
+            return
+        channel = self._channel(tenant_id)
+        chunks = self._chunks(payload)
+        msg_id = uuid.uuid4().hex[:12]
+        frames = [
+            f"{self.origin}|{msg_id}|{index}|{len(chunks)}|{chunk}"
+            for index, chunk in enumerate(chunks)
+        ]
+        try:
+            async with self._pool.acquire() as conn:
+                # Ek hi transaction ke NOTIFY order mein aur ek saath deliver hote hain
+                async with conn.transaction():
+                    for frame in frames:
+                        await conn.execute("SELECT pg_notify($1, $2)", channel, frame)
+        except Exception as e:
+            logger.warning("Backplane publish failed for tenant %s: %s", tenant_id, e)
+
+    async def subscribe(self, tenant_id: str) -> None:
+        self._wanted.add(tenant_id)
+        await self._sync(tenant_id)
+
+    def unsubscribe(self, tenant_id: str) -> None:
+        self._wanted.discard(tenant_id)
+        task = asyncio.create_task(self._sync(tenant_id))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _sync(self, tenant_id: str) -> None:
+        # _wanted caller ke saath synchronously badalta hai; yeh sirf LISTEN state ko uske
+        # barabar laata hai, isliye pending UNLISTEN baad ke subscribe ko nahi palat sakta
+        async with self._lock:
+            if self._listener is None or self._listener.is_closed():
+                return  # Reconnect hone par _wanted se dobara LISTEN hoga
+            channel = self._channel(tenant_id)
+            if tenant_id in self._wanted and tenant_id not in self._listening:
+                await self._listener.add_listener(channel, self._on_notify)
+                self._listening.add(tenant_id)
+            elif tenant_id not in self._wanted and tenant_id in self._listening:
+                await self._listener.remove_listener(channel, self._on_notify)
+                self._listening.discard(tenant_id)
+
+    async def _connect_listener(self) -> None:
+        import asyncpg
+
+        async with self._lock:
+            self._listener = await asyncpg.connect(self.dsn)
+            self._listener.add_termination_listener(self._on_terminated)
+            self._listening.clear()
+            for tenant_id in list(self._wanted):
+                await self._listener.add_listener(self._channel(tenant_id), self._on_notify)
+                self._listening.add(tenant_id)
+
+    def _on_terminated(self, connection) -> None:
+        if not self._stopping and self._reconnect_task is None:
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = 0.5
+        try:
+            while not self._stopping:
+                try:
+                    await self._connect_listener()
+                    return
+                except Exception as e:
+                    logger.warning("Backplane listener reconnect failed: %s", e)
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, 30)
+        finally:
+            self._reconnect_task = None
+
+    def _on_notify(self, connection, pid: int, channel: str, frame: str) -> None:
+        try:
+            origin, msg_id, index, count, chunk = frame.split("|", 4)
+            index, count = int(index), int(count)
+        except ValueError:
+            return
+        if origin == self.origin or self._on_message is None:
+            return
+        tenant_id = channel[len(self.CHANNEL_PREFIX):]
+        if count == 1:
+            self._on_message(tenant_id, chunk)
+            return
+
+        key = f"{origin}:{msg_id}"
+        parts = self._partial.get(key)
+        if parts is None:
+            parts = self._partial[key] = [None] * count
+            while len(self._partial) > self.MAX_PARTIAL_MESSAGES:
+                self._partial.popitem(last=False)
+        parts[index] = chunk
+        if all(part is not None for part in parts):
+            del self._partial[key]
+            self._on_message(tenant_id, "".join(parts))
+
+    @classmethod
+    def _channel(cls, tenant_id: str) -> str:
+        # add_listener channel ko quote karta hai; 63 chars Postgres identifier limit hai
+        return f"{cls.CHANNEL_PREFIX}{tenant_id}"[:63]
+
+    @classmethod
+    def _chunks(cls, payload: str) -> List[str]:
+        chunks = []
+        start = 0
+        while True:
+            piece = payload[start:start + cls.CHUNK_BYTES]
+            # Bytes par kaatein; beech mein kata multi-byte char agle chunk mein jata hai
+            piece = piece.encode("utf-8")[:cls.CHUNK_BYTES].decode("utf-8", "ignore")
+            chunks.append(piece)
+            start += len(piece)
+            if start >= len(payload):
+                return chunks
+
+
+def _asyncpg_dsn(url: str) -> str:
+    # SQLAlchemy URL (postgresql+psycopg2://...) ko plain libpq DSN mein badlein
+    return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def create_backplane() -> Backplane:
+    if settings.BROADCAST_BACKEND == "postgres":
+        return PostgresBackplane(_asyncpg_dsn(settings.BROADCAST_URL or settings.DATABASE_URL))
+    return InMemoryBackplane()
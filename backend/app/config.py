@@ -1,12 +1,99 @@
 # backend/app/config.py
 
 from pydantic_settings import BaseSettings
+from typing import Dict, List, Literal, Optional
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Async engine ka URL; khali ho to DATABASE_URL se driver badal kar banta hai
+    # (postgresql -> postgresql+asyncpg, sqlite -> sqlite+aiosqlite)
+    ASYNC_DATABASE_URL: Optional[str] = None
     JWT_SECRET_KEY: str
     ALGORITHM: str = "HS256"
 
+    # Connection pool (sync aur async engine dono par, har worker process ke liye).
+    # SQLite par ignore hota hai.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+
+    # Read replicas (JSON list, e.g. '["postgresql://app@replica-1/taskflow"]'); khali ho to
+    # saare reads primary par. Replica pools alag tune hote hain, aur chhota timeout taaki
+    # pool bhara ho ya replica down ho to request jaldi primary par chali jaye.
+    READ_REPLICA_URLS: List[str] = []
+    REPLICA_POOL_SIZE: int = 10
+    REPLICA_MAX_OVERFLOW: int = 20
+    REPLICA_POOL_TIMEOUT: int = 2
+    # Connect error ke baad replica itne seconds rotation se bahar rehta hai
+    REPLICA_RETRY_SECONDS: float = 30.0
+    # User ki apni write ke baad itne seconds tak uske reads primary par (read-your-writes).
+    # Marker (cookie/header) client ke saath jaata hai, isliye har worker par lagu hota hai.
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Tenant shards (JSON object, e.g. '{"eu1": "postgresql://app@shard-eu1/taskflow"}'). DATABASE_URL
+    # "default" shard hai aur shard directory bhi wahi rakhta hai; khali ho to sharding band.
+    SHARD_URLS: Dict[str, str] = {}
+    # Naye tenants is shard par bante hain
+    SHARD_FOR_NEW_TENANTS: str = "default"
+    # tenant -> shard mapping har worker mein itni der cache hoti hai (move tool isse zyada rukta hai)
+    SHARD_DIRECTORY_TTL_SECONDS: float = 5.0
+    # Sharding mein har worker ek baar mein itne ids reserve karta hai (dekhein app.database.ShardIds)
+    SHARD_ID_BLOCK_SIZE: int = 1000
+
+    # get_current_user principal cache (0 TTL = cache off). Har worker ki apni copy hai:
+    # member remove hone par invalidation backplane se sab workers ko jaata hai, lekin
+    # BROADCAST_BACKEND=memory ke saath kai workers hon (ya notification chhoot jaye) to
+    # doosre workers purani entry zyada se zyada itne seconds tak maan sakte hain.
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+
+    # bcrypt executor: worker threads aur max in-flight (queued + running) jobs
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 16
+
+    # Websocket fan-out: har connection ki outgoing queue aur slow client policy
+    # ("disconnect" = queue bhar jaye to socket evict, "drop_oldest" = purana message chhod dein)
+    WS_SEND_QUEUE_SIZE: int = 100
+    WS_SLOW_CONSUMER_POLICY: Literal["disconnect", "drop_oldest"] = "disconnect"
+    WS_SEND_TIMEOUT_SECONDS: float = 10.0
+    # Ek connection itne topics tak subscribe kar sakta hai (dekhein app.topics)
+    WS_MAX_TOPICS: int = 100
+    # ?compress=deflate wale connections par itne bytes se bade frames zlib se (is level par)
+    WS_COMPRESS_MIN_BYTES: int = 1024
+    WS_COMPRESS_LEVEL: int = 6
+
+    # Multi-worker broadcast: "memory" (single process) ya "postgres" (LISTEN/NOTIFY).
+    # BROADCAST_URL khali ho to DATABASE_URL use hota hai.
+    BROADCAST_BACKEND: Literal["memory", "postgres"] = "memory"
+    BROADCAST_URL: Optional[str] = None
+
+    # Per-tenant micro-batching: itne ms tak events jama karke ek "batch" message bhejein
+    # (0 = band). Ek hi task ke repeated task_update mein sirf aakhri state jaati hai.
+    WS_COALESCE_WINDOW_MS: int = 0
+
+    # Event log: har tenant ke aakhri itne events replay ke liye rakhe jaate hain,
+    # aur purane events har PRUNE_EVERY events par delete hote hain
+    EVENT_LOG_RETENTION: int = 1000
+    EVENT_LOG_PRUNE_EVERY: int = 100
+
+    # Due-date scheduler: itne ghanton tak ke due tasks memory (heap) mein; horizon khatam
+    # hone par agla hissa index se load hota hai
+    DUE_SCHEDULER_ENABLED: bool = True
+    DUE_SCHEDULER_HORIZON_HOURS: float = 24.0
+
+    # `python -m app.frontend_build` ka output is path par serve hota hai. Khali ho to repo ka
+    # frontend/dist; directory na ho (build nahi chala) to frontend mount nahi hota.
+    FRONTEND_DIST_DIR: Optional[str] = None
+    FRONTEND_MOUNT_PATH: str = "/app"
+
+    # "app.*" loggers ka level, aur WARNING se neeche ke records ka kitna fraction log ho
+    LOG_LEVEL: str = "INFO"
+    LOG_SAMPLE_RATE: float = 0.1
+
+    # Startup par alembic_version ko migrations ke head se milayein; mismatch par worker start nahi hota
+    SCHEMA_VERSION_CHECK: bool = True
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -1,19 +1,469 @@
 # backend/app/database.py
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import hashlib
+import hmac
+import itertools
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+from fastapi import Request
+from sqlalchemy import (
+    Boolean, Column, Integer, String, Table, case, create_engine, event, false, func, insert, select,
+    update,
+)
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from app.config import settings
+from app.metrics import (
+    instrument_engine, TimedQueuePool, TimedAsyncAdaptedQueuePool, TimedReplicaQueuePool,
+)
+
+logger = logging.getLogger(__name__)
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# Sync URL ke backend se async driver chunein
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def _async_database_url(url: str, override: Optional[str] = None):
+    if override:
+        return make_url(override)
+    parsed = make_url(url)
+    return parsed.set(drivername=ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername))
+
+def _pool_options(url, poolclass, replica: bool = False) -> dict:
+    # SQLite ke pools (file/memory) pool_size waghera accept nahi karte
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": poolclass,  # Checkout wait time /metrics mein jata hai
+        "pool_size": settings.REPLICA_POOL_SIZE if replica else settings.DB_POOL_SIZE,
+        "max_overflow": settings.REPLICA_MAX_OVERFLOW if replica else settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.REPLICA_POOL_TIMEOUT if replica else settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+def _create_engines(url: str, async_override: Optional[str] = None):
+    sync_engine = create_engine(url, **_pool_options(url, TimedQueuePool))
+    instrument_engine(sync_engine)
+    async_url = _async_database_url(url, async_override)
+    async_engine = create_async_engine(async_url, **_pool_options(async_url, TimedAsyncAdaptedQueuePool))
+    instrument_engine(async_engine.sync_engine)
+    return sync_engine, async_engine
+
+# DATABASE_URL "default" shard hai; shard directory aur id blocks bhi isi mein rehte hain
+DEFAULT_SHARD = "default"
+
+engine, async_engine = _create_engines(SQLALCHEMY_DATABASE_URL, settings.ASYNC_DATABASE_URL)
+ASYNC_DATABASE_URL = async_engine.url
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+shard_engines: Dict[str, Engine] = {DEFAULT_SHARD: engine}
+async_shard_engines = {DEFAULT_SHARD: async_engine}
+for shard_name, shard_url in settings.SHARD_URLS.items():
+    if shard_name != DEFAULT_SHARD:
+        shard_engines[shard_name], async_shard_engines[shard_name] = _create_engines(shard_url)
+
+replica_engines = [
+    create_engine(url, **_pool_options(url, TimedReplicaQueuePool, replica=True))
+    for url in settings.READ_REPLICA_URLS
+]
+for replica_engine in replica_engines:
+    instrument_engine(replica_engine)
+
+# Bind har read session ke liye alag (jo replica chuna gaya)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False)
 
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
+# Shard directory: tenant kis shard par hai. Jo tenant yahan nahi, woh default shard par hai.
+tenant_shards = Table(
+    "tenant_shards", Base.metadata,
+    Column("tenant_id", Integer, primary_key=True, autoincrement=False),
+    Column("shard", String(50), nullable=False),
+    # Move tool copy ke dauran set karta hai; tab tenant ke saare DB access TenantMoving dete hain
+    Column("moving", Boolean, nullable=False, default=False, server_default=false()),
+)
+
+# Sharding mein tenants/users/tasks ke ids yahan se blocks mein milte hain, taaki saare shards
+# par unique rahein aur move mein rows apne ids ke saath copy ho sakein
+id_blocks = Table(
+    "id_blocks", Base.metadata,
+    Column("name", String(50), primary_key=True),
+    Column("next_id", Integer, nullable=False),
+)
+
+
+class TenantMoving(Exception):
+    """
+    Tenant abhi doosre shard par move ho raha hai; request thodi der baad dobara karein.
+    """
+
+    def __init__(self, tenant_id: int):
+        super().__init__(f"Tenant {tenant_id} is moving between shards")
+        self.tenant_id = tenant_id
+
+
+class ShardRouter:
+    """
+    tenant_id -> shard engine. Mapping default shard ki tenant_shards table se aati hai aur
+    har worker mein ttl_seconds tak cache hoti hai; sirf ek shard ho to directory padhi hi
+    nahi jaati.
+    """
+
+    def __init__(self, engines: Dict[str, Engine], async_engines: Dict, ttl_seconds: float):
+        self.engines = engines
+        self.async_engines = async_engines
+        self.ttl_seconds = ttl_seconds
+        self._cache: Dict[int, tuple] = {}
+        # Sync sessions threadpool mein bhi route hote hain
+        self._lock = threading.Lock()
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.engines)
+
+    @property
+    def sharded(self) -> bool:
+        return len(self.engines) > 1
+
+    @property
+    def directory(self) -> Engine:
+        return self.engines[DEFAULT_SHARD]
+
+    def _query(self, tenant_id: int):
+        return (
+            select(tenant_shards.c.shard, tenant_shards.c.moving)
+            .where(tenant_shards.c.tenant_id == tenant_id)
+        )
+
+    @staticmethod
+    def _entry(row) -> tuple:
+        return (row.shard, bool(row.moving)) if row is not None else (DEFAULT_SHARD, False)
+
+    def lookup(self, tenant_id: int) -> tuple:
+        """
+        Directory se seedha (shard, moving), cache ke bina.
+        """
+        with self.directory.connect() as conn:
+            return self._entry(conn.execute(self._query(tenant_id)).first())
+
+    async def lookup_async(self, tenant_id: int) -> tuple:
+        # Wahi lookup, async directory engine par (event loop block nahi hota)
+        async with self.async_engines[DEFAULT_SHARD].connect() as conn:
+            return self._entry((await conn.execute(self._query(tenant_id))).first())
+
+    def _cached(self, tenant_id: int) -> Optional[tuple]:
+        with self._lock:
+            entry = self._cache.get(tenant_id)
+        return entry if entry is not None and entry[0] > time.monotonic() else None
+
+    def _remember(self, tenant_id: int, shard: str, moving: bool) -> tuple:
+        if shard not in self.engines:
+            raise RuntimeError(f"Tenant {tenant_id} is on unknown shard {shard!r}")
+        entry = (time.monotonic() + self.ttl_seconds, shard, moving)
+        with self._lock:
+            self._cache[tenant_id] = entry
+        return entry
+
+    @staticmethod
+    def _shard(tenant_id: int, entry: tuple) -> str:
+        if entry[2]:
+            raise TenantMoving(tenant_id)
+        return entry[1]
+
+    def shard_of(self, tenant_id: Optional[int]) -> str:
+        """
+        Sync sessions (threadpool, CLI) ke liye; async code shard_of_async use kare.
+        """
+        if tenant_id is None or not self.sharded:
+            return DEFAULT_SHARD
+        entry = self._cached(tenant_id) or self._remember(tenant_id, *self.lookup(tenant_id))
+        return self._shard(tenant_id, entry)
+
+    async def shard_of_async(self, tenant_id: Optional[int]) -> str:
+        if tenant_id is None or not self.sharded:
+            return DEFAULT_SHARD
+        entry = self._cached(tenant_id) or self._remember(tenant_id, *await self.lookup_async(tenant_id))
+        return self._shard(tenant_id, entry)
+
+    def assign(self, tenant_id: int, shard: str) -> None:
+        if shard not in self.engines:
+            raise ValueError(f"Unknown shard: {shard}")
+        with self.directory.begin() as conn:
+            conn.execute(insert(tenant_shards).values(tenant_id=tenant_id, shard=shard, moving=False))
+        with self._lock:
+            self._cache.pop(tenant_id, None)
+
+    def place_tenant(self) -> Optional[int]:
+        """
+        Naye tenant ka id allocate karke use SHARD_FOR_NEW_TENANTS par directory mein daalein.
+        Ek hi shard ho to None (id tenants table deti hai).
+        """
+        if not self.sharded:
+            return None
+        tenant_id = shard_ids.next("tenants")
+        self.assign(tenant_id, settings.SHARD_FOR_NEW_TENANTS)
+        return tenant_id
+
+
+class ShardIds:
+    """
+    Sharding mein ids ka source: id_blocks row se block_size ids ek UPDATE mein reserve hote hain
+    aur process mein baante jaate hain. Block ki shuruaat table ke max(id) ke paar rakhi jaati
+    hai, taaki sharding se pehle (DB sequence se) bani rows se takraav na ho.
+    """
+
+    def __init__(self, engine: Engine, block_size: int, enabled: bool):
+        self.engine = engine
+        self.block_size = block_size
+        self.enabled = enabled
+        self._blocks: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def next(self, name: str) -> int:
+        with self._lock:
+            start, end = self._blocks.get(name, (0, 0))
+            if start >= end:
+                start, end = self._reserve(name)
+            self._blocks[name] = (start + 1, end)
+        return start
+
+    def default(self, name: str):
+        """
+        Model ke id column ka default: sharding mein block se id, warna None (DB sequence).
+        """
+        if not self.enabled:
+            return None
+        return lambda: self.next(name)
+
+    def _reserve(self, name: str) -> tuple:
+        table = Base.metadata.tables[name]
+        with self.engine.begin() as conn:
+            floor = conn.scalar(select(func.coalesce(func.max(table.c.id), 0)))
+            current = id_blocks.c.next_id
+            start = case((current > floor, current), else_=floor + 1)
+            end = conn.execute(
+                update(id_blocks).where(id_blocks.c.name == name)
+                .values(next_id=start + self.block_size).returning(id_blocks.c.next_id)
+            ).scalar()
+            if end is None:
+                raise RuntimeError(f"id_blocks has no row for {name!r}; run alembic upgrade head")
+        return end - self.block_size, end
+
+
+shard_router = ShardRouter(shard_engines, async_shard_engines, settings.SHARD_DIRECTORY_TTL_SECONDS)
+shard_ids = ShardIds(engine, settings.SHARD_ID_BLOCK_SIZE, enabled=shard_router.sharded)
+
+
+def _session_tenant(info: dict) -> Optional[int]:
+    tenant_id = info.get("tenant_id")
+    if tenant_id is None and "request_state" in info:
+        # get_current_user token se tenant yahan rakhta hai, session ki pehli query se pehle
+        tenant_id = getattr(info["request_state"], "tenant_id", None)
+    return tenant_id
+
+
+def _session_shard(info: dict) -> str:
+    return info.get("shard") or shard_router.shard_of(_session_tenant(info))
+
+
+class TenantSession(Session):
+    """
+    Session jiska engine pehli query par chunta hai: info["shard"], info["tenant_id"], ya
+    get_db ke request ka tenant. Inme se kuch na ho (signup, login) to default shard.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.bind is not None:
+            return super().get_bind(mapper, clause, **kw)
+        return shard_router.engines[_session_shard(self.info)]
+
+
+class AsyncTenantSession(Session):
+    """
+    AsyncSession ke andar wala sync Session; async engine ka sync_engine lautata hai.
+    get_bind event loop par chalta hai, isliye yahan directory lookup (I/O) nahi hota: shard
+    pehle se info["shard"] mein hona chahiye (get_async_db / shard_of_async).
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.bind is not None:
+            return super().get_bind(mapper, clause, **kw)
+        shard = self.info.get("shard")
+        if shard is None:
+            if shard_router.sharded:
+                raise RuntimeError("Async session has no shard; resolve it with shard_router.shard_of_async")
+            shard = DEFAULT_SHARD
+        return shard_router.async_engines[shard].sync_engine
+
+
+SessionLocal = sessionmaker(class_=TenantSession, autocommit=False, autoflush=False)
+
+# expire_on_commit=False: commit ke baad attributes par lazy load (aur implicit IO) na ho
+AsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession, sync_session_class=AsyncTenantSession, autoflush=False, expire_on_commit=False
+)
+
+
+class ReplicaSet:
+    """
+    Replica engines par round-robin. Jis replica par connect fail ho, woh retry_seconds
+    tak rotation se bahar rehta hai; sab bahar hon to reads primary par jaate hain.
+    """
+
+    def __init__(self, engines: List, retry_seconds: float):
+        self.engines = engines
+        self.retry_seconds = retry_seconds
+        self._down_until: Dict[int, float] = {}
+        self._counter = itertools.count()
+
+    def candidates(self) -> List:
+        if not self.engines:
+            return []
+        now = time.monotonic()
+        start = next(self._counter) % len(self.engines)
+        ordered = self.engines[start:] + self.engines[:start]
+        return [e for e in ordered if self._down_until.get(id(e), 0.0) <= now]
+
+    def mark_down(self, replica) -> None:
+        self._down_until[id(replica)] = time.monotonic() + self.retry_seconds
+
+
+class WriteMarker:
+    """
+    Read-your-writes marker jo client ke saath chalta hai (cookie ya header), kisi worker ki
+    memory mein nahi: "<user id>.<deadline ms>.<hmac>". Koi bhi worker isse verify kar sakta hai.
+    """
+
+    def __init__(self, window_seconds: float, secret: str):
+        self.window_seconds = window_seconds
+        # Access tokens wali key seedhe nahi; marker kabhi token ki jagah verify na ho
+        self._key = hashlib.sha256(b"read-your-writes:" + secret.encode()).digest()
+
+    def _sign(self, body: str) -> str:
+        return hmac.new(self._key, body.encode(), hashlib.sha256).hexdigest()[:32]
+
+    def issue(self, user_id: int) -> str:
+        body = f"{user_id}.{int((time.time() + self.window_seconds) * 1000)}"
+        return f"{body}.{self._sign(body)}"
+
+    def is_recent(self, marker: Optional[str], user_id: Optional[int]) -> bool:
+        if not marker or user_id is None:
+            return False
+        body, _, signature = marker.rpartition(".")
+        marker_user, _, deadline = body.partition(".")
+        if marker_user != str(user_id) or not deadline.isdigit():
+            return False
+        if not hmac.compare_digest(signature, self._sign(body)):
+            return False
+        return int(deadline) > time.time() * 1000
+
+
+replicas = ReplicaSet(replica_engines, settings.REPLICA_RETRY_SECONDS)
+write_marker = WriteMarker(settings.READ_YOUR_WRITES_SECONDS, settings.JWT_SECRET_KEY)
+# Browser same-origin par cookie se, API clients header wapas bhej kar
+WRITE_MARKER_COOKIE = "rw_until"
+WRITE_MARKER_HEADER = "x-read-your-writes"
+
+
+def _flag_commit(session):
+    # Reads commit nahi karte, isliye commit hona matlab request ne kuch likha
+    session.info["committed"] = True
+
+# AsyncSession ke andar bhi sync Session hi commit karta hai
+event.listen(Session, "after_commit", _flag_commit)
+
+
+def _note_writes(request: Request, db_info: dict) -> None:
+    principal_id = getattr(request.state, "principal_id", None)
+    if replica_engines and principal_id is not None and db_info.get("committed"):
+        # ReadYourWritesMiddleware ise response par cookie aur header bana deta hai
+        request.state.write_marker = write_marker.issue(principal_id)
+
+
+def request_write_marker(request: Request) -> Optional[str]:
+    return request.headers.get(WRITE_MARKER_HEADER) or request.cookies.get(WRITE_MARKER_COOKIE)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pure ASGI middleware: request ne commit kiya ho to response par signed marker (cookie +
+    header) lagata hai. Agli reads kisi bhi worker par us marker se primary par jaati hain.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not replica_engines:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            # Dependencies ka exit code (_note_writes) response start se pehle chal chuka hota hai
+            marker = scope.get("state", {}).get("write_marker")
+            if message["type"] == "http.response.start" and marker:
+                max_age = max(int(write_marker.window_seconds), 1)
+                cookie = f"{WRITE_MARKER_COOKIE}={marker}; Max-Age={max_age}; Path=/; HttpOnly; SameSite=Lax"
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"set-cookie", cookie.encode()),
+                    (WRITE_MARKER_HEADER.encode(), marker.encode()),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def open_read_session(
+    user_id: Optional[int] = None, tenant_id: Optional[int] = None, marker: Optional[str] = None
+) -> Session:
+    """
+    Read-only kaam ke liye session: kisi healthy replica par, ya primary par agar user ka
+    write marker (request_write_marker) abhi valid hai, replicas configure nahi hain, ya sab
+    replicas fail ho gaye. Connection yahin checkout hota hai, taaki fallback query chalne se
+    pehle ho jaye. Replicas default shard ke hain; baaki shards ke tenants seedha apne shard
+    se padhte hain.
+    """
+    on_default = shard_router.shard_of(tenant_id) == DEFAULT_SHARD
+    if on_default and not write_marker.is_recent(marker, user_id):
+        for replica in replicas.candidates():
+            db = ReadSessionLocal(bind=replica)
+            try:
+                db.connection()
+                db.info["replica"] = replica
+                return db
+            except (OperationalError, PoolTimeoutError) as e:
+                db.close()
+                replicas.mark_down(replica)
+                logger.warning("Read replica %s unavailable, skipping: %s", replica.url, e)
+    return SessionLocal(info={"tenant_id": tenant_id})
+
+
+def get_db(request: Request):
+    # Shard current user ke tenant se (dekhein TenantSession)
+    db = SessionLocal(info={"request_state": request.state})
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        _note_writes(request, db.info)
+        db.close()
+
+@asynccontextmanager
+async def open_async_session(request: Request, tenant_id: Optional[int]):
+    """
+    Request ke liye AsyncSession, tenant ka shard pehle hi async directory engine se resolve
+    karke. get_async_db (app.dependencies) isse current user ke tenant ke saath bulata hai.
+    """
+    shard = await shard_router.shard_of_async(tenant_id)
+    async with AsyncSessionLocal(info={"shard": shard, "request_state": request.state}) as db:
+        try:
+            yield db
+        finally:
+            _note_writes(request, db.info)
@@ -1,18 +1,26 @@
 # app/dependencies.py
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, Response, WebSocket, WebSocketException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import (
+    AsyncSessionLocal, get_db, open_async_session, open_read_session, replicas, request_write_marker, shard_router,
+)
 from app.models.user import User
-from typing import Optional
+from app.models.tenant import Tenant
+from app.principal_cache import principal_cache
+from typing import Optional, Tuple
 from datetime import datetime, timedelta
+import hashlib
+import logging
 
 # --- Import the settings object ---
 from app.config import settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+logger = logging.getLogger(__name__)
 
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -22,25 +30,129 @@ def create_access_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    # Is line ko isse badal dein
+def _token_claims(token: Optional[str]) -> Optional[Tuple[int, Optional[int], Optional[int]]]:
+    """
+    JWT verify karke (user id, tenant id, exp) lautayein; invalid, expired ya missing token par None.
+    "tid" se user ka shard milta hai; purane tokens mein woh nahi hota (default shard).
+    """
+    if not token:
+        return None
+    try:
+        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError as e:
+        # e.g. signature invalid ya expired
+        logger.info("Rejected token: %s", e)
+        return None
+    user_id: Optional[str] = payload.get("sub")
+    if user_id is None:
+        logger.info("Rejected token without sub claim")
+        return None
+    tenant_id = payload.get("tid")
+    return int(user_id), int(tenant_id) if tenant_id is not None else None, payload.get("exp")
+
+def get_current_user(
+    request: Request, token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.ALGORITHM])
-        print("JWT Payload:", payload)  # Debug: Print payload
-        user_id: Optional[str] = payload.get("sub")
-        if user_id is None:
-            print("No sub in payload")  # Debug
-            raise credentials_exception
-    except JWTError as e:
-        print("JWT Decode Error:", str(e))  # Debug: e.g., signature invalid or expired
+    claims = _token_claims(token)
+    if claims is None:
         raise credentials_exception
-    
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    user_id, request.state.tenant_id, _ = claims
+
+    # get_db/get_async_db isse commit ke baad user ko read-your-writes window mein daalte hain
+    request.state.principal_id = user_id
+
+    # Hot path: cache hit par DB round trip nahi hota
+    user = principal_cache.get(user_id)
     if user is None:
-        raise credentials_exception
-    return user
\ No newline at end of file
+        # db request.state.tenant_id ke shard par query karta hai
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            raise credentials_exception
+        principal_cache.put(user)
+    # Baaki sessions (get_async_db, aur tid ke bina purane tokens) user ke tenant ke shard par
+    request.state.tenant_id = user.tenant_id
+    return user
+
+async def get_websocket_user(websocket: WebSocket, token: Optional[str] = None) -> User:
+    """
+    Websocket ke liye get_current_user. Browser WebSocket headers set nahi kar sakta, isliye
+    JWT ?token= query param se, ya Authorization: Bearer header se. Invalid par 1008 close.
+    Token ka exp websocket.state.token_expires_at mein; socket us waqt band hota hai.
+    """
+    if token is None:
+        scheme, _, value = websocket.headers.get("authorization", "").partition(" ")
+        token = value if scheme.lower() == "bearer" else None
+    claims = _token_claims(token)
+    if claims is None:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION)
+    user_id, tenant_id, websocket.state.token_expires_at = claims
+
+    user = principal_cache.get(user_id)
+    if user is None:
+        shard = await shard_router.shard_of_async(tenant_id)
+        async with AsyncSessionLocal(info={"shard": shard}) as db:
+            user = await db.get(User, user_id)
+        if user is None:
+            raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION)
+        principal_cache.put(user)
+    return user
+
+async def get_async_db(request: Request, current_user: User = Depends(get_current_user)):
+    """
+    Async handlers ka session, current user ke tenant ke shard par. Shard yahin async
+    directory lookup se resolve hota hai, taaki session bind karte waqt loop par I/O na ho.
+    """
+    async with open_async_session(request, current_user.tenant_id) as db:
+        yield db
+
+def get_read_db(request: Request, current_user: User = Depends(get_current_user)):
+    """
+    Read-only endpoints ke liye session: replica par, ya user ki haal ki write ke baad
+    (aur replica fail hone par) primary par. Isme kuch likhein nahi.
+    """
+    db = open_read_session(current_user.id, current_user.tenant_id, request_write_marker(request))
+    try:
+        yield db
+    except OperationalError:
+        # Query ke beech replica gaya; agli requests doosre replica/primary par jaati hain
+        replica = db.info.get("replica")
+        if replica is not None:
+            replicas.mark_down(replica)
+        raise
+    finally:
+        db.close()
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison (RFC 9110): W/ prefix ignore karein
+    return "*" in candidates or etag in [tag[2:] if tag.startswith("W/") else tag for tag in candidates]
+
+def tenant_etag(
+    request: Request,
+    response: Response,
+    # Version aur data ek hi (read) session se, taaki lagging replica ka stale data naye ETag ke saath cache na ho
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Tenant ke change version (tenants.event_seq) se ETag banayein; If-None-Match match
+    ho to 304 raise karein. Har mutating handler event record karta hai jo version badhata
+    hai, isliye 304 path sirf tenants ki primary key lookup karta hai.
+    """
+    version = db.query(Tenant.event_seq).filter(Tenant.id == current_user.tenant_id).scalar()
+    # Response user (is_my_tasks, /users/me) aur query params par bhi depend karta hai
+    variant = f"{current_user.id}|{request.url.path}|{sorted(request.query_params.multi_items())}"
+    digest = hashlib.sha1(variant.encode("utf-8")).hexdigest()[:16]
+    etag = f'"{current_user.tenant_id}-{version}-{digest}"'
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    return etag
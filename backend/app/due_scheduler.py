@@ -0,0 +1,211 @@
+# backend/app/due_scheduler.py
+"""
+Due-date scheduler. Agle DUE_SCHEDULER_HORIZON_HOURS mein due tasks ek in-memory min-heap
+mein rehte hain; ek asyncio task sabse pehli due date tak sota hai aur due hote hi
+"task_overdue" event bhejta hai. Tasks table ka periodic scan nahi hota.
+
+Heap startup par, aur har horizon ke end par, partial index ix_tasks_due_pending ki range
+query se bharta hai. Task routes ise schedule()/unschedule() se current rakhte hain. Purani
+heap entries hatayi nahi jaatin; pop par _due se match na hon to skip ho jaati hain.
+
+Event se pehle task ka overdue_notified_at ek conditional UPDATE se claim hota hai, isliye har
+due date ka event ek hi baar jata hai: restart ke baad bhi aur kai workers ke saath bhi.
+Sharding mein load aur claim har shard par chalte hain (task ids saare shards mein unique hain).
+"""
+import asyncio
+import heapq
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select, update
+
+from app.config import settings
+from app.database import AsyncSessionLocal, shard_router
+from app.event_log import record_event
+from app.models.task import Task
+from app.routers.websocket import manager
+from app.schemas.task import TaskStatus
+
+logger = logging.getLogger(__name__)
+
+# DB error ke baad itne seconds ruk kar dobara koshish
+RETRY_SECONDS = 5.0
+# Ek claim UPDATE mein itne tasks tak
+FIRE_BATCH_SIZE = 500
+
+
+class DueDateScheduler:
+    def __init__(self, manager, horizon: timedelta, enabled: bool = True):
+        self.manager = manager
+        self.horizon = horizon
+        self.enabled = enabled
+        self._heap: List[Tuple[datetime, int]] = []
+        self._due: Dict[int, datetime] = {}
+        # Heap mein itne tak ki due dates hain; None matlab abhi load nahi hua
+        self._loaded_until: Optional[datetime] = None
+        # Load ke dauran schedule/unschedule hue tasks; query ka (purana) snapshot inhe na badle
+        self._touched: Optional[Set[int]] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self.enabled and self._task is None:
+            # Event chalte loop se bandha hota hai, isliye yahin banta hai
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._heap, self._due, self._loaded_until = [], {}, None
+
+    def schedule(self, task_id: int, due_date: Optional[datetime]):
+        """
+        Task ki (nayi) due date, commit ke baad; column jaisi naive UTC (TaskBase validator
+        API input ko pehle hi badal deta hai). None ya horizon ke baad ki date par task heap
+        se hat jata hai; horizon wali date agle load mein aati hai.
+        """
+        if self._touched is not None:
+            self._touched.add(task_id)
+        if due_date is None or self._loaded_until is None or due_date > self._loaded_until:
+            self._due.pop(task_id, None)
+            return
+        if self._due.get(task_id) == due_date:
+            return
+        self._due[task_id] = due_date
+        heapq.heappush(self._heap, (due_date, task_id))
+        if len(self._heap) > 2 * len(self._due) + 1000:
+            # Stale entries bahut ho gayi: sirf current wali rakhein
+            self._heap = [(due, tid) for tid, due in self._due.items()]
+            heapq.heapify(self._heap)
+        if self._heap[0] == (due_date, task_id) and self._wakeup is not None:
+            # Naya sabse pehla deadline: sota hua loop jaldi jaage
+            self._wakeup.set()
+
+    def unschedule(self, task_id: int):
+        if self._touched is not None:
+            self._touched.add(task_id)
+        self._due.pop(task_id, None)
+
+    async def reload(self):
+        """
+        Horizon dobara index se padhein, e.g. bulk import ke baad jiske ids routes ko nahi milte.
+        """
+        if self._loaded_until is not None:
+            await self._load(self._loaded_until)
+
+    async def _run(self):
+        while True:
+            try:
+                if self._loaded_until is None or datetime.utcnow() >= self._loaded_until:
+                    await self._load(datetime.utcnow() + self.horizon)
+                await self._fire_due()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Due-date scheduler failed; retrying in %.0fs", RETRY_SECONDS)
+                await asyncio.sleep(RETRY_SECONDS)
+                continue
+            # Clear pehle, taaki ab ke baad ka schedule() wait ko turant jaga de
+            self._wakeup.clear()
+            wake_at = min(self._heap[0][0], self._loaded_until) if self._heap else self._loaded_until
+            delay = (wake_at - datetime.utcnow()).total_seconds()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _load(self, until: datetime):
+        self._touched = set()
+        rows = []
+        try:
+            for shard in shard_router.names:
+                async with AsyncSessionLocal(info={"shard": shard}) as db:
+                    result = await db.execute(
+                        select(Task.id, Task.due_date).where(
+                            Task.due_date.is_not(None),
+                            Task.overdue_notified_at.is_(None),
+                            Task.due_date <= until,
+                        )
+                    )
+                    rows += result.all()
+            touched = self._touched
+        finally:
+            self._touched = None
+        self._loaded_until = until
+        for task_id, due_date in rows:
+            if task_id not in touched:
+                self.schedule(task_id, due_date)
+        logger.info("Due-date scheduler loaded %d tasks due before %s", len(rows), until.isoformat())
+
+    async def _fire_due(self):
+        now = datetime.utcnow()
+        due: List[Tuple[datetime, int]] = []
+        while self._heap and self._heap[0][0] <= now and len(due) < FIRE_BATCH_SIZE:
+            due_date, task_id = heapq.heappop(self._heap)
+            if self._due.get(task_id) == due_date:
+                del self._due[task_id]
+                due.append((due_date, task_id))
+        if not due:
+            return
+        task_ids = [task_id for _, task_id in due]
+        try:
+            for shard in shard_router.names:
+                for tenant_id, event in await self._claim(shard, task_ids, now):
+                    await self.manager.broadcast(str(tenant_id), event)
+        except Exception:
+            # Agli koshish ke liye wapas (jab tak beech mein route ne naya schedule na kiya ho);
+            # jo pehle hi claim ho gaye, unhe UPDATE dobara nahi chhoota
+            for due_date, task_id in due:
+                if task_id not in self._due:
+                    self.schedule(task_id, due_date)
+            raise
+
+    async def _claim(self, shard: str, task_ids: List[int], now: datetime) -> List[Tuple[int, dict]]:
+        """
+        Jo tasks shard par bhi due hain aur notify nahi hue, unhe notified mark karein aur unke
+        events record karein. Done tasks sirf mark hote hain (index se nikal jaate hain).
+        """
+        async with AsyncSessionLocal(info={"shard": shard}) as db:
+            result = await db.execute(
+                update(Task)
+                .where(
+                    Task.id.in_(task_ids),
+                    Task.overdue_notified_at.is_(None),
+                    Task.due_date <= now,
+                )
+                .values(overdue_notified_at=now)
+                .returning(Task.id, Task.tenant_id, Task.title, Task.status, Task.assigned_user_id, Task.due_date)
+                .execution_options(synchronize_session=False)
+            )
+            # Tenant order mein, taaki tenant rows ke seq locks hamesha ek hi order mein lein
+            rows = sorted(result.all(), key=lambda row: (row.tenant_id, row.due_date, row.id))
+            events = []
+            for row in rows:
+                if row.status == TaskStatus.done:
+                    continue
+                data = {
+                    "id": row.id,
+                    "title": row.title,
+                    "due_date": row.due_date,
+                    "assigned_user_id": row.assigned_user_id,
+                    "tenant_id": row.tenant_id,
+                }
+                events.append((row.tenant_id, await record_event(db, row.tenant_id, "task_overdue", data)))
+            await db.commit()
+        return events
+
+
+scheduler = DueDateScheduler(
+    manager,
+    timedelta(hours=settings.DUE_SCHEDULER_HORIZON_HOURS),
+    enabled=settings.DUE_SCHEDULER_ENABLED,
+)
@@ -0,0 +1,67 @@
+# backend/app/event_log.py
+
+from typing import List, Optional, Tuple
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models.event import TenantEvent
+from app.models.tenant import Tenant
+from app.serialization import dumps
+
+
+async def record_event(db: AsyncSession, tenant_id: int, event_type: str, data: dict) -> dict:
+    """
+    Caller ki transaction ke andar agla seq reserve karke event log mein likhein.
+
+    Tenant row ka UPDATE ... RETURNING concurrent writers ko serialize karta hai, isliye
+    seq har tenant ke liye bina gap ke badhta hai. Commit ke baad lautaya gaya message
+    broadcast karein.
+    """
+    result = await db.execute(
+        update(Tenant)
+        .where(Tenant.id == tenant_id)
+        .values(event_seq=Tenant.event_seq + 1)
+        .returning(Tenant.event_seq)
+    )
+    seq = result.scalar_one()
+    message = {"type": event_type, "data": data, "seq": seq}
+    db.add(TenantEvent(tenant_id=tenant_id, seq=seq, type=event_type, payload=dumps(message)))
+
+    # Retention: dense seq ki wajah se purane events ek index range delete se hat jaate hain
+    if seq % settings.EVENT_LOG_PRUNE_EVERY == 0:
+        await db.execute(
+            delete(TenantEvent).where(
+                TenantEvent.tenant_id == tenant_id,
+                TenantEvent.seq <= seq - settings.EVENT_LOG_RETENTION,
+            )
+        )
+    return message
+
+
+async def current_seq(db: AsyncSession, tenant_id: int) -> Optional[int]:
+    result = await db.execute(select(Tenant.event_seq).where(Tenant.id == tenant_id))
+    return result.scalar_one_or_none()
+
+
+async def events_since(db: AsyncSession, tenant_id: int, since: int) -> Tuple[Optional[List[str]], int]:
+    """
+    since ke baad ke event payloads (JSON strings) aur tenant ka current seq lautayein.
+
+    Payloads None hon to client ka cursor prune ho chuka hai (ya tenant ke current seq
+    se aage hai) aur use poora resync karna hoga.
+    """
+    latest = await current_seq(db, tenant_id)
+    if latest is None or since > latest:
+        return None, latest or 0
+    if since == latest:
+        return [], latest
+
+    result = await db.execute(
+        select(TenantEvent.seq, TenantEvent.payload)
+        .where(TenantEvent.tenant_id == tenant_id, TenantEvent.seq > since, TenantEvent.seq <= latest)
+        .order_by(TenantEvent.seq)
+    )
+    rows = result.all()
+    if not rows or rows[0].seq != since + 1:
+        return None, latest
+    return [row.payload for row in rows], latest
@@ -0,0 +1,70 @@
+# backend/app/export.py
+
+import csv
+import enum
+import io
+from datetime import datetime
+from typing import Callable, Iterator, Sequence
+import orjson
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models.task import Task
+
+# Server-side cursor se ek baar mein itni rows; memory isi par bounded rehti hai
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _encode_ndjson(keys: Sequence[str], rows) -> bytes:
+    return b"".join(orjson.dumps(dict(zip(keys, row))) + b"\n" for row in rows)
+
+
+def _encode_csv(rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def export_tasks(
+    tenant_id: int, columns: Sequence, fmt: str, open_session: Callable[[], Session] = SessionLocal
+) -> Iterator[bytes]:
+    """
+    Tenant ke tasks id order mein, har batch ek chunk. Sync generator hai, isliye
+    StreamingResponse ise threadpool mein chalata hai aur event loop block nahi hota.
+
+    Request ki get_db session response shuru hone se pehle band ho jati hai, isliye
+    generator apni session (open_session se, e.g. read replica) kholta hai aur client ke beech
+    mein chhodne par band karta hai.
+    """
+    keys = [column.key for column in columns]
+    if fmt == "csv":
+        yield _encode_csv([keys])  # Header turant, taaki client ko data foran mile
+    db = open_session()
+    try:
+        statement = (
+            select(*columns)
+            .where(Task.tenant_id == tenant_id)
+            .order_by(Task.id)
+            # yield_per: Postgres par server-side cursor, poora result memory mein nahi aata
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        for batch in db.execute(statement).partitions():
+            yield _encode_csv(batch) if fmt == "csv" else _encode_ndjson(keys, batch)
+    finally:
+        db.close()
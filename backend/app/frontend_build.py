@@ -0,0 +1,192 @@
+# backend/app/frontend_build.py
+"""
+Frontend ka production build, deploy par ek baar:
+
+    python -m app.frontend_build [--source ../frontend] [--dist ../frontend/dist]
+
+Har top-level page (*.html) se shuru karke sirf wahi files dist mein jaati hain jo pages, CSS
+url() ya JS imports se refer hoti hain. Isse fontawesome-free bundle ke svgs, sprites, scss,
+metadata aur na use hone wali CSS/fonts chhoot jaate hain.
+
+Assets ke naam mein content hash lagta hai (styles.3f9a0c1b2d.css) aur references rewrite hote
+hain. Isliye unhe immutable cache kiya ja sakta hai; pages apne naam se rehte hain. Text assets ke
+.gz aur .br variants yahin bante hain, taaki server request par compress na kare
+(dekhein app.precompressed).
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import posixpath
+import re
+import shutil
+import sys
+from typing import Dict, Optional, Set
+
+import brotli
+
+from app.precompressed import DIST_DIR, FRONTEND_DIR, HASH_LENGTH
+
+MANIFEST = "manifest.json"
+
+# Inke andar ke references rewrite hote hain
+REFERENCES = {
+    ".html": re.compile(r"""\b(?:href|src)\s*=\s*(["'])(?P<ref>[^"']+)\1"""),
+    ".css": re.compile(r"""url\(\s*(["']?)(?P<ref>[^"')]+)\1\s*\)"""),
+    ".js": re.compile(r"""\b(?:from|import)\s*\(?\s*(["'])(?P<ref>[^"']+)\1"""),
+}
+# woff2, images waghera pehle se compressed hain
+COMPRESSIBLE = {".html", ".css", ".js", ".json", ".svg", ".txt", ".map"}
+EXTERNAL = ("http:", "https:", "//", "data:", "mailto:", "javascript:", "#")
+
+
+class BuildError(RuntimeError):
+    pass
+
+
+class FrontendBuild:
+    def __init__(self, source: str, dist: str):
+        self.source = os.path.abspath(source)
+        self.dist = os.path.abspath(dist)
+        # Source file -> dist mein path (posix, dist ke relative)
+        self.outputs: Dict[str, str] = {}
+        self._building: Set[str] = set()
+
+    def run(self) -> Dict[str, str]:
+        pages = sorted(name for name in os.listdir(self.source) if name.endswith(".html"))
+        if not pages:
+            raise BuildError(f"No pages (*.html) in {self.source}")
+        for name in pages:
+            path = os.path.join(self.source, name)
+            self._write(name, self._rewrite(path, name))
+            self.outputs[path] = name
+        manifest = {self._relative(path): out for path, out in sorted(self.outputs.items())}
+        self._write(MANIFEST, json.dumps(manifest, indent=2).encode("utf-8"))
+        return manifest
+
+    def _relative(self, path: str) -> str:
+        return os.path.relpath(path, self.source).replace(os.sep, "/")
+
+    def _asset(self, path: str) -> str:
+        """
+        Asset (aur uske references) ko hashed naam se dist mein likhein; dist path lautayein.
+        """
+        if path in self.outputs:
+            return self.outputs[path]
+        if path in self._building:
+            raise BuildError(f"Circular reference through {self._relative(path)}")
+        self._building.add(path)
+        relative = self._relative(path)
+        stem, ext = posixpath.splitext(relative)
+        data = self._rewrite(path, relative)
+        digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+        out = f"{stem}.{digest}{ext}"
+        self._write(out, data)
+        self._building.discard(path)
+        self.outputs[path] = out
+        return out
+
+    def _rewrite(self, path: str, out: str) -> bytes:
+        with open(path, "rb") as f:
+            data = f.read()
+        pattern = REFERENCES.get(posixpath.splitext(out)[1])
+        if pattern is None:
+            return data
+        base = posixpath.dirname(out)
+
+        def replace(match):
+            target = self._resolve(path, match.group("ref"))
+            if target is None:
+                return match.group(0)
+            target_path, suffix = target
+            ref = posixpath.relpath(self._asset(target_path), base or ".")
+            if not ref.startswith("../"):
+                # JS modules mein bare specifier ("utils.js") valid nahi hota
+                ref = "./" + ref
+            whole, offset = match.group(0), match.start()
+            return whole[:match.start("ref") - offset] + ref + suffix + whole[match.end("ref") - offset:]
+
+        return pattern.sub(replace, data.decode("utf-8")).encode("utf-8")
+
+    def _resolve(self, referrer: str, ref: str) -> Optional[tuple]:
+        """
+        Local file ka reference ho to (source path, ?query/#fragment); pages, URLs aur template
+        strings ke liye None.
+        """
+        ref = ref.strip()
+        if not ref or ref.startswith(EXTERNAL) or "${" in ref:
+            return None
+        split = min((i for i in (ref.find("?"), ref.find("#")) if i >= 0), default=len(ref))
+        clean, suffix = ref[:split], ref[split:]
+        if clean.startswith("/"):
+            # Dev mein repo root se serve hota tha, isliye /frontend/css/... jaise paths
+            clean = clean.lstrip("/")
+            if clean.startswith("frontend/"):
+                clean = clean[len("frontend/"):]
+            candidate = os.path.join(self.source, clean)
+        else:
+            candidate = os.path.join(os.path.dirname(referrer), clean)
+        candidate = os.path.normpath(candidate)
+        if candidate.endswith(".html"):
+            return None
+        if not candidate.startswith(self.source + os.sep) or not os.path.isfile(candidate):
+            print(f"warning: {self._relative(referrer)} references missing {ref}", file=sys.stderr)
+            return None
+        return candidate, suffix
+
+    def _write(self, out: str, data: bytes) -> None:
+        target = os.path.join(self.dist, *out.split("/"))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "wb") as f:
+            f.write(data)
+        if posixpath.splitext(out)[1] not in COMPRESSIBLE:
+            return
+        # mtime=0: same input, same .gz (reproducible builds)
+        variants = {
+            ".gz": gzip.compress(data, compresslevel=9, mtime=0),
+            ".br": brotli.compress(data, quality=11),
+        }
+        for suffix, compressed in variants.items():
+            if len(compressed) < len(data):
+                with open(target + suffix, "wb") as f:
+                    f.write(compressed)
+
+
+def _prepare_dist(source: str, dist: str) -> None:
+    source, dist = os.path.abspath(source), os.path.abspath(dist)
+    if os.path.commonpath([source, dist]) == dist:
+        raise BuildError(f"--dist {dist} would contain the source directory")
+    if os.path.exists(dist):
+        if os.listdir(dist) and not os.path.isfile(os.path.join(dist, MANIFEST)):
+            raise BuildError(f"{dist} is not empty and is not a previous build; refusing to delete it")
+        shutil.rmtree(dist)
+
+
+def _size(directory: str, skip: Optional[str] = None) -> int:
+    total = 0
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if os.path.join(root, d) != skip]
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build the frontend for app.precompressed")
+    parser.add_argument("--source", default=FRONTEND_DIR)
+    parser.add_argument("--dist", default=DIST_DIR)
+    args = parser.parse_args(argv)
+
+    try:
+        _prepare_dist(args.source, args.dist)
+        manifest = FrontendBuild(args.source, args.dist).run()
+    except BuildError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    source_bytes = _size(args.source, skip=os.path.abspath(args.dist))
+    print(f"{len(manifest)} files, {source_bytes} source bytes -> {_size(args.dist)} bytes in {args.dist}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
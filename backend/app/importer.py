@@ -0,0 +1,185 @@
+# backend/app/importer.py
+
+import csv
+import io
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy import func, insert, or_, select
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import shard_ids
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.task import TaskImportRow
+
+# Itne records par ek baar validate, assignee lookup aur insert
+IMPORT_CHUNK_SIZE = 1000
+# Response mein itni hi row errors; "failed" mein sab gini jaati hain
+MAX_IMPORT_ERRORS = 1000
+# Request body itne bytes tak memory mein, uske baad temp file mein spool hoti hai
+IMPORT_SPOOL_BYTES = 8 * 1024 * 1024
+
+IMPORT_COLUMNS = (
+    "title", "description", "status", "priority", "due_date",
+    "assigned_user_id", "completed", "user_id", "tenant_id",
+)
+
+
+class ImportFormatError(ValueError):
+    """File UTF-8 ya valid CSV nahi hai; koi row import nahi hoti."""
+
+
+def _records(stream: BinaryIO, fmt: str) -> Iterator[Tuple[int, object]]:
+    """
+    (row number, raw record) pairs. NDJSON ki line bina parse kiye jaati hai, taaki
+    model_validate_json parse aur validation ek hi step mein kare.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        if fmt == "csv":
+            # DictReader quoted fields ke andar newlines bhi sambhalta hai
+            for number, record in enumerate(csv.DictReader(text), start=1):
+                # Khali cell matlab value nahi, taaki schema defaults lagein
+                yield number, {k: v for k, v in record.items() if k is not None and v not in ("", None)}
+        else:
+            for number, line in enumerate(text, start=1):
+                if line.strip():
+                    yield number, line
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ImportFormatError(f"Unreadable {fmt} file: {e}") from e
+
+
+def _error_detail(error: ValidationError) -> str:
+    return "; ".join(
+        ".".join(str(part) for part in e["loc"]) + ": " + e["msg"] if e["loc"] else e["msg"]
+        for e in error.errors(include_url=False)
+    )
+
+
+def _validate(record) -> Tuple[Optional[TaskImportRow], Optional[str]]:
+    try:
+        if isinstance(record, str):
+            return TaskImportRow.model_validate_json(record), None
+        return TaskImportRow.model_validate(record), None
+    except ValidationError as e:
+        return None, _error_detail(e)
+
+
+def _parse_chunk(
+    records: Iterator[Tuple[int, object]], size: int
+) -> Tuple[List[Tuple[int, TaskImportRow]], List[Tuple[int, str]], bool]:
+    """
+    Agle size records parse aur validate karein: (valid rows, (row, error) pairs, file khatam?).
+    Threadpool mein chalta hai, taaki bade imports event loop (websockets, baaki requests)
+    ko na rokein.
+    """
+    rows, failures = [], []
+    for number, record in records:
+        row, detail = _validate(record)
+        if row is None:
+            failures.append((number, detail))
+        else:
+            rows.append((number, row))
+        if len(rows) + len(failures) >= size:
+            return rows, failures, False
+    return rows, failures, True
+
+
+async def _resolve_assignees(
+    db: AsyncSession, tenant_id: int, rows: List[TaskImportRow]
+) -> Tuple[Dict[str, int], set]:
+    """
+    Chunk ke saare assignee emails aur ids ek hi query mein, sirf is tenant ke users mein.
+    """
+    emails = {row.assignee_email.lower() for row in rows if row.assignee_email}
+    ids = {row.assigned_user_id for row in rows if row.assigned_user_id is not None}
+    if not emails and not ids:
+        return {}, set()
+    result = await db.execute(
+        select(User.id, User.email).where(
+            User.tenant_id == tenant_id,
+            or_(func.lower(User.email).in_(emails), User.id.in_(ids)),
+        )
+    )
+    users = result.all()
+    return {email.lower(): user_id for user_id, email in users}, {user_id for user_id, _ in users}
+
+
+async def _insert(db: AsyncSession, rows: List[dict]) -> None:
+    bind = db.get_bind()
+    if bind.dialect.name == "postgresql" and bind.dialect.driver == "asyncpg":
+        # COPY: ek round trip, koi per-row parse/plan nahi; session ki transaction mein hi chalta hai
+        columns = IMPORT_COLUMNS
+        if shard_ids.enabled:
+            # COPY column defaults nahi chalata; sharded ids yahin lagte hain
+            columns = ("id",) + IMPORT_COLUMNS
+            for row in rows:
+                row["id"] = shard_ids.next("tasks")
+        connection = await db.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            Task.__tablename__,
+            records=[tuple(row[column] for column in columns) for row in rows],
+            columns=columns,
+        )
+    else:
+        # Table par Core insert: ek executemany. ORM insert(Task) None values chhod deta hai aur
+        # alag null columns wali rows ko alag statements mein todta hai.
+        await db.execute(insert(Task.__table__), rows)
+
+
+async def import_tasks(db: AsyncSession, user: User, stream: BinaryIO, fmt: str) -> dict:
+    """
+    NDJSON/CSV stream se tasks chunks mein import karein. Galat rows skip hoti hain aur
+    unki errors report hoti hain; baaki rows caller ki transaction mein insert hoti hain.
+    """
+    created, failed, errors = 0, 0, []
+
+    def fail(number: int, detail: str):
+        nonlocal failed
+        failed += 1
+        if len(errors) < MAX_IMPORT_ERRORS:
+            errors.append({"row": number, "detail": detail})
+
+    async def flush(chunk: List[Tuple[int, TaskImportRow]]):
+        nonlocal created
+        emails, user_ids = await _resolve_assignees(db, user.tenant_id, [row for _, row in chunk])
+        rows = []
+        for number, row in chunk:
+            assignee = row.assigned_user_id
+            if row.assignee_email:
+                assignee = emails.get(row.assignee_email.lower())
+                if assignee is None:
+                    fail(number, f"Unknown assignee: {row.assignee_email}")
+                    continue
+            elif assignee is not None and assignee not in user_ids:
+                fail(number, f"Unknown assigned_user_id: {assignee}")
+                continue
+            rows.append({
+                "title": row.title,
+                "description": row.description,
+                "status": row.status.value,
+                "priority": row.priority.value,
+                "due_date": row.due_date,  # TaskBase validator naive UTC kar chuka hai
+                "assigned_user_id": assignee,
+                "completed": False,
+                "user_id": user.id,
+                "tenant_id": user.tenant_id,
+            })
+        if rows:
+            await _insert(db, rows)
+            created += len(rows)
+
+    # Parsing/validation thread mein, chunk ke chunk; sirf DB kaam (lookup, insert) loop par
+    records = _records(stream, fmt)
+    done = False
+    while not done:
+        chunk, failures, done = await run_in_threadpool(_parse_chunk, records, IMPORT_CHUNK_SIZE)
+        for number, detail in failures:
+            fail(number, detail)
+        if chunk:
+            await flush(chunk)
+
+    # Assignee errors chunk flush par aati hain, validation errors se baad
+    errors.sort(key=lambda error: error["row"])
+    return {"created": created, "failed": failed, "errors": errors}
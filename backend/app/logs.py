@@ -0,0 +1,50 @@
+# backend/app/logs.py
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+from app.config import settings
+
+_listener = None
+
+
+class SamplingFilter(logging.Filter):
+    """
+    WARNING se neeche ke records sirf `rate` fraction mein aage jaate hain.
+    Hot path (har request/socket) ke debug/info logs volume ko bound rakhte hain;
+    warnings aur errors hamesha log hote hain.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+
+def configure_logging() -> None:
+    """
+    "app" loggers ko QueueHandler par lagayein: request path sirf queue mein record daalta
+    hai, stderr par likhna QueueListener ka background thread karta hai.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    records: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    handler = logging.handlers.QueueHandler(records)
+    handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATE))
+
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+    _listener = logging.handlers.QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    logger = logging.getLogger("app")
+    logger.setLevel(settings.LOG_LEVEL)
+    logger.addHandler(handler)
+    logger.propagate = False
@@ -5,16 +5,52 @@ from dotenv import load_dotenv
 # Load environment variables from the .env file at the very beginning
 load_dotenv()
 
-from fastapi import FastAPI, Depends, HTTPException, Form, status
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, Form, Request, Response, status
+from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordBearer
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
-from .database import engine, get_db
+from .config import settings
+from .database import ReadYourWritesMiddleware, TenantMoving, get_db, shard_router
 from . import models
 from . import schemas
 from .routers import auth, task, tenant, user, websocket
+from .due_scheduler import scheduler
+from .schema_version import check_schema_version
+from .precompressed import DIST_DIR, PrecompressedStaticFiles
+from .logs import configure_logging
+from .metrics import (
+    MetricsMiddleware, METRICS_CONTENT_TYPE, register_principal_cache_collector, register_websocket_collector,
+    render_metrics,
+)
+from .principal_cache import principal_cache
+
+configure_logging()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema migrations deploy par `alembic upgrade head` se lagti hain; yahan sirf version check
+    if settings.SCHEMA_VERSION_CHECK:
+        # Har shard alag database hai, har ek par migrations alag lagti hain
+        for shard_engine in shard_router.engines.values():
+            check_schema_version(shard_engine)
+    # Broadcast backplane (multi-worker pub/sub) worker ke saath start/stop hota hai
+    await websocket.manager.start()
+    # Due dates ka heap index se bharta hai aur task_overdue events bhejta hai
+    await scheduler.start()
+    yield
+    await scheduler.stop()
+    await websocket.manager.stop()
+
+app = FastAPI(title="TaskFlow API", lifespan=lifespan)
 
-app = FastAPI(title="TaskFlow API")
+# Per-route latency aur per-request SQL count/time (/metrics par)
+app.add_middleware(MetricsMiddleware)
+# Commit karne wali requests ke response par read-your-writes marker (dekhein app.database)
+app.add_middleware(ReadYourWritesMiddleware)
+register_websocket_collector(websocket.manager)
+register_principal_cache_collector(principal_cache)
 
 # Add CORS middleware
 app.add_middleware(
@@ -23,11 +59,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Cross-origin clients ko read-your-writes marker padhne dein
+    expose_headers=["X-Read-Your-Writes"],
 )
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
-
 # Include routers
 app.include_router(auth.router)
 app.include_router(task.router)
@@ -35,7 +70,28 @@ app.include_router(tenant.router)
 app.include_router(user.router)
 app.include_router(websocket.router)
 
+# Frontend (fingerprinted, precompressed build) isi app se; build ke bina sirf API
+frontend_dist = settings.FRONTEND_DIST_DIR or DIST_DIR
+if os.path.isdir(frontend_dist):
+    app.mount(settings.FRONTEND_MOUNT_PATH, PrecompressedStaticFiles(frontend_dist), name="frontend")
+
+@app.exception_handler(TenantMoving)
+def tenant_moving(request: Request, exc: TenantMoving):
+    # Move tool copy kar raha hai; tenant thodi der mein naye shard par milega
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(int(settings.SHARD_DIRECTORY_TTL_SECONDS) + 1)},
+    )
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the TaskFlow API"}
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Prometheus text format; counters isi worker process ke hain.
+    """
+    return Response(render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
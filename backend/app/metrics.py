@@ -0,0 +1,212 @@
+# backend/app/metrics.py
+
+import time
+from contextvars import ContextVar
+from typing import Optional
+from prometheus_client import CONTENT_TYPE_LATEST, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily, CounterMetricFamily, HistogramMetricFamily, REGISTRY
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per HTTP request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL per HTTP request",
+    ["method", "route"],
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time waiting for a connection from the pool",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+
+class _RequestStats:
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+# Current request ke SQL counters. Object mutable hai, isliye threadpool (sync handlers)
+# aur async engine ke greenlets mein copy hua context bhi isi object ko update karta hai.
+_request_stats: ContextVar[Optional[_RequestStats]] = ContextVar("request_stats", default=None)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware: har HTTP request ki latency aur SQL count/time, route template
+    ke label ke saath. (BaseHTTPMiddleware streaming responses ko buffer karta hai.)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = _RequestStats()
+        token = _request_stats.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_stats.reset(token)
+            route = scope.get("route")
+            # Unmatched paths ek hi label mein, taaki label cardinality bounded rahe
+            template = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            REQUEST_LATENCY.labels(method, template, str(status_code)).observe(elapsed)
+            REQUEST_DB_QUERIES.labels(method, template).observe(stats.queries)
+            REQUEST_DB_SECONDS.labels(method, template).observe(stats.seconds)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Statement ke execution context par, connection par nahi: statement fail ho to
+    # after_cursor_execute nahi chalta, aur context uske saath hi chala jata hai
+    context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = context._query_start
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += time.perf_counter() - start
+
+
+def instrument_engine(engine) -> None:
+    """
+    SQL statements ko current request ke counters mein jodein (sync engine, ya async
+    engine ka .sync_engine).
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class _TimedCheckout:
+    """
+    Pool mixin: connection milne tak ka intezaar (pool exhaust ho to timeout tak) measure karein.
+    Pool recreate (engine.dispose) par bhi class wahi rehti hai.
+    """
+    engine_label = "sync"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.labels(self.engine_label).observe(time.perf_counter() - start)
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    engine_label = "sync"
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    engine_label = "async"
+
+
+class TimedReplicaQueuePool(_TimedCheckout, QueuePool):
+    engine_label = "replica"
+
+
+class WebsocketCollector:
+    """
+    Scrape ke waqt ConnectionManager ki state padhta hai; broadcast path par koi extra kaam nahi.
+    """
+
+    def __init__(self, manager):
+        self.manager = manager
+
+    def collect(self):
+        connections = GaugeMetricFamily(
+            "websocket_connections", "Open websocket connections per tenant", labels=["tenant_id"]
+        )
+        depth = GaugeMetricFamily(
+            "websocket_send_queue_depth", "Messages waiting in per-connection send queues",
+            labels=["tenant_id"],
+        )
+        for tenant_id, sockets in list(self.manager.active_connections.items()):
+            connections.add_metric([tenant_id], len(sockets))
+            depth.add_metric([tenant_id], self.manager.queue_depth(tenant_id))
+        yield connections
+        yield depth
+        yield CounterMetricFamily(
+            "websocket_evicted", "Slow consumers disconnected", value=self.manager.evicted
+        )
+        yield CounterMetricFamily(
+            "websocket_dropped", "Messages dropped by drop_oldest policy", value=self.manager.dropped
+        )
+        yield CounterMetricFamily(
+            "websocket_batches_flushed", "Coalesced broadcast batches sent",
+            value=self.manager.batches_flushed,
+        )
+        yield CounterMetricFamily(
+            "websocket_events_coalesced", "Task updates superseded within a coalescing window",
+            value=self.manager.events_coalesced,
+        )
+        yield HistogramMetricFamily(
+            "websocket_batch_size", "Events per coalesced broadcast batch",
+            buckets=self.manager.batch_size_buckets(), sum_value=self.manager.batch_size_sum,
+        )
+
+
+def register_websocket_collector(manager) -> None:
+    REGISTRY.register(WebsocketCollector(manager))
+
+
+class PrincipalCacheCollector:
+    """
+    get_current_user principal cache ke counters (isi worker ke), scrape ke waqt stats() se.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def collect(self):
+        stats = self.cache.stats()
+        for name, help_text in (
+            ("hits", "Principal cache hits"),
+            ("misses", "Principal cache misses (user loaded from the database)"),
+            ("evictions", "Principal cache LRU evictions"),
+            ("invalidations", "Principal cache entries dropped on member removal"),
+        ):
+            yield CounterMetricFamily(f"principal_cache_{name}", help_text, value=stats[name])
+        yield GaugeMetricFamily("principal_cache_size", "Cached principals", value=stats["size"])
+        yield GaugeMetricFamily(
+            "principal_cache_max_entries", "Principal cache capacity", value=stats["max_entries"]
+        )
+
+
+def register_principal_cache_collector(cache) -> None:
+    REGISTRY.register(PrincipalCacheCollector(cache))
+
+
+def render_metrics() -> bytes:
+    return generate_latest(REGISTRY)
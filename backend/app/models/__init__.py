@@ -1,6 +1,8 @@
 # backend/app/models/__init__.py
 
-from .base import Base
+from app.database import Base
 from .user import User
 from .task import Task
-from .tenant import Tenant
\ No newline at end of file
+from .tenant import Tenant
+from .event import TenantEvent
+from .stats import TaskStat
\ No newline at end of file
@@ -1,4 +0,0 @@
-# backend/app/models/base.py
-from sqlalchemy.ext.declarative import declarative_base
-
-Base = declarative_base()
\ No newline at end of file
@@ -0,0 +1,17 @@
+# backend/app/models/event.py
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
+from app.database import Base
+from datetime import datetime
+
+class TenantEvent(Base):
+    """
+    Tenant ke task/member events ka compact log; websocket clients ?since=<seq> se
+    chhoote hue events replay karte hain. (tenant_id, seq) dense aur monotonic hai.
+    """
+    __tablename__ = "tenant_events"
+
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), primary_key=True)
+    seq = Column(Integer, primary_key=True, autoincrement=False)
+    type = Column(String(50), nullable=False)
+    payload = Column(Text, nullable=False)  # Broadcast jaisa hi JSON message
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
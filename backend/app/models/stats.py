@@ -0,0 +1,20 @@
+# backend/app/models/stats.py
+from sqlalchemy import Column, Integer, String, ForeignKey
+from app.database import Base
+from app.models.task import Task
+
+class TaskStat(Base):
+    """
+    Per-tenant task counters, tasks table ke triggers se incrementally update hote hain.
+    dimension: total | status | priority | assignee; key mein us dimension ki value
+    (assignee ke liye user id, unassigned ke liye "").
+    """
+    __tablename__ = "task_stats"
+
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), primary_key=True)
+    dimension = Column(String(20), primary_key=True)
+    key = Column(String(50), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+# Triggers tasks table par bante hain, isliye task_stats uske baad create ho
+TaskStat.__table__.add_is_dependent_on(Task.__table__)
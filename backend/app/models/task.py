@@ -1,21 +1,42 @@
 # backend/app/models/task.py
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Enum, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Enum, DateTime, Index, text
 from sqlalchemy.orm import relationship
-from app.database import Base
+from app.database import Base, shard_ids
 from app.schemas.task import TaskStatus, TaskPriority
+
+DUE_PENDING = "due_date IS NOT NULL AND overdue_notified_at IS NULL"
+
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Keyset pagination ke liye: har filter ke baad "id" taaki page seek ho, scan nahi
+        Index("ix_tasks_tenant_id_id", "tenant_id", "id"),
+        Index("ix_tasks_tenant_status_id", "tenant_id", "status", "id"),
+        Index("ix_tasks_tenant_priority_id", "tenant_id", "priority", "id"),
+        Index("ix_tasks_tenant_assignee_id", "tenant_id", "assigned_user_id", "id"),
+        Index("ix_tasks_tenant_due_date", "tenant_id", "due_date"),
+        # Due-date scheduler ka startup/horizon load: sirf jinka overdue event abhi baaki hai
+        Index(
+            "ix_tasks_due_pending", "due_date",
+            postgresql_where=text(DUE_PENDING),
+            sqlite_where=text(DUE_PENDING),
+        ),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, index=True, default=shard_ids.default("tasks"))
     title = Column(String(255), index=True)
     description = Column(String(500), nullable=True)
     status = Column(Enum(TaskStatus), default=TaskStatus.todo)
     completed = Column(Boolean, default=False)
-    user_id = Column(Integer, ForeignKey("users.id"))
-    assigned_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    assigned_user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
     tenant_id = Column(Integer, ForeignKey("tenants.id"))
     due_date = Column(DateTime, nullable=True)
     priority = Column(Enum(TaskPriority), default=TaskPriority.medium)
+    # Is due_date ka task_overdue event kab gaya; due_date badalne par NULL
+    overdue_notified_at = Column(DateTime, nullable=True)
+    # Har write par +1; PATCH/DELETE isse stale edits pakadte hain (optimistic concurrency)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     creator = relationship("User", foreign_keys=[user_id], back_populates="tasks_created")
     assignee = relationship("User", foreign_keys=[assigned_user_id], back_populates="tasks_assigned")
@@ -1,12 +1,14 @@
 from sqlalchemy import Column, Integer, String
 from sqlalchemy.orm import relationship
-from app.database import Base
+from app.database import Base, shard_ids
 
 class Tenant(Base):
     __tablename__ = "tenants"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, index=True, default=shard_ids.default("tenants"))
     name = Column(String(255), unique=True, index=True)
+    # Aakhri event ka sequence number (tenant_events.seq); har event par +1
+    event_seq = Column(Integer, nullable=False, default=0, server_default="0")
 
     users = relationship("User", back_populates="tenant")
     tasks = relationship("Task", back_populates="tenant")
\ No newline at end of file
@@ -1,7 +1,7 @@
 # backend/app/models/user.py
 from sqlalchemy import Column, Integer, String, ForeignKey, Enum
 from sqlalchemy.orm import relationship
-from app.database import Base
+from app.database import Base, shard_ids
 import enum
 
 class UserRole(str, enum.Enum):
@@ -11,10 +11,10 @@ class UserRole(str, enum.Enum):
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, index=True, default=shard_ids.default("users"))
     email = Column(String, unique=True, index=True)
     hashed_password = Column(String)
-    tenant_id = Column(Integer, ForeignKey("tenants.id"))
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), index=True)
     role = Column(Enum(UserRole), default=UserRole.member)
 
     tenant = relationship("Tenant", back_populates="users")
@@ -0,0 +1,69 @@
+# backend/app/passwords.py
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from bcrypt import hashpw, gensalt, checkpw
+from fastapi import HTTPException, status
+from app.config import settings
+
+
+def _hash(password: str) -> str:
+    return hashpw(password.encode("utf-8"), gensalt()).decode("utf-8")
+
+
+def _verify(password: str, hashed_password: str) -> bool:
+    return checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+
+
+class PasswordHasher:
+    """
+    Saara bcrypt kaam ek dedicated thread pool par chalata hai.
+
+    Event loop aur FastAPI ka shared threadpool dono free rehte hain. max_pending se
+    zyada jobs aane par request turant 503 ke saath reject hoti hai, taaki login burst
+    baaki requests ke threads na kha jaye.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pwhash")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self.rejected = 0
+
+    def _submit(self, fn, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many authentication requests, please retry",
+                headers={"Retry-After": "1"},
+            )
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    async def hash(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(_hash, password))
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await asyncio.wrap_future(self._submit(_verify, password, hashed_password))
+
+    # Sync (def) handlers ke liye: threadpool worker sirf result ka wait karta hai
+    def hash_sync(self, password: str) -> str:
+        return self._submit(_hash, password).result()
+
+    def verify_sync(self, password: str, hashed_password: str) -> bool:
+        return self._submit(_verify, password, hashed_password).result()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
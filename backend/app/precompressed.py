@@ -0,0 +1,107 @@
+# backend/app/precompressed.py
+"""
+app.frontend_build ke dist ko serve karna. Build ne har text asset ke .br aur .gz variants pehle
+hi bana diye hain; request ke Accept-Encoding se unme se ek file seedha bhejte hain, yahan kuch
+compress nahi hota.
+
+Dist deploy ke baad nahi badalta, isliye files (aur unke stat) ka index startup par ek baar banta
+hai: request par na filesystem lookup hota hai na thread hop. Naya build serve karne ke liye
+workers restart karein.
+"""
+import mimetypes
+import os
+import re
+from typing import Dict, Set, Tuple
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, RedirectResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FRONTEND_DIR = os.path.normpath(os.path.join(BACKEND_DIR, "..", "frontend"))
+DIST_DIR = os.path.join(FRONTEND_DIR, "dist")
+
+HASH_LENGTH = 10
+# Build ke hashed naam (styles.3f9a0c1b2d.css) content badalne par badal jaate hain
+FINGERPRINTED = re.compile(r"\.[0-9a-f]{%d}\.[^./\\]+$" % HASH_LENGTH)
+IMMUTABLE = "public, max-age=31536000, immutable"
+# Pages ka naam nahi badalta; har baar revalidate (ETag par 304)
+REVALIDATE = "no-cache"
+
+# Pasand ke order mein
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+IDENTITY = "identity"
+
+Variant = Tuple[str, os.stat_result]
+
+
+def accepted_encodings(header: str) -> Set[str]:
+    """
+    Accept-Encoding ki codings jinka q > 0 hai.
+    """
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        quality = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        if coding.strip() and quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    def __init__(self, directory: str):
+        super().__init__(directory=directory, html=True)
+        # Path (get_path jaisa) -> encoding -> (full path, stat)
+        self.files: Dict[str, Dict[str, Variant]] = {}
+        paths = set()
+        for root, _, names in os.walk(directory):
+            paths.update(os.path.relpath(os.path.join(root, name), directory) for name in names)
+        for path in paths:
+            encoding, base = IDENTITY, path
+            for name, suffix in ENCODINGS:
+                # Sirf tab variant jab original file bhi ho; warna yeh apne aap mein ek file hai
+                if path.endswith(suffix) and path[:-len(suffix)] in paths:
+                    encoding, base = name, path[:-len(suffix)]
+            full_path = os.path.join(directory, path)
+            self.files.setdefault(base, {})[encoding] = (full_path, os.stat(full_path))
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            raise HTTPException(status_code=405)
+        if path == ".":
+            if not scope["path"].endswith("/"):
+                # Pages ke relative links ke liye mount URL "/" par khatam ho
+                return RedirectResponse(url=scope["path"] + "/")
+            path = "index.html"
+        variants = self.files.get(path)
+        if variants is None:
+            raise HTTPException(status_code=404)
+
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        encoding = next(
+            (name for name, _ in ENCODINGS if name in variants and (name in accepted or "*" in accepted)),
+            IDENTITY,
+        )
+        full_path, stat_result = variants[encoding]
+        headers = {"Cache-Control": IMMUTABLE if FINGERPRINTED.search(path) else REVALIDATE}
+        if len(variants) > 1:
+            headers["Vary"] = "Accept-Encoding"
+        if encoding != IDENTITY:
+            headers["Content-Encoding"] = encoding
+        response = FileResponse(
+            full_path,
+            stat_result=stat_result,
+            headers=headers,
+            media_type=mimetypes.guess_type(path)[0] or "application/octet-stream",
+        )
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,91 @@
+# backend/app/principal_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+from app.config import settings
+from app.models.user import User
+
+# Sirf yeh columns cache hote hain; hashed_password memory mein nahi rakha jata
+_CACHED_FIELDS = ("id", "email", "tenant_id", "role")
+
+
+class PrincipalCache:
+    """
+    get_current_user ke liye in-process LRU cache, user id se keyed, TTL ke saath.
+
+    ORM object ki jagah column values ka snapshot store hota hai, aur har hit par
+    ek naya (session-free) User banta hai, taaki requests aapas mein state share na karein.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        # Sync dependencies threadpool mein chalti hain, isliye lock zaroori hai
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, user_id: int) -> Optional[User]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] <= now:
+                del self._entries[user_id]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            fields = entry[1]
+        return User(**fields)
+
+    def put(self, user: User) -> None:
+        if not self.enabled:
+            return
+        fields = {name: getattr(user, name) for name in _CACHED_FIELDS}
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[user.id] = (expires_at, fields)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        User delete hone ya role badalne par entry turant hata dein.
+        """
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+)
@@ -4,8 +4,8 @@ from sqlalchemy.orm import Session
 from app.schemas.user import UserCreate, UserLogin, UserOut
 from app.models.user import User, UserRole
 from app.models.tenant import Tenant
-from app.database import get_db
-from bcrypt import hashpw, gensalt, checkpw
+from app.database import DEFAULT_SHARD, SessionLocal, get_db, shard_router
+from app.passwords import password_hasher
 from typing import Dict
 
 # --- Import the new centralized function ---
@@ -13,30 +13,46 @@ from app.dependencies import create_access_token
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+def _find_on_shards(db: Session, entity, *criteria):
+    """
+    Pehli matching row: request ke session (default shard) mein, phir baaki shards par.
+    Tenant names aur emails saare shards mein unique hain.
+    """
+    found = db.query(entity).filter(*criteria).first()
+    others = [shard for shard in shard_router.names if shard != DEFAULT_SHARD]
+    while found is None and others:
+        with SessionLocal(info={"shard": others.pop(0)}) as shard_db:
+            found = shard_db.query(entity).filter(*criteria).first()
+    return found
+
 @router.post("/signup", response_model=Dict)
 def signup(user: UserCreate, db: Session = Depends(get_db)):
-    existing_tenant = db.query(Tenant).filter(Tenant.name == user.tenant_name).first()
+    existing_tenant = _find_on_shards(db, Tenant, Tenant.name == user.tenant_name)
     if existing_tenant:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
-    existing_user = db.query(User).filter(User.email == user.email).first()
+    existing_user = _find_on_shards(db, User, User.email == user.email)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
-    new_tenant = Tenant(name=user.tenant_name)
+    # Sharding mein tenant ka id aur shard pehle tay hote hain; session ab usi shard par jata hai
+    tenant_id = shard_router.place_tenant()
+    db.close()  # Upar ki queries ka default shard connection chhod dein
+    db.info["tenant_id"] = tenant_id
+    new_tenant = Tenant(id=tenant_id, name=user.tenant_name)
     db.add(new_tenant)
     db.commit()
     db.refresh(new_tenant)
 
-    hashed_password = hashpw(user.password.encode("utf-8"), gensalt())
+    hashed_password = password_hasher.hash_sync(user.password)
     new_user = User(
         email=user.email,
-        hashed_password=hashed_password.decode("utf-8"),
+        hashed_password=hashed_password,
         tenant_id=new_tenant.id,
         role=UserRole.admin
     )
@@ -45,7 +61,7 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
     db.refresh(new_user)
 
     # Use the centralized function to create the token
-    access_token = create_access_token(data={"sub": str(new_user.id)})
+    access_token = create_access_token(data={"sub": str(new_user.id), "tid": new_user.tenant_id})
     return {
         "user": {
             "id": new_user.id,
@@ -59,9 +75,9 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
 
 @router.post("/login")
 def login(user_login: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == user_login.email).first()
-    if not user or not checkpw(user_login.password.encode("utf-8"), user.hashed_password.encode("utf-8")):
+    user = _find_on_shards(db, User, User.email == user_login.email)
+    if not user or not password_hasher.verify_sync(user_login.password, user.hashed_password):
         raise HTTPException(status_code=400, detail="Incorrect email or password")
     
-    access_token = create_access_token(data={"sub": str(user.id)})
-    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+    access_token = create_access_token(data={"sub": str(user.id), "tid": user.tenant_id})
+    return {"access_token": access_token, "token_type": "bearer"}
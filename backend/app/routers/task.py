@@ -1,38 +1,216 @@
 # app/routers/task.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional # Add Optional for the new endpoint
-from app.schemas.task import TaskCreate, TaskUpdate, Task
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select, insert, update, delete, case
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import List, Literal, Optional # Add Optional for the new endpoint
+from datetime import datetime
+import tempfile
+from app.schemas.task import (
+    TaskCreate, TaskUpdate, TaskPatch, Task, TaskPage, TaskStatus, TaskPriority,
+    TaskBulkCreate, TaskBulkUpdate, TaskBulkDelete, TaskStats, TaskImportResult, naive_utc,
+)
 from app.models.task import Task as TaskModel
-from app.database import get_db
-from app.dependencies import get_current_user
+from app.database import open_read_session, request_write_marker
+from app.dependencies import get_async_db, get_current_user, get_read_db, tenant_etag
 from app.models.user import User
 from app.routers.websocket import manager
+from app.due_scheduler import scheduler
+from app.event_log import record_event
+from app.pagination import encode_cursor, decode_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.serialization import fast_json_response, rows_to_dicts
+from app.search import search_terms, apply_search
+from app.stats import tenant_stats
+from app.export import export_tasks, MEDIA_TYPES
+from app.importer import import_tasks, ImportFormatError, IMPORT_SPOOL_BYTES
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
-@router.get("/", response_model=List[Task]) # New GET endpoint
+# List endpoints sirf yeh columns (Task schema ke fields) rows ki tarah select karte hain
+TASK_COLUMNS = (
+    TaskModel.id,
+    TaskModel.title,
+    TaskModel.description,
+    TaskModel.status,
+    TaskModel.assigned_user_id,
+    TaskModel.due_date,
+    TaskModel.priority,
+    TaskModel.user_id,
+    TaskModel.tenant_id,
+    TaskModel.version,
+)
+
+# Postgres par RETURNING ka subquery statement se pehle wala snapshot dekhta hai, yaani purani row
+_old_task = aliased(TaskModel)
+PREVIOUS_ASSIGNEE = (
+    select(_old_task.assigned_user_id)
+    .where(_old_task.id == TaskModel.id)
+    .scalar_subquery()
+    .label("previous_assigned_user_id")
+)
+
+@router.get("/", response_model=TaskPage, dependencies=[Depends(tenant_etag)])
 def get_tasks_for_tenant(
-    db: Session = Depends(get_db),
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
     is_my_tasks: Optional[bool] = False,
+    task_status: Optional[TaskStatus] = Query(None, alias="status"),
+    priority: Optional[TaskPriority] = None,
+    assigned_user_id: Optional[int] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
 ):
     """
-    Sabhi tasks ya user ko assigned tasks retrieve karein.
+    Tasks ko filters aur cursor (keyset) pagination ke saath retrieve karein.
+    Order hamesha id ke hisaab se stable rehta hai; agle page ke liye next_cursor bhejein.
+    Rows seedha orjson se encode hoti hain (ORM objects aur response_model validation ke bina).
     """
-    query = db.query(TaskModel).filter(TaskModel.tenant_id == current_user.tenant_id)
+    query = db.query(*TASK_COLUMNS).filter(TaskModel.tenant_id == current_user.tenant_id)
     if is_my_tasks:
         query = query.filter(TaskModel.assigned_user_id == current_user.id)
-    
-    tasks = query.all()
+    if task_status is not None:
+        query = query.filter(TaskModel.status == task_status)
+    if priority is not None:
+        query = query.filter(TaskModel.priority == priority)
+    if assigned_user_id is not None:
+        query = query.filter(TaskModel.assigned_user_id == assigned_user_id)
+    if due_after is not None:
+        query = query.filter(TaskModel.due_date >= naive_utc(due_after))
+    if due_before is not None:
+        query = query.filter(TaskModel.due_date < naive_utc(due_before))
+    if cursor:
+        after_id = decode_cursor(cursor).get("id")
+        if not isinstance(after_id, int):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        query = query.filter(TaskModel.id > after_id)
+
+    # Ek extra row maang kar pata chalta hai ke agla page hai ya nahi, bina COUNT ke
+    tasks = query.order_by(TaskModel.id).limit(limit + 1).all()
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = encode_cursor({"id": tasks[-1].id})
+
+    return fast_json_response({"tasks": rows_to_dicts(tasks), "next_cursor": next_cursor}, response)
+
+@router.get("/search", response_model=TaskPage, dependencies=[Depends(tenant_etag)])
+def search_tasks(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    """
+    Title aur description par full-text search, relevance ke hisaab se sorted.
+    Sirf current tenant ke tasks; agle page ke liye next_cursor bhejein.
+    """
+    after = None
+    if cursor:
+        values = decode_cursor(cursor)
+        last_rank, last_id = values.get("rank"), values.get("id")
+        if not isinstance(last_rank, (int, float)) or not isinstance(last_id, int):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        after = (last_rank, last_id)
+
+    terms = search_terms(q)
+    if not terms:
+        return fast_json_response({"tasks": [], "next_cursor": None}, response)
+
+    query = db.query(*TASK_COLUMNS)
+    try:
+        query = apply_search(query, db.get_bind().dialect.name, terms, current_user.tenant_id, after)
+    except NotImplementedError as e:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
+
+    tasks = rows_to_dicts(query.limit(limit + 1).all())
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = encode_cursor({"rank": tasks[-1]["rank"], "id": tasks[-1]["id"]})
+    for task in tasks:
+        del task["rank"]
+
+    return fast_json_response({"tasks": tasks, "next_cursor": next_cursor}, response)
+
+@router.get("/stats", response_model=TaskStats)
+def get_task_stats(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Tenant ke board counts (status, priority, assignee, overdue).
+    Counters har task write par incrementally update hote hain, isliye tasks list nahi hoti.
+    """
+    return tenant_stats(db, current_user.tenant_id)
+
+@router.get("/export")
+def export_tenant_tasks(
+    request: Request,
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Tenant ke saare tasks NDJSON ya CSV mein stream karein. Rows batch mein cursor se
+    padhi jaati hain, isliye memory tenant ke size par depend nahi karti.
+    """
+    filename = f"tasks-tenant-{current_user.tenant_id}.{export_format}"
+    marker = request_write_marker(request)
+    return StreamingResponse(
+        export_tasks(
+            current_user.tenant_id, TASK_COLUMNS, export_format,
+            open_session=lambda: open_read_session(current_user.id, current_user.tenant_id, marker),
+        ),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@router.post("/import", response_model=TaskImportResult)
+async def import_tenant_tasks(
+    request: Request,
+    import_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Request body (NDJSON ya CSV, export jaisa format) se tasks import karein. Assignee
+    "assignee_email" ya "assigned_user_id" se; galat rows skip hokar report hoti hain.
+    Sab ek transaction mein, aur teammates ko sirf ek "task_import" summary event jata hai.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_BYTES) as body:
+        async for data in request.stream():
+            # Spool ke baad yeh disk write hai; event loop par nahi
+            await run_in_threadpool(body.write, data)
+        await run_in_threadpool(body.seek, 0)
+        try:
+            summary = await import_tasks(db, current_user, body, import_format)
+        except ImportFormatError as e:
+            await db.rollback()
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    return tasks
+    if not summary["created"]:
+        return summary
+    event = await record_event(
+        db, current_user.tenant_id, "task_import",
+        {"created": summary["created"], "failed": summary["failed"]},
+    )
+    await db.commit()
+    # Import COPY/executemany se hota hai, ids nahi milte; due dates index se dobara
+    await scheduler.reload()
+    await manager.broadcast(str(current_user.tenant_id), event)
+    return summary
 
 @router.post("/", response_model=Task)
 async def create_task(
     task: TaskCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """
@@ -44,13 +222,14 @@ async def create_task(
         status=task.status,
         user_id=current_user.id,
         assigned_user_id=task.assigned_user_id,
+        due_date=task.due_date,
+        priority=task.priority,
         tenant_id=current_user.tenant_id,
     )
     db.add(new_task)
-    db.commit()
-    db.refresh(new_task)
+    await db.flush()
 
-    # Task creation ko broadcast karein
+    # Task creation ko event log mein likhein; commit ke baad broadcast karein
     task_data = {
         "id": new_task.id,
         "title": new_task.title,
@@ -59,16 +238,129 @@ async def create_task(
         "user_id": new_task.user_id,
         "assigned_user_id": new_task.assigned_user_id,
         "tenant_id": new_task.tenant_id,
-        "type": "task_create",
+        "version": new_task.version,
     }
-    await manager.broadcast(str(new_task.tenant_id), {"type": "task_create", "data": task_data})
+    event = await record_event(db, new_task.tenant_id, "task_create", task_data)
+    await db.commit()
+    await db.refresh(new_task)
+    scheduler.schedule(new_task.id, new_task.due_date)
+    await manager.broadcast(str(new_task.tenant_id), event)
 
     return new_task
 
+async def _check_tenant_owns(db: AsyncSession, tenant_id: int, task_ids: List[int]):
+    """
+    Ek hi query mein confirm karein ke saare ids is tenant ke hain; warna 404.
+    """
+    result = await db.execute(
+        select(TaskModel.id).where(TaskModel.id.in_(task_ids), TaskModel.tenant_id == tenant_id)
+    )
+    missing = set(task_ids) - set(result.scalars().all())
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tasks not found: {sorted(missing)}",
+        )
+
+def _bulk_task_data(tasks) -> List[dict]:
+    return [Task.model_validate(task).model_dump(mode="json") for task in tasks]
+
+# Note: /bulk routes "/{task_id}" se pehle register hone chahiye, warna "bulk" task_id ban jata hai
+@router.post("/bulk", response_model=List[Task])
+async def bulk_create_tasks(
+    payload: TaskBulkCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Kai tasks ek hi transaction aur ek multi-row INSERT mein banayein.
+    Teammates ko sirf ek "task_bulk" event jata hai.
+    """
+    rows = [
+        {**task.model_dump(), "user_id": current_user.id, "tenant_id": current_user.tenant_id}
+        for task in payload.tasks
+    ]
+    result = await db.scalars(
+        insert(TaskModel).returning(TaskModel, sort_by_parameter_order=True), rows
+    )
+    created = result.all()
+
+    event = await record_event(
+        db, current_user.tenant_id, "task_bulk", {"created": _bulk_task_data(created)}
+    )
+    await db.commit()
+    for task in created:
+        scheduler.schedule(task.id, task.due_date)
+    await manager.broadcast(str(current_user.tenant_id), event)
+    return created
+
+@router.put("/bulk", response_model=List[Task])
+async def bulk_update_tasks(
+    payload: TaskBulkUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Kai tasks (e.g. Kanban reorganisation) ek transaction mein update karein.
+    Har item mein sirf bheje gaye fields badalte hain.
+    """
+    task_ids = [item.id for item in payload.tasks]
+    await _check_tenant_owns(db, current_user.tenant_id, task_ids)
+
+    # Primary key se ORM bulk UPDATE (executemany), ek statement per field-set
+    rows = [item.model_dump(exclude_unset=True) for item in payload.tasks]
+    for row in rows:
+        if "due_date" in row:
+            # Nayi due date ka overdue event phir se jayega
+            row["overdue_notified_at"] = None
+    await db.execute(update(TaskModel), rows)
+    await db.execute(
+        update(TaskModel)
+        .where(TaskModel.id.in_(task_ids))
+        .values(version=TaskModel.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.scalars(
+        select(TaskModel).where(TaskModel.id.in_(task_ids)).order_by(TaskModel.id)
+    )
+    updated = result.all()
+
+    event = await record_event(
+        db, current_user.tenant_id, "task_bulk", {"updated": _bulk_task_data(updated)}
+    )
+    await db.commit()
+    for task in updated:
+        if task.overdue_notified_at is None:
+            scheduler.schedule(task.id, task.due_date)
+    await manager.broadcast(str(current_user.tenant_id), event)
+    return updated
+
+@router.delete("/bulk", status_code=status.HTTP_204_NO_CONTENT)
+async def bulk_delete_tasks(
+    payload: TaskBulkDelete,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Kai tasks ek hi DELETE statement se hatayein.
+    """
+    task_ids = sorted(set(payload.ids))
+    await _check_tenant_owns(db, current_user.tenant_id, task_ids)
+    await db.execute(
+        delete(TaskModel).where(TaskModel.id.in_(task_ids), TaskModel.tenant_id == current_user.tenant_id)
+    )
+
+    event = await record_event(db, current_user.tenant_id, "task_bulk", {"deleted": task_ids})
+    await db.commit()
+    for task_id in task_ids:
+        scheduler.unschedule(task_id)
+    await manager.broadcast(str(current_user.tenant_id), event)
+    return
+
 @router.get("/{task_id}", response_model=Task)
 def get_task(
     task_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """
@@ -81,30 +373,74 @@ def get_task(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
     return task
 
-@router.put("/{task_id}", response_model=Task)
-async def update_task(
+async def _missing_or_conflict(db: AsyncSession, tenant_id: int, task_id: int) -> HTTPException:
+    """
+    Conditional write ne koi row nahi chhui: task hai hi nahi (404), ya version badal chuka hai
+    (409, current task ke saath taaki client merge kar sake).
+    """
+    result = await db.execute(
+        select(*TASK_COLUMNS).where(TaskModel.id == task_id, TaskModel.tenant_id == tenant_id)
+    )
+    current = result.one_or_none()
+    if current is None:
+        return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={
+            "message": "Task was changed by someone else",
+            "task": Task.model_validate(current).model_dump(mode="json"),
+        },
+    )
+
+async def _update_task(
+    db: AsyncSession,
+    current_user: User,
     task_id: int,
-    task_update: TaskUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    changes: dict,
+    expected_version: Optional[int] = None,
 ):
     """
-    Ek existing task ko update karein.
+    Ek hi UPDATE ... RETURNING: bina pehle SELECT ya baad ke refresh ke. expected_version ho to
+    sirf usi version par lagta hai.
     """
-    task = db.query(TaskModel).filter(
-        TaskModel.id == task_id, TaskModel.tenant_id == current_user.tenant_id
-    ).first()
-    if not task:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
-
-    update_data = task_update.dict(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(task, key, value)
-    
-    db.commit()
-    db.refresh(task)
+    conditions = [TaskModel.id == task_id, TaskModel.tenant_id == current_user.tenant_id]
+    if expected_version is not None:
+        conditions.append(TaskModel.version == expected_version)
+    if not changes:
+        # Khali PUT/PATCH: kuch nahi badla, to version, event aur broadcast bhi nahi (404/409 wahi)
+        task = (await db.execute(select(*TASK_COLUMNS).where(*conditions))).one_or_none()
+        if task is None:
+            raise await _missing_or_conflict(db, current_user.tenant_id, task_id)
+        return task
+    values = dict(changes, version=TaskModel.version + 1)
+    if "due_date" in changes:
+        # Due date sach mein badli ho to uska overdue event phir se jayega
+        values["overdue_notified_at"] = case(
+            (TaskModel.due_date.is_not_distinct_from(changes["due_date"]), TaskModel.overdue_notified_at),
+            else_=None,
+        )
+    returning = [*TASK_COLUMNS, TaskModel.overdue_notified_at]
+    previous_assignee = None
+    if "assigned_user_id" in changes:
+        if db.get_bind().dialect.name == "postgresql":
+            returning.append(PREVIOUS_ASSIGNEE)
+        else:
+            # SQLite ka subquery nayi row dekhta hai; wahan DB in-process hai, SELECT sasta hai
+            previous_assignee = await db.scalar(select(TaskModel.assigned_user_id).where(*conditions))
+    result = await db.execute(
+        update(TaskModel)
+        .where(*conditions)
+        .values(**values)
+        .returning(*returning)
+        .execution_options(synchronize_session=False)
+    )
+    task = result.one_or_none()
+    if task is None:
+        raise await _missing_or_conflict(db, current_user.tenant_id, task_id)
+    if "previous_assigned_user_id" in task._fields:
+        previous_assignee = task.previous_assigned_user_id
 
-    # Task update ko broadcast karein
+    # Task update ko event log mein likhein; commit ke baad broadcast karein
     task_data = {
         "id": task.id,
         "title": task.title,
@@ -113,32 +449,76 @@ async def update_task(
         "user_id": task.user_id,
         "assigned_user_id": task.assigned_user_id,
         "tenant_id": task.tenant_id,
-        "type": "task_update",
+        "version": task.version,
     }
-    await manager.broadcast(str(task.tenant_id), {"type": "task_update", "data": task_data})
-
+    if "assigned_user_id" in changes and task.assigned_user_id != previous_assignee:
+        # Pichhle assignee ke "assigned" subscribers ko bhi pata chale ki task hat gaya
+        task_data["previous_assigned_user_id"] = previous_assignee
+    event = await record_event(db, task.tenant_id, "task_update", task_data)
+    await db.commit()
+    if task.overdue_notified_at is None:
+        scheduler.schedule(task.id, task.due_date)
+    await manager.broadcast(str(task.tenant_id), event)
     return task
 
+@router.put("/{task_id}", response_model=Task)
+async def update_task(
+    task_id: int,
+    task_update: TaskUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Ek existing task ko update karein (last write wins; concurrent edits ke liye PATCH).
+    """
+    return await _update_task(db, current_user, task_id, task_update.dict(exclude_unset=True))
+
+@router.patch("/{task_id}", response_model=Task)
+async def patch_task(
+    task_id: int,
+    task_patch: TaskPatch,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Task ke bheje gaye fields badlein, agar woh abhi bhi task_patch.version par hai.
+    Beech mein kisi aur ne badla ho to 409 aur detail.task mein current task.
+    """
+    changes = task_patch.model_dump(exclude_unset=True, exclude={"version"})
+    return await _update_task(db, current_user, task_id, changes, task_patch.version)
+
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_task(
     task_id: int,
-    db: Session = Depends(get_db),
+    version: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """
-    Ek task ko delete karein.
+    Ek task ko ek hi DELETE ... RETURNING se delete karein.
+    ?version= dene par sirf tab jab task abhi bhi usi version par ho (warna 409).
     """
-    task = db.query(TaskModel).filter(
-        TaskModel.id == task_id, TaskModel.tenant_id == current_user.tenant_id
-    ).first()
-    if not task:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    conditions = [TaskModel.id == task_id, TaskModel.tenant_id == current_user.tenant_id]
+    if version is not None:
+        conditions.append(TaskModel.version == version)
+    result = await db.execute(
+        delete(TaskModel)
+        .where(*conditions)
+        .returning(TaskModel.assigned_user_id)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = result.one_or_none()
+    if deleted is None:
+        raise await _missing_or_conflict(db, current_user.tenant_id, task_id)
 
-    db.delete(task)
-    db.commit()
+    event = await record_event(
+        db, current_user.tenant_id, "task_delete", {"id": task_id, "assigned_user_id": deleted.assigned_user_id}
+    )
+    await db.commit()
+    scheduler.unschedule(task_id)
 
     # Task deletion ko broadcast karein
-    await manager.broadcast(str(task.tenant_id), {"type": "task_delete", "data": {"id": task_id}})
+    await manager.broadcast(str(current_user.tenant_id), event)
 
-    return
\ No newline at end of file
+    return
@@ -1,26 +1,32 @@
 # backend/app/routers/tenant.py
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.schemas.tenant import TenantCreate, TenantOut, TenantUpdate
 from app.models.tenant import Tenant as TenantModel
-from app.database import get_db
-from app.dependencies import get_current_user
+from app.database import get_db, shard_router
+from app.dependencies import get_async_db, get_current_user, get_read_db, tenant_etag
+from app.event_log import record_event
+from app.routers.websocket import manager
 from app.models.user import User as UserModel # Import UserModel to ensure admin check
 
 router = APIRouter(prefix="/tenants", tags=["tenants"])
 
 @router.post("/", response_model=TenantOut)
 def create_tenant(tenant: TenantCreate, db: Session = Depends(get_db)):
-    db_tenant = TenantModel(name=tenant.name)
+    tenant_id = shard_router.place_tenant()
+    db.info["tenant_id"] = tenant_id
+    db_tenant = TenantModel(id=tenant_id, name=tenant.name)
     db.add(db_tenant)
     db.commit()
     db.refresh(db_tenant)
     return db_tenant
 
-@router.get("/me", response_model=TenantOut)
+@router.get("/me", response_model=TenantOut, dependencies=[Depends(tenant_etag)])
 def get_my_tenant(
-    db: Session = Depends(get_db), current_user: UserModel = Depends(get_current_user)
+    db: Session = Depends(get_read_db), current_user: UserModel = Depends(get_current_user)
 ):
     tenant = db.query(TenantModel).filter(TenantModel.id == current_user.tenant_id).first()
     if not tenant:
@@ -28,9 +34,9 @@ def get_my_tenant(
     return tenant
 
 @router.put("/me", response_model=TenantOut)
-def update_tenant_name(
+async def update_tenant_name(
     tenant_update: TenantUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user),
 ):
     """
@@ -41,12 +47,19 @@ def update_tenant_name(
             status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can update team settings"
         )
 
-    tenant = db.query(TenantModel).filter(TenantModel.id == current_user.tenant_id).first()
+    result = await db.execute(select(TenantModel).where(TenantModel.id == current_user.tenant_id))
+    tenant = result.scalar_one_or_none()
     if not tenant:
         raise HTTPException(status_code=404, detail="Tenant not found")
 
     tenant.name = tenant_update.name
     db.add(tenant)
-    db.commit()
-    db.refresh(tenant)
+    await db.flush()
+    # Event record karne se tenant ka change version (ETag) bhi badalta hai
+    event = await record_event(
+        db, tenant.id, "tenant_update", TenantOut.model_validate(tenant).model_dump()
+    )
+    await db.commit()
+    await db.refresh(tenant)
+    await manager.broadcast(str(tenant.id), event)
     return tenant
\ No newline at end of file
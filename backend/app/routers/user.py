@@ -1,14 +1,18 @@
 # backend/app/routers/user.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Dict, Optional
 from app.schemas.user import UserOut, UserInvite
 from app.models.user import User as UserModel, UserRole
-from app.database import get_db
-from app.dependencies import get_current_user
-from bcrypt import hashpw, gensalt
+from app.database import AsyncSessionLocal, shard_router
+from app.dependencies import get_async_db, get_current_user, get_read_db, tenant_etag
+from app.passwords import password_hasher
 from app.routers.websocket import manager
+from app.event_log import record_event
+from app.serialization import fast_json_response, rows_to_dicts
 from app.models.task import Task as TaskModel
 import secrets
 
@@ -17,7 +21,7 @@ router = APIRouter(prefix="/users", tags=["users"])
 @router.post("/invite", response_model=UserOut)
 async def invite_user(
     user: UserInvite,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user),
 ):
     """
@@ -28,7 +32,15 @@ async def invite_user(
             status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can invite users"
         )
 
-    existing_user = db.query(UserModel).filter(UserModel.email == user.email).first()
+    result = await db.execute(select(UserModel.id).where(UserModel.email == user.email))
+    existing_user = result.first()
+    # Emails saare shards mein unique hain (login email se shard dhoondhta hai)
+    own_shard = db.info["shard"]  # get_async_db ne resolve kiya; yahan loop par lookup nahi
+    others = [shard for shard in shard_router.names if shard != own_shard]
+    while not existing_user and others:
+        async with AsyncSessionLocal(info={"shard": others.pop(0)}) as shard_db:
+            result = await shard_db.execute(select(UserModel.id).where(UserModel.email == user.email))
+            existing_user = result.first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
@@ -36,48 +48,52 @@ async def invite_user(
 
     # Generate a random password if not provided
     password = user.password or secrets.token_urlsafe(12)
-    hashed_password = hashpw(password.encode("utf-8"), gensalt())
+    hashed_password = await password_hasher.hash(password)
     new_user = UserModel(
         email=user.email,
-        hashed_password=hashed_password.decode("utf-8"),
+        hashed_password=hashed_password,
         tenant_id=current_user.tenant_id,
         role=user.role or UserRole.member,  # Default to 'member' if not provided
     )
     try:
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
-        await manager.broadcast(
-            str(current_user.tenant_id),
-            {"type": "new_member", "data": UserOut.from_orm(new_user).model_dump()}
+        await db.flush()
+        event = await record_event(
+            db, current_user.tenant_id, "new_member", UserOut.from_orm(new_user).model_dump()
         )
+        await db.commit()
+        await db.refresh(new_user)
+        await manager.broadcast(str(current_user.tenant_id), event)
         return UserOut.from_orm(new_user)
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to invite user: {str(e)}"
         )
 
-@router.get("/me", response_model=UserOut)
+@router.get("/me", response_model=UserOut, dependencies=[Depends(tenant_etag)])
 def get_current_user_info(current_user: UserModel = Depends(get_current_user)):
     """
     Current user ki info retrieve karein.
     """
     return UserOut.from_orm(current_user)
 
-@router.get("/", response_model=Dict[str, List[UserOut]])
+@router.get("/", response_model=Dict[str, List[UserOut]], dependencies=[Depends(tenant_etag)])
 def get_all_users(
-    db: Session = Depends(get_db),
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user: UserModel = Depends(get_current_user)
 ):
     """
     Current tenant ke sabhi users ko fetch karein.
     """
     try:
-        members = db.query(UserModel).filter(UserModel.tenant_id == current_user.tenant_id).all()
-        members_out = [UserOut.from_orm(member) for member in members]
-        return {"members": members_out}
+        # Sirf UserOut ke columns; hashed_password kabhi load nahi hota
+        members = db.query(
+            UserModel.id, UserModel.email, UserModel.tenant_id, UserModel.role
+        ).filter(UserModel.tenant_id == current_user.tenant_id).all()
+        return fast_json_response({"members": rows_to_dicts(members)}, response)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -87,7 +103,7 @@ def get_all_users(
 @router.delete("/remove/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def remove_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user),
 ):
     """
@@ -99,9 +115,10 @@ async def remove_user(
             status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can remove users"
         )
 
-    user_to_remove = db.query(UserModel).filter(
-        UserModel.id == user_id, UserModel.tenant_id == current_user.tenant_id
-    ).first()
+    result = await db.execute(
+        select(UserModel).where(UserModel.id == user_id, UserModel.tenant_id == current_user.tenant_id)
+    )
+    user_to_remove = result.scalar_one_or_none()
 
     if not user_to_remove:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found in this team")
@@ -113,18 +130,19 @@ async def remove_user(
         )
 
     try:
-        # Unassign tasks
-        db.query(TaskModel).filter(TaskModel.assigned_user_id == user_id).update(
-            {"assigned_user_id": None}
-        )
-        db.delete(user_to_remove)
-        db.commit()
-        await manager.broadcast(
-            str(current_user.tenant_id),
-            {"type": "member_removed", "data": {"id": user_id}}
+        # Unassign tasks; version badhta hai taaki purane version wale PATCH 409 paayein
+        await db.execute(
+            update(TaskModel)
+            .where(TaskModel.assigned_user_id == user_id)
+            .values(assigned_user_id=None, version=TaskModel.version + 1)
         )
+        await db.delete(user_to_remove)
+        event = await record_event(db, current_user.tenant_id, "member_removed", {"id": user_id})
+        await db.commit()
+        await manager.invalidate_principal(user_id)
+        await manager.broadcast(str(current_user.tenant_id), event)
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to remove user: {str(e)}"
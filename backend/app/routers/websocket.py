@@ -1,44 +1,517 @@
 # backend/app/routers/websocket.py
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from typing import Dict, List
-import json
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, WebSocketException, status
+from typing import Dict, Iterable, List, Optional, Set
+from collections import OrderedDict, deque
+from itertools import accumulate, count
+from app.config import settings
+from app.backplane import Backplane, create_backplane
+from app.database import AsyncSessionLocal, shard_router
+from app import event_log
+from app.dependencies import get_websocket_user
+from app.models.user import User
+from app.principal_cache import principal_cache
+from app.serialization import dumps
+from app.topics import TENANT, InvalidTopic, event_topics, resolve_topics, topic_name
+from app.ws_encoding import JSON, Encoded, Frame, InvalidEncoding, WireFormat, hello, negotiate
+import asyncio
+import logging
+import time
+import orjson
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Batch size histogram ke upper bounds
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100)
+# Backplane ka reserved channel (tenant ids numeric hain): principal cache invalidations
+PRINCIPALS_CHANNEL = "principals"
+
+async def _send(websocket: WebSocket, data: Encoded, timeout: float):
+    send = websocket.send_text if isinstance(data, str) else websocket.send_bytes
+    # asyncio.timeout (Python 3.11+) har send par naya task nahi banata; wait_for banata hai
+    if hasattr(asyncio, "timeout"):
+        async with asyncio.timeout(timeout):
+            await send(data)
+    else:
+        await asyncio.wait_for(send(data), timeout)
+
+class _Connection:
+    """
+    Ek websocket, uski bounded outgoing queue aur us queue ko drain karne wala sender task.
+    backlog (replay ke events) queue se pehle bheja jata hai. topics resolved index keys hain;
+    queue mein frames connection ke wire format mein encoded hote hain.
+    """
+    def __init__(
+        self, websocket: WebSocket, queue_size: int, topics: Set[str], wire: WireFormat,
+        user_id: Optional[int] = None,
+    ):
+        self.websocket = websocket
+        self.wire = wire
+        self.user_id = user_id
+        self.expiry: Optional[asyncio.TimerHandle] = None
+        self.queue: "asyncio.Queue[Encoded]" = asyncio.Queue(maxsize=queue_size)
+        self.backlog: "deque[Encoded]" = deque()
+        self.sender: Optional[asyncio.Task] = None
+        self.closed = False
+        self.topics = topics
 
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Dict[str, List[WebSocket]] = {}
+    def __init__(
+        self,
+        queue_size: int = settings.WS_SEND_QUEUE_SIZE,
+        slow_consumer_policy: str = settings.WS_SLOW_CONSUMER_POLICY,
+        send_timeout: float = settings.WS_SEND_TIMEOUT_SECONDS,
+        backplane: Optional[Backplane] = None,
+        coalesce_window_ms: int = settings.WS_COALESCE_WINDOW_MS,
+    ):
+        self.active_connections: Dict[str, Dict[WebSocket, _Connection]] = {}
+        # tenant -> topic -> connections; events sirf matching topics ke connections ko jaate hain
+        self.topic_index: Dict[str, Dict[str, Set[_Connection]]] = {}
+        self.backplane = backplane if backplane is not None else create_backplane()
+        self.queue_size = queue_size
+        self.slow_consumer_policy = slow_consumer_policy
+        self.send_timeout = send_timeout
+        self.evicted = 0
+        self.dropped = 0
+        self._background: Set[asyncio.Task] = set()  # fire-and-forget tasks ka strong reference
+        # Coalescing: tenant -> (key -> message), window khatam hone par flush
+        self.coalesce_window = coalesce_window_ms / 1000
+        self._pending: Dict[str, "OrderedDict[tuple, dict]"] = {}
+        self._event_ids = count()
+        self.batches_flushed = 0
+        self.events_coalesced = 0
+        self.batch_size_counts = [0] * (len(BATCH_SIZE_BUCKETS) + 1)  # aakhri = +Inf
+        self.batch_size_sum = 0
+
+    async def start(self):
+        await self.backplane.start(self._deliver)
+        # Har worker invalidations sunta hai, chahe us par koi socket khula ho ya nahi
+        await self.backplane.subscribe(PRINCIPALS_CHANNEL)
+
+    async def invalidate_principal(self, user_id: int):
+        """
+        User ki principal cache entry is worker mein aur (backplane se) baaki workers mein hatayein.
+        """
+        principal_cache.invalidate(user_id)
+        await self.backplane.publish(PRINCIPALS_CHANNEL, str(user_id))
 
-    async def connect(self, websocket: WebSocket, tenant_id: str):
+    async def stop(self):
+        for tenant_id in list(self._pending):
+            await self._flush(tenant_id)
+        await self.backplane.stop()
+
+    async def connect(
+        self, websocket: WebSocket, tenant_id: str, topics: Optional[Set[str]] = None,
+        wire: WireFormat = WireFormat(), paused: bool = False,
+        user_id: Optional[int] = None, expires_at: Optional[float] = None,
+    ):
+        """
+        topics resolved keys hain (dekhein app.topics); default poora tenant. wire frames ka
+        encoding hai (dekhein app.ws_encoding).
+        paused=True par live events queue mein jama hote hain par bheje nahi jaate,
+        jab tak resume() replay backlog na de de.
+        user_id ke "member_removed" par socket 1008 se band hota hai; expires_at (token ka exp,
+        epoch seconds) par bhi, taaki client naye token se reconnect kare.
+        """
         await websocket.accept()
-        if tenant_id not in self.active_connections:
-            self.active_connections[tenant_id] = []
-        self.active_connections[tenant_id].append(websocket)
-        print(f"Client connected to tenant {tenant_id}")
+        conn = _Connection(websocket, self.queue_size, set(), wire, user_id)
+        if expires_at is not None:
+            conn.expiry = asyncio.get_running_loop().call_later(
+                max(expires_at - time.time(), 0),
+                self._evict, tenant_id, conn, status.WS_1008_POLICY_VIOLATION, "Token expired",
+            )
+        greeting = hello(wire)
+        if greeting is not None:
+            conn.backlog.append(greeting)
+        if not paused:
+            conn.sender = asyncio.create_task(self._sender(tenant_id, conn))
+        first = tenant_id not in self.active_connections
+        if first:
+            self.active_connections[tenant_id] = {}
+            self.topic_index[tenant_id] = {}
+        # Await se pehle register karein, taaki beech ka disconnect tenant ko khaali na samjhe
+        self.active_connections[tenant_id][websocket] = conn
+        self._index(tenant_id, conn, topics if topics is not None else {TENANT})
+        if first:
+            # Pehla socket: is worker ko ab is tenant ke doosre workers wale events chahiye
+            await self.backplane.subscribe(tenant_id)
+        logger.debug("Client connected to tenant %s", tenant_id)
+
+    def set_topics(self, websocket: WebSocket, tenant_id: str, topics: Set[str]) -> Optional[Set[str]]:
+        """
+        Connection ki subscription badlein; naye topics lautata hai (socket na mile to None).
+        """
+        conn = self.active_connections.get(tenant_id, {}).get(websocket)
+        if conn is None:
+            return None
+        self._index(tenant_id, conn, topics)
+        return conn.topics
+
+    def _index(self, tenant_id: str, conn: _Connection, topics: Set[str]):
+        index = self.topic_index[tenant_id]
+        for topic in conn.topics - topics:
+            subscribers = index.get(topic)
+            if subscribers is not None:
+                subscribers.discard(conn)
+                if not subscribers:
+                    del index[topic]
+        for topic in topics - conn.topics:
+            index.setdefault(topic, set()).add(conn)
+        conn.topics = set(topics)
+
+    def send_to(self, websocket: WebSocket, tenant_id: str, message: dict):
+        """
+        Sirf ek connection ko message (e.g. subscription ka jawab), usi ki queue se.
+        """
+        conn = self.active_connections.get(tenant_id, {}).get(websocket)
+        if conn is not None:
+            self._enqueue(tenant_id, conn, Frame(message=message))
+
+    def resume(self, websocket: WebSocket, tenant_id: str, backlog: List[str]):
+        conn = self.active_connections.get(tenant_id, {}).get(websocket)
+        if conn is None or conn.sender is not None:
+            return
+        conn.backlog.extend(Frame(payload).encode(conn.wire) for payload in backlog)
+        conn.sender = asyncio.create_task(self._sender(tenant_id, conn))
 
     def disconnect(self, websocket: WebSocket, tenant_id: str):
-        if tenant_id in self.active_connections:
-            self.active_connections[tenant_id].remove(websocket)
-            if not self.active_connections[tenant_id]:
-                del self.active_connections[tenant_id]
-        print(f"Client disconnected from tenant {tenant_id}")
+        connections = self.active_connections.get(tenant_id)
+        conn = connections.pop(websocket, None) if connections is not None else None
+        if conn is not None:
+            self._index(tenant_id, conn, set())
+        if connections is not None and not connections:
+            del self.active_connections[tenant_id]
+            self.topic_index.pop(tenant_id, None)
+            self.backplane.unsubscribe(tenant_id)
+        if conn is None:
+            return  # Pehle hi hata diya gaya (e.g. evict ke baad endpoint ka disconnect)
+        conn.closed = True
+        if conn.expiry is not None:
+            conn.expiry.cancel()
+        if conn.sender is not None and conn.sender is not asyncio.current_task():
+            conn.sender.cancel()
+        logger.debug("Client disconnected from tenant %s", tenant_id)
 
     async def broadcast(self, tenant_id: str, message: dict):
-        if tenant_id in self.active_connections:
-            for connection in self.active_connections[tenant_id]:
-                await connection.send_text(json.dumps(message))
+        """
+        Message ko ek baar serialize karke local sockets ki queues mein daal dein,
+        aur backplane se doosre workers tak bhejein. Asli send har connection ka apna
+        sender task karta hai, isliye ek slow client baaki tenant ko nahi rokta.
+
+        Coalescing on ho to message pehle tenant ke buffer mein jata hai (dekhein _flush).
+        """
+        if self.coalesce_window <= 0:
+            await self._publish(tenant_id, message)
+            return
+        pending = self._pending.get(tenant_id)
+        if pending is None:
+            pending = self._pending[tenant_id] = OrderedDict()
+            self._spawn(self._flush_after_window(tenant_id))
+        key = self._coalesce_key(message)
+        if key in pending:
+            # Purani state hata kar nayi ko aakhir mein rakhein, taaki order bana rahe
+            message = self._supersede(pending.pop(key), message)
+            self.events_coalesced += 1
+        pending[key] = message
+
+    def _coalesce_key(self, message: dict) -> tuple:
+        if message.get("type") == "task_update":
+            return ("task_update", message["data"]["id"])
+        return ("event", next(self._event_ids))
+
+    @staticmethod
+    def _supersede(old: dict, new: dict) -> dict:
+        """
+        Window se pehle wala assignee coalesced update mein bana rahe, taaki reassignment
+        ka aakhri update usko bhi mile.
+        """
+        before = old["data"].get("previous_assigned_user_id", old["data"].get("assigned_user_id"))
+        data = {k: v for k, v in new["data"].items() if k != "previous_assigned_user_id"}
+        if before != data.get("assigned_user_id"):
+            data["previous_assigned_user_id"] = before
+        return {**new, "data": data}
+
+    async def _flush_after_window(self, tenant_id: str):
+        await asyncio.sleep(self.coalesce_window)
+        await self._flush(tenant_id)
+
+    async def _flush(self, tenant_id: str):
+        """
+        Buffer ke saare events ek "batch" message mein (ek hi event ho to as-is) bhejein.
+        Coalesce hue updates ke seq chhoot jaate hain; clients sirf max seq yaad rakhein.
+        """
+        pending = self._pending.pop(tenant_id, None)
+        if not pending:
+            return
+        events = list(pending.values())
+        self._observe_batch(len(events))
+        message = events[0] if len(events) == 1 else {"type": "batch", "events": events}
+        await self._publish(tenant_id, message)
+
+    def _observe_batch(self, size: int):
+        self.batches_flushed += 1
+        self.batch_size_sum += size
+        for index, bound in enumerate(BATCH_SIZE_BUCKETS):
+            if size <= bound:
+                self.batch_size_counts[index] += 1
+                return
+        self.batch_size_counts[-1] += 1
+
+    def batch_size_buckets(self) -> List[tuple]:
+        # Prometheus histogram ke cumulative (upper bound, count) buckets
+        bounds = [str(bound) for bound in BATCH_SIZE_BUCKETS] + ["+Inf"]
+        return list(zip(bounds, accumulate(self.batch_size_counts)))
+
+    async def _publish(self, tenant_id: str, message: dict):
+        frame = Frame(message=message)
+        self._route(tenant_id, frame)
+        await self.backplane.publish(tenant_id, frame.payload)
+
+    def _deliver(self, tenant_id: str, payload: str):
+        # Backplane se aaya (doosre worker ka) message
+        if tenant_id == PRINCIPALS_CHANNEL:
+            principal_cache.invalidate(int(payload))
+            return
+        self._route(tenant_id, Frame(payload))
+
+    def _route(self, tenant_id: str, frame: Frame):
+        """
+        Frame sirf un connections ki queues mein jo event ke kisi topic ko subscribe karte
+        hain. Sab connections tenant-wide hon to filter (aur remote payload ka parse) nahi hota.
+        """
+        connections = self.active_connections.get(tenant_id)
+        if not connections:
+            return
+        removed = self._removed_members(frame)
+        if removed:
+            # Hataye gaye member ke sockets yeh (ya koi aur) event nahi paate
+            for conn in list(connections.values()):
+                if conn.user_id in removed:
+                    self._evict(tenant_id, conn, status.WS_1008_POLICY_VIOLATION, "Removed from team")
+            connections = self.active_connections.get(tenant_id)
+            if not connections:
+                return
+        index = self.topic_index[tenant_id]
+        if len(index.get(TENANT, ())) == len(connections):
+            targets: Iterable[_Connection] = list(connections.values())
+        else:
+            message = frame.message
+            if message.get("type") == "batch":
+                self._route_batch(tenant_id, frame, message["events"])
+                return
+            targets = self._audience(tenant_id, event_topics(message))
+        for conn in targets:
+            self._enqueue(tenant_id, conn, frame)
+
+    @staticmethod
+    def _removed_members(frame: Frame) -> Set[int]:
+        # Substring check pehle, taaki har remote payload parse na karna pade
+        if '"member_removed"' not in frame.payload:
+            return set()
+        message = frame.message
+        events = message["events"] if message.get("type") == "batch" else [message]
+        return {event["data"]["id"] for event in events if event.get("type") == "member_removed"}
+
+    def _audience(self, tenant_id: str, topics: Optional[Set[str]]) -> Set[_Connection]:
+        if topics is None:
+            return set(self.active_connections[tenant_id].values())
+        index = self.topic_index[tenant_id]
+        return set().union(*(index.get(topic, ()) for topic in topics))
+
+    def _route_batch(self, tenant_id: str, frame: Frame, events: List[dict]):
+        """
+        Coalesced batch: har connection ko sirf uske matching events. Ek jaise subset wale
+        connections ke liye frame har encoding mein ek hi baar serialize hota hai.
+        """
+        picked: Dict[_Connection, List[int]] = {}
+        for position, event in enumerate(events):
+            for conn in self._audience(tenant_id, event_topics(event)):
+                picked.setdefault(conn, []).append(position)
+        groups: Dict[tuple, List[_Connection]] = {}
+        for conn, positions in picked.items():
+            groups.setdefault(tuple(positions), []).append(conn)
+        for positions, conns in groups.items():
+            if len(positions) == len(events):
+                body = frame
+            elif len(positions) == 1:
+                body = Frame(message=events[positions[0]])
+            else:
+                body = Frame(message={"type": "batch", "events": [events[p] for p in positions]})
+            for conn in conns:
+                self._enqueue(tenant_id, conn, body)
+
+    def _enqueue(self, tenant_id: str, conn: _Connection, frame: Frame):
+        if conn.closed:
+            return  # Isi delivery mein pehle evict ho chuka
+        payload = frame.encode(conn.wire)
+        try:
+            conn.queue.put_nowait(payload)
+            return
+        except asyncio.QueueFull:
+            pass
+        if self.slow_consumer_policy == "drop_oldest":
+            conn.queue.get_nowait()
+            conn.queue.put_nowait(payload)
+            self.dropped += 1
+        else:
+            self.evicted += 1
+            self._evict(tenant_id, conn, status.WS_1013_TRY_AGAIN_LATER)
+
+    async def _sender(self, tenant_id: str, conn: _Connection):
+        try:
+            # closed flag bhi dekhein: wait_for kabhi kabhi cancel ko nigal leta hai
+            while not conn.closed:
+                if conn.backlog:
+                    payload = conn.backlog.popleft()
+                else:
+                    payload = await conn.queue.get()
+                await _send(conn.websocket, payload, self.send_timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Dead socket ya send timeout: connection ko saaf kar dein
+            self._evict(tenant_id, conn, status.WS_1011_INTERNAL_ERROR)
+
+    def _evict(self, tenant_id: str, conn: _Connection, code: int, reason: Optional[str] = None):
+        self.disconnect(conn.websocket, tenant_id)
+        self._spawn(self._close(conn.websocket, code, reason))
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _close(self, websocket: WebSocket, code: int, reason: Optional[str] = None):
+        try:
+            await asyncio.wait_for(websocket.close(code=code, reason=reason), self.send_timeout)
+        except Exception:
+            pass  # Socket pehle se toot chuka hai
+
+    def queue_depth(self, tenant_id: Optional[str] = None) -> int:
+        tenants = [tenant_id] if tenant_id is not None else list(self.active_connections)
+        return sum(
+            conn.queue.qsize()
+            for tid in tenants
+            for conn in self.active_connections.get(tid, {}).values()
+        )
 
 manager = ConnectionManager()
 
+def _wants(payload: str, topics: Set[str]) -> bool:
+    if TENANT in topics:
+        return True
+    matched = event_topics(orjson.loads(payload))
+    return matched is None or not matched.isdisjoint(topics)
+
+async def _sync_backlog(tenant_id: str, since: Optional[int], topics: Set[str]) -> List[str]:
+    """
+    Reconnect par chhoote hue events (since ke baad, sirf subscribed topics ke) aur aakhir
+    mein current seq ka "sync" message. Cursor prune ho chuka ho to sirf "resync_required".
+    """
+    shard = await shard_router.shard_of_async(int(tenant_id))
+    async with AsyncSessionLocal(info={"shard": shard}) as db:
+        if since is None:
+            payloads, latest = [], await event_log.current_seq(db, int(tenant_id)) or 0
+        else:
+            payloads, latest = await event_log.events_since(db, int(tenant_id), since)
+    if payloads is None:
+        return [dumps({"type": "resync_required", "seq": latest})]
+    return [p for p in payloads if _wants(p, topics)] + [dumps({"type": "sync", "seq": latest})]
+
+def _limit_topics(topics: Set[str]) -> Set[str]:
+    if len(topics) > settings.WS_MAX_TOPICS:
+        raise InvalidTopic(f"At most {settings.WS_MAX_TOPICS} topics per connection")
+    return topics
+
+def _handle_client_message(websocket: WebSocket, tenant_id: str, user: User, data: Encoded) -> dict:
+    """
+    {"action": "subscribe" | "unsubscribe", "topics": [...]} -> subscription ka jawab.
+    Control messages har encoding mein JSON hain (text ya binary frame).
+    """
+    try:
+        request = orjson.loads(data)
+        action, names = request["action"], request["topics"]
+        if action not in ("subscribe", "unsubscribe") or not isinstance(names, list) \
+                or not all(isinstance(name, str) for name in names):
+            raise ValueError
+    except (ValueError, TypeError, KeyError):
+        return {"type": "error", "detail": 'Expected {"action": "subscribe" | "unsubscribe", "topics": [...]}'}
+    current = manager.active_connections.get(tenant_id, {}).get(websocket)
+    if current is None:
+        return {"type": "error", "detail": "Connection closed"}
+    try:
+        changed = resolve_topics(names, user.id)
+        if action == "subscribe":
+            topics = _limit_topics(current.topics | changed)
+        else:
+            topics = current.topics - changed
+    except InvalidTopic as e:
+        return {"type": "error", "detail": str(e)}
+    manager.set_topics(websocket, tenant_id, topics)
+    return {"type": "subscribed", "topics": sorted(topic_name(topic) for topic in topics)}
+
+@router.websocket("/ws")
+async def websocket_endpoint(
+    websocket: WebSocket,
+    since: Optional[int] = None,
+    topics: str = TENANT,
+    encoding: str = JSON,
+    compress: Optional[str] = None,
+    current_user: User = Depends(get_websocket_user),
+):
+    """
+    JWT ?token= (ya Authorization header) se; tenant user ka hi hota hai.
+    ?topics= comma-separated (tenant, assigned, task:<id>), default "tenant". Connection ke
+    dauran {"action": "subscribe" | "unsubscribe", "topics": [...]} se badlein.
+    ?encoding=msgpack aur ?compress=deflate ke liye dekhein app.ws_encoding.
+
+    Har event mein "seq" hota hai. Client aakhri seq yaad rakhe, reconnect par
+    ?since=<seq> bheje aur seq <= last wale duplicates ignore kare.
+    """
+    await _serve(websocket, current_user, since, topics, encoding, compress)
+
 @router.websocket("/ws/{tenant_id}")
-async def websocket_endpoint(websocket: WebSocket, tenant_id: str):
-    await manager.connect(websocket, tenant_id)
+async def tenant_websocket_endpoint(
+    websocket: WebSocket,
+    tenant_id: str,
+    since: Optional[int] = None,
+    topics: str = TENANT,
+    encoding: str = JSON,
+    compress: Optional[str] = None,
+    current_user: User = Depends(get_websocket_user),
+):
+    """
+    Purana URL; tenant_id token ke user ke tenant se match hona chahiye.
+    """
+    if tenant_id != str(current_user.tenant_id):
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION)
+    await _serve(websocket, current_user, since, topics, encoding, compress)
+
+async def _serve(
+    websocket: WebSocket, user: User, since: Optional[int], topics: str,
+    encoding: str, compress: Optional[str],
+):
+    tenant_id = str(user.tenant_id)
+    try:
+        subscribed = _limit_topics(resolve_topics(topics.split(","), user.id))
+        wire = negotiate(encoding, compress)
+    except (InvalidTopic, InvalidEncoding) as e:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=str(e))
+    # Pehle register karein taaki log padhne ke dauran aaye live events chhoot na jayein
+    await manager.connect(
+        websocket, tenant_id, subscribed, wire=wire, paused=True,
+        user_id=user.id, expires_at=getattr(websocket.state, "token_expires_at", None),
+    )
     try:
+        manager.resume(websocket, tenant_id, await _sync_backlog(tenant_id, since, subscribed))
         while True:
-            # We don't expect the client to send data for now, just receive
-            data = await websocket.receive_text()
-            # If a message is received, you can handle it here if needed.
-            print(f"Received message from client {tenant_id}: {data}")
+            received = await websocket.receive()
+            if received["type"] == "websocket.disconnect":
+                break
+            data = received["text"] if received.get("text") is not None else received.get("bytes")
+            manager.send_to(websocket, tenant_id, _handle_client_message(websocket, tenant_id, user, data))
     except WebSocketDisconnect:
-        manager.disconnect(websocket, tenant_id)
\ No newline at end of file
+        pass
+    finally:
+        manager.disconnect(websocket, tenant_id)
@@ -0,0 +1,66 @@
+# backend/app/schema_version.py
+
+import os
+import re
+from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ALEMBIC_INI = os.path.join(BACKEND_DIR, "alembic.ini")
+VERSIONS_DIR = os.path.join(BACKEND_DIR, "migrations", "versions")
+
+_REVISION = re.compile(r'^revision(?:: str)? = ["\'](\w+)["\']', re.MULTILINE)
+_DOWN_REVISION = re.compile(r'^down_revision(?:: [^=]+)? = ["\'](\w+)["\']', re.MULTILINE)
+
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+
+def head_revision() -> str:
+    """
+    Migration files se head revision nikaalein (jo kisi ka down_revision nahi hai).
+
+    Alembic import karke ScriptDirectory banana worker boot par ~200ms leta hai, isliye
+    files ko sirf regex se padha jata hai.
+    """
+    revisions, parents = set(), set()
+    for name in os.listdir(VERSIONS_DIR):
+        if not name.endswith(".py"):
+            continue
+        with open(os.path.join(VERSIONS_DIR, name), encoding="utf-8") as f:
+            source = f.read()
+        revisions.update(_REVISION.findall(source))
+        parents.update(_DOWN_REVISION.findall(source))
+    heads = revisions - parents
+    if len(heads) != 1:
+        raise SchemaVersionError(f"Expected exactly one migration head, found {sorted(heads)}")
+    return heads.pop()
+
+
+def current_revision(engine: Engine) -> Optional[str]:
+    """
+    Database ka applied revision; alembic_version table na ho to None.
+    """
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except DBAPIError:
+        return None
+
+
+def check_schema_version(engine: Engine) -> str:
+    """
+    Worker startup ka sasta check: ek single-row SELECT, koi catalog scan nahi.
+    Schema purana ho to SchemaVersionError, taaki app galat schema par na chale.
+    """
+    expected = head_revision()
+    current = current_revision(engine)
+    if current != expected:
+        raise SchemaVersionError(
+            f"Database schema is at revision {current or 'none'}, expected {expected}. "
+            "Run `alembic upgrade head` from the backend directory."
+        )
+    return current
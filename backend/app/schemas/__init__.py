@@ -1,4 +1,4 @@
 # backend/app/schemas/__init__.py
-from .task import Task, TaskCreate, TaskUpdate
+from .task import Task, TaskCreate, TaskUpdate, TaskPage, TaskBulkCreate, TaskBulkUpdate, TaskBulkDelete, TaskStats, TaskImportRow, TaskImportResult
 from .user import UserCreate, UserOut, UserInvite, UserLogin
 from .tenant import TenantOut, TenantCreate, TenantUpdate
\ No newline at end of file
@@ -1,10 +1,20 @@
 # backend/app/schemas/task.py
 
-from pydantic import BaseModel
-from typing import Optional
-from datetime import datetime
+from pydantic import BaseModel, Field, field_validator
+from typing import Dict, List, Optional
+from datetime import datetime, timezone
 import enum
 
+
+def naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    due_date column naive UTC hai (overdue checks utcnow se compare karte hain);
+    offset wali values ko UTC mein badal kar tzinfo hatayein. Naive values UTC maani jaati hain.
+    """
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
 class TaskStatus(str, enum.Enum):
     todo = "todo"
     in_progress = "in_progress"
@@ -23,6 +33,12 @@ class TaskBase(BaseModel):
     due_date: Optional[datetime] = None
     priority: TaskPriority = TaskPriority.medium
 
+    # Create, PUT/PATCH, bulk aur import sab isi schema se aate hain: conversion ek hi jagah
+    @field_validator("due_date")
+    @classmethod
+    def _due_date_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        return naive_utc(value)
+
 class TaskCreate(TaskBase):
     pass
 
@@ -31,10 +47,56 @@ class TaskUpdate(TaskBase):
     status: Optional[TaskStatus] = None
     priority: Optional[TaskPriority] = None
 
+class TaskPatch(TaskUpdate):
+    version: int # Client ne jo version dekha tha; beech mein badla ho to 409
+
 class Task(TaskBase):
     id: int
     user_id: int # Creator's ID
     tenant_id: int
+    version: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Ek bulk request mein zyada se zyada itne tasks
+MAX_BULK_TASKS = 500
+
+class TaskBulkCreate(BaseModel):
+    tasks: List[TaskCreate] = Field(..., min_length=1, max_length=MAX_BULK_TASKS)
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: int
+
+class TaskBulkUpdate(BaseModel):
+    tasks: List[TaskBulkUpdateItem] = Field(..., min_length=1, max_length=MAX_BULK_TASKS)
+
+class TaskBulkDelete(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_TASKS)
+
+class TaskImportRow(TaskCreate):
+    # Column lengths yahin check hoti hain, taaki ek lambi row poora COPY fail na kare
+    title: str = Field(..., max_length=255)
+    description: Optional[str] = Field(None, max_length=500)
+    # Doosre tools se aaye data mein assignee email se pehchana jata hai (ya assigned_user_id se)
+    assignee_email: Optional[str] = None
+
+class TaskImportError(BaseModel):
+    row: int # 1 se shuru; CSV mein header ke baad ka record, NDJSON mein line number
+    detail: str
+
+class TaskImportResult(BaseModel):
+    created: int
+    failed: int
+    errors: List[TaskImportError] # Pehle MAX_IMPORT_ERRORS tak hi
+
+class TaskPage(BaseModel):
+    tasks: List[Task]
+    next_cursor: Optional[str] = None # None matlab aakhri page
+
+class TaskStats(BaseModel):
+    total: int
+    by_status: Dict[str, int]
+    by_priority: Dict[str, int]
+    by_assignee: Dict[str, int] # user id (string) -> count; "unassigned" bhi
+    overdue: int # due_date guzar chuki hai aur status done nahi
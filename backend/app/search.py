@@ -0,0 +1,107 @@
+# backend/app/search.py
+
+import re
+from typing import Optional, Tuple
+from sqlalchemy import DDL, Double, and_, cast, column, event, func, literal_column, or_, table
+from sqlalchemy.orm import Query
+from app.models.task import Task
+
+# Postgres text search config aur SQLite FTS5 tokenizer (dono English stemming karte hain)
+SEARCH_CONFIG = "english"
+FTS_TABLE = "tasks_fts"
+SEARCH_INDEX = "ix_tasks_tenant_search_vector"
+GLOBAL_SEARCH_INDEX = "ix_tasks_search_vector"
+
+# SQLite: tasks_fts ek FTS5 table hai jiska rowid = tasks.id. Triggers har INSERT/UPDATE/DELETE
+# (single, bulk ya raw SQL) par index ko tasks ke saath sync rakhte hain. "tenant" column mein
+# task ka tenant_id token hai; MATCH usse scope hota hai, taaki doosre tenants ke hits
+# tasks join tak na pahunchein.
+SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE}
+        USING fts5(title, description, tenant, tokenize = 'porter unicode61')""",
+    # bm25 mein tenant column ka weight 0: woh sirf filter hai, relevance nahi
+    f"""INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('rank', 'bm25(1.0, 1.0, 0.0)')""",
+    f"""CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description, tenant)
+        VALUES (new.id, new.title, new.description, CAST(new.tenant_id AS TEXT));
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description, tenant_id ON tasks BEGIN
+        UPDATE {FTS_TABLE} SET title = new.title, description = new.description,
+            tenant = CAST(new.tenant_id AS TEXT)
+        WHERE rowid = old.id;
+    END""",
+    # Pehle se maujood tasks ko index mein bharein
+    f"""INSERT INTO {FTS_TABLE}(rowid, title, description, tenant)
+        SELECT id, title, description, CAST(tenant_id AS TEXT) FROM tasks
+        WHERE id NOT IN (SELECT rowid FROM {FTS_TABLE})""",
+]
+
+# Postgres: generated tsvector column khud sync rehta hai. GIN index (tenant_id, search_vector)
+# par hai (btree_gin), taaki "tenant_id = ? AND search_vector @@ ?" sirf us tenant ke
+# postings padhe. btree_gin na mile to search_vector akele par GIN (scope tab filter se).
+POSTGRES_DDL = [
+    f"""ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            to_tsvector('{SEARCH_CONFIG}', coalesce(title, '') || ' ' || coalesce(description, ''))
+        ) STORED""",
+    f"""DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'btree_gin') THEN
+                CREATE EXTENSION IF NOT EXISTS btree_gin;
+                CREATE INDEX IF NOT EXISTS {SEARCH_INDEX} ON tasks USING GIN (tenant_id, search_vector);
+                DROP INDEX IF EXISTS {GLOBAL_SEARCH_INDEX};
+            ELSE
+                RAISE NOTICE 'btree_gin is not available; task search uses a GIN index on search_vector only';
+                CREATE INDEX IF NOT EXISTS {GLOBAL_SEARCH_INDEX} ON tasks USING GIN (search_vector);
+            END IF;
+        END $$""",
+]
+
+for statement in SQLITE_DDL:
+    event.listen(Task.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in POSTGRES_DDL:
+    event.listen(Task.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+_fts = table(FTS_TABLE, column("rowid"), column(FTS_TABLE), column("rank"))
+
+
+def search_terms(q: str) -> list:
+    """
+    Query ko words mein todein; operators/quotes user se nahi aate (sab terms AND hote hain).
+    """
+    return _TERM.findall(q.lower())
+
+
+def apply_search(
+    query: Query, dialect: str, terms: list, tenant_id: int, after: Optional[Tuple[float, int]] = None
+) -> Query:
+    """
+    Tasks query par tenant-scoped full-text match aur relevance ordering lagayein.
+    Query mein "rank" column judta hai (chhota = zyada relevant; tie par id). after pichhle
+    page ki aakhri row ka (rank, id) hai: keyset, isliye gehre pages bhi offset scan nahi karte.
+    """
+    if dialect == "postgresql":
+        tsquery = func.plainto_tsquery(SEARCH_CONFIG, " ".join(terms))
+        vector = literal_column("tasks.search_vector")
+        # ts_rank real hai; double mein cast taaki cursor ki value round trip par exact rahe.
+        # Negative, taaki dono dialects mein ascending rank = zyada relevant pehle.
+        rank = -cast(func.ts_rank(vector, tsquery), Double)
+        query = query.filter(Task.tenant_id == tenant_id, vector.op("@@")(tsquery))
+    elif dialect == "sqlite":
+        # Har term quoted hai taaki FTS5 syntax (AND/OR/NEAR, "-", ":") inject na ho
+        phrases = " ".join(f'"{term}"' for term in terms)
+        match = f'tenant : "{int(tenant_id)}" AND {{title description}} : ({phrases})'
+        # FTS5 ka rank (bm25) jitna chhota utna relevant
+        rank = _fts.c.rank
+        query = query.join(_fts, _fts.c.rowid == Task.id).filter(_fts.c[FTS_TABLE].op("MATCH")(match))
+    else:
+        raise NotImplementedError(f"Full-text search is not supported on {dialect}")
+    if after is not None:
+        last_rank, last_id = after
+        query = query.filter(or_(rank > last_rank, and_(rank == last_rank, Task.id > last_id)))
+    return query.add_columns(rank.label("rank")).order_by(rank, Task.id)
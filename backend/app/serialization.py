@@ -0,0 +1,31 @@
+# backend/app/serialization.py
+
+from typing import Any, Iterable, List, Optional
+import orjson
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+
+
+def dumps(obj: Any) -> str:
+    """
+    orjson se JSON string banayein (websocket send_text aur event log ke liye).
+    Enums aur datetimes natively serialize hote hain.
+    """
+    return orjson.dumps(obj).decode("utf-8")
+
+
+def rows_to_dicts(rows: Iterable) -> List[dict]:
+    # Column-select se aaye Row objects -> plain dicts (ORM objects nahi banate)
+    return [row._asdict() for row in rows]
+
+
+def fast_json_response(content: Any, response: Optional[Response] = None) -> ORJSONResponse:
+    """
+    Pehle se plain dicts wale content ko seedha orjson se encode karein.
+
+    Response object lautane par FastAPI response_model validation skip kar deta hai,
+    lekin dependencies ke set kiye headers (e.g. ETag) bhi chhod deta hai, isliye
+    woh yahan copy kiye jaate hain.
+    """
+    headers = dict(response.headers) if response is not None else None
+    return ORJSONResponse(content, headers=headers)
@@ -0,0 +1,157 @@
+# backend/app/shards.py
+"""
+Tenant shards ka admin tool (SHARD_URLS wale config ke saath chalayein):
+
+    python -m app.shards list
+    python -m app.shards move --tenant 42 --to eu1
+    python -m app.shards purge --tenant 42 --shard default
+
+move ke dauran tenant directory mein "moving" rehta hai aur uske requests 503 paate hain:
+
+1. moving set karke SHARD_DIRECTORY_TTL_SECONDS (+ grace) rukna, taaki har worker ka cache use dekh le
+2. tenants, users, tasks aur tenant_events rows target par apne ids ke saath, ek transaction mein.
+   task_stats copy nahi hote; target ke triggers tasks insert hote hi unhe bana dete hain.
+3. directory flip: shard = target, moving = false
+4. source se tenant ki rows delete
+
+Step 1-3 mein error par moving hat jata hai aur tenant source par hi rehta hai. Step 4 fail ho to
+purani rows source par bekaar padi rehti hain; purge unhe baad mein hata deta hai.
+"""
+import argparse
+import sys
+import time
+from typing import Dict
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.database import shard_router, tenant_shards
+from app.models.event import TenantEvent
+from app.models.stats import TaskStat
+from app.models.task import Task
+from app.models.tenant import Tenant
+from app.models.user import User
+
+# Copy FK order mein; delete ulte order mein (task_stats ke saath)
+COPY_TABLES = (Tenant.__table__, User.__table__, Task.__table__, TenantEvent.__table__)
+PURGE_TABLES = (Task.__table__, TaskStat.__table__, TenantEvent.__table__, User.__table__, Tenant.__table__)
+COPY_BATCH_SIZE = 1000
+
+
+class MoveError(RuntimeError):
+    pass
+
+
+def _of_tenant(table, tenant_id: int):
+    return table.c.id == tenant_id if table is Tenant.__table__ else table.c.tenant_id == tenant_id
+
+
+def _set_moving(tenant_id: int, shard: str, moving: bool) -> None:
+    with shard_router.directory.begin() as conn:
+        changed = conn.execute(
+            update(tenant_shards).where(tenant_shards.c.tenant_id == tenant_id)
+            .values(shard=shard, moving=moving)
+        ).rowcount
+        if not changed:
+            # Sharding se pehle bana tenant: directory mein nahi, default shard par
+            conn.execute(insert(tenant_shards).values(tenant_id=tenant_id, shard=shard, moving=moving))
+
+
+def copy_tenant(source: Engine, target: Engine, tenant_id: int) -> Dict[str, int]:
+    """
+    Tenant ki rows source se target par, ek target transaction mein. Copied rows per table.
+    """
+    counts = {}
+    with source.connect() as src, target.begin() as dst:
+        if dst.scalar(select(Tenant.id).where(Tenant.id == tenant_id)) is not None:
+            raise MoveError(f"Tenant {tenant_id} already has rows on the target shard; purge them first")
+        for table in COPY_TABLES:
+            result = src.execution_options(yield_per=COPY_BATCH_SIZE).execute(
+                select(table).where(_of_tenant(table, tenant_id)).order_by(*table.primary_key.columns)
+            )
+            counts[table.name] = 0
+            for rows in result.mappings().partitions():
+                dst.execute(insert(table), [dict(row) for row in rows])
+                counts[table.name] += len(rows)
+    return counts
+
+
+def purge_tenant(engine: Engine, tenant_id: int) -> None:
+    with engine.begin() as conn:
+        for table in PURGE_TABLES:
+            conn.execute(delete(table).where(_of_tenant(table, tenant_id)))
+
+
+def move_tenant(tenant_id: int, target: str, grace_seconds: float = 2.0) -> Dict[str, int]:
+    if target not in shard_router.engines:
+        raise MoveError(f"Unknown shard: {target}")
+    source, moving = shard_router.lookup(tenant_id)
+    if moving:
+        raise MoveError(f"Tenant {tenant_id} is already being moved")
+    if source == target:
+        raise MoveError(f"Tenant {tenant_id} is already on {target}")
+    source_engine = shard_router.engines[source]
+    with source_engine.connect() as conn:
+        if conn.scalar(select(Tenant.id).where(Tenant.id == tenant_id)) is None:
+            raise MoveError(f"Tenant {tenant_id} not found on {source}")
+
+    _set_moving(tenant_id, source, True)
+    try:
+        # Cached mapping wale workers ke in-flight requests bhi khatam ho jaayein
+        time.sleep(settings.SHARD_DIRECTORY_TTL_SECONDS + grace_seconds)
+        counts = copy_tenant(source_engine, shard_router.engines[target], tenant_id)
+        _set_moving(tenant_id, target, False)
+    except BaseException:
+        _set_moving(tenant_id, source, False)
+        raise
+    purge_tenant(source_engine, tenant_id)
+    return counts
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Tenant shard directory and moves")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="Har shard par kitne tenants")
+    move = commands.add_parser("move", help="Tenant ko doosre shard par le jaayein")
+    move.add_argument("--tenant", type=int, required=True)
+    move.add_argument("--to", required=True, help="SHARD_URLS ka shard name, ya default")
+    move.add_argument("--grace", type=float, default=2.0, help="Cache TTL ke upar itne seconds rukein")
+    purge = commands.add_parser("purge", help="Move ke baad source par bachi rows hatayein")
+    purge.add_argument("--tenant", type=int, required=True)
+    purge.add_argument("--shard", required=True)
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        with shard_router.directory.connect() as conn:
+            rows = conn.execute(
+                select(tenant_shards.c.shard, tenant_shards.c.moving, func.count())
+                .group_by(tenant_shards.c.shard, tenant_shards.c.moving)
+            ).all()
+        counts = {(shard, bool(moving)): count for shard, moving, count in rows}
+        for shard in shard_router.names:
+            print(f"{shard}: {counts.get((shard, False), 0)} tenant(s), {counts.get((shard, True), 0)} moving")
+        return 0
+
+    if not shard_router.sharded:
+        print("SHARD_URLS is empty; there is only the default shard", file=sys.stderr)
+        return 2
+    try:
+        if args.command == "move":
+            counts = move_tenant(args.tenant, args.to, args.grace)
+            print(f"moved tenant {args.tenant} to {args.to}: {counts}")
+        else:
+            if args.shard not in shard_router.engines:
+                raise MoveError(f"Unknown shard: {args.shard}")
+            if shard_router.lookup(args.tenant)[0] == args.shard:
+                raise MoveError(f"Tenant {args.tenant} lives on {args.shard}; refusing to purge it")
+            purge_tenant(shard_router.engines[args.shard], args.tenant)
+            print(f"purged tenant {args.tenant} from {args.shard}")
+    except MoveError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
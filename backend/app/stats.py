@@ -0,0 +1,248 @@
+# backend/app/stats.py
+"""
+Board statistics: task_stats counters aur unka reconciliation job.
+
+    python -m app.stats               # drift check (drift ho to exit code 1)
+    python -m app.stats --rebuild     # counters tasks table se dobara banayein
+"""
+import argparse
+import sys
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import DDL, event, func, select, delete, text
+from sqlalchemy.orm import Session
+from app.models.stats import TaskStat
+from app.models.task import Task
+from app.schemas.task import TaskStatus, TaskPriority
+
+# Ek task row (new/old) ke liye chaaron counters par +delta/-delta ka upsert
+def _sqlite_upsert(row: str, delta: int) -> str:
+    return f"""INSERT INTO task_stats (tenant_id, dimension, key, count) VALUES
+        ({row}.tenant_id, 'total', '', {delta}),
+        ({row}.tenant_id, 'status', coalesce({row}.status, ''), {delta}),
+        ({row}.tenant_id, 'priority', coalesce({row}.priority, ''), {delta}),
+        ({row}.tenant_id, 'assignee', coalesce(CAST({row}.assigned_user_id AS TEXT), ''), {delta})
+        ON CONFLICT (tenant_id, dimension, key) DO UPDATE SET count = count + excluded.count;"""
+
+_SQLITE_CHANGED = (
+    "old.tenant_id IS NOT new.tenant_id OR old.status IS NOT new.status "
+    "OR old.priority IS NOT new.priority OR old.assigned_user_id IS NOT new.assigned_user_id"
+)
+
+SQLITE_DDL = [
+    f"""CREATE TRIGGER IF NOT EXISTS task_stats_ai AFTER INSERT ON tasks
+        WHEN new.tenant_id IS NOT NULL BEGIN {_sqlite_upsert("new", 1)} END""",
+    f"""CREATE TRIGGER IF NOT EXISTS task_stats_ad AFTER DELETE ON tasks
+        WHEN old.tenant_id IS NOT NULL BEGIN {_sqlite_upsert("old", -1)} END""",
+    f"""CREATE TRIGGER IF NOT EXISTS task_stats_au
+        AFTER UPDATE OF tenant_id, status, priority, assigned_user_id ON tasks
+        WHEN {_SQLITE_CHANGED} BEGIN
+        {_sqlite_upsert("old", -1)}
+        {_sqlite_upsert("new", 1)}
+    END""",
+]
+
+# Ek statement ki saari changed rows (transition tables) ke deltas, (tenant, dimension, key)
+# par GROUP BY karke ek hi upsert mein. Row-level trigger har row par wahi "total" row
+# dobara update karta tha, jo ek transaction mein badi bulk writes ko quadratic bana deta hai.
+def _postgres_upsert(*sources: Tuple[str, int]) -> str:
+    rows = " UNION ALL ".join(
+        f"SELECT tenant_id, status::text AS s, priority::text AS p, "
+        f"assigned_user_id::text AS a, {delta} AS delta FROM {table}"
+        for table, delta in sources
+    )
+    return f"""INSERT INTO task_stats (tenant_id, dimension, key, count)
+                SELECT r.tenant_id, d.dimension, d.key, sum(r.delta)
+                FROM ({rows}) r
+                CROSS JOIN LATERAL (VALUES ('total', ''), ('status', coalesce(r.s, '')),
+                    ('priority', coalesce(r.p, '')), ('assignee', coalesce(r.a, '')))
+                    AS d (dimension, key)
+                WHERE r.tenant_id IS NOT NULL
+                GROUP BY r.tenant_id, d.dimension, d.key
+                HAVING sum(r.delta) <> 0
+                -- Sab writers counters ek hi order mein lock karte hain
+                ORDER BY 1, 2, 3
+                ON CONFLICT (tenant_id, dimension, key)
+                DO UPDATE SET count = task_stats.count + EXCLUDED.count"""
+
+POSTGRES_DDL = [
+    "DROP TRIGGER IF EXISTS task_stats_sync ON tasks",
+    "DROP FUNCTION IF EXISTS task_stats_apply(integer, text, text, text, integer)",
+    f"""CREATE OR REPLACE FUNCTION task_stats_sync() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {_postgres_upsert(("new_rows", 1))};
+            ELSIF TG_OP = 'DELETE' THEN
+                {_postgres_upsert(("old_rows", -1))};
+            ELSE
+                -- Sirf title/description badle to deltas zero hote hain aur kuch nahi likha jata
+                {_postgres_upsert(("old_rows", -1), ("new_rows", 1))};
+            END IF;
+            RETURN NULL;
+        END $$ LANGUAGE plpgsql""",
+    # Transition tables ek trigger mein ek hi event aur bina column list ke milti hain
+    "DROP TRIGGER IF EXISTS task_stats_ins ON tasks",
+    """CREATE TRIGGER task_stats_ins AFTER INSERT ON tasks
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION task_stats_sync()""",
+    "DROP TRIGGER IF EXISTS task_stats_del ON tasks",
+    """CREATE TRIGGER task_stats_del AFTER DELETE ON tasks
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION task_stats_sync()""",
+    "DROP TRIGGER IF EXISTS task_stats_upd ON tasks",
+    """CREATE TRIGGER task_stats_upd AFTER UPDATE ON tasks
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION task_stats_sync()""",
+]
+
+# tasks table se saare counters ek INSERT ... SELECT mein (table banne par backfill aur rebuild)
+REBUILD_SQL = """INSERT INTO task_stats (tenant_id, dimension, key, count)
+    SELECT tenant_id, 'total', '', count(*) FROM tasks WHERE {where} GROUP BY tenant_id
+    UNION ALL
+    SELECT tenant_id, 'status', coalesce(CAST(status AS TEXT), ''), count(*)
+        FROM tasks WHERE {where} GROUP BY tenant_id, status
+    UNION ALL
+    SELECT tenant_id, 'priority', coalesce(CAST(priority AS TEXT), ''), count(*)
+        FROM tasks WHERE {where} GROUP BY tenant_id, priority
+    UNION ALL
+    SELECT tenant_id, 'assignee', coalesce(CAST(assigned_user_id AS TEXT), ''), count(*)
+        FROM tasks WHERE {where} GROUP BY tenant_id, assigned_user_id"""
+
+for statement in SQLITE_DDL:
+    event.listen(TaskStat.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in POSTGRES_DDL:
+    event.listen(TaskStat.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+event.listen(
+    TaskStat.__table__, "after_create", DDL(REBUILD_SQL.format(where="tenant_id IS NOT NULL"))
+)
+
+
+def _actual_counts(db: Session, tenant_id: Optional[int] = None) -> dict:
+    """
+    tasks table se ORM GROUP BY karke counters nikaalein. Drift check triggers/REBUILD_SQL
+    se alag raaste se ginta hai, taaki dono ki galti ek jaisi na ho.
+    """
+    columns = {
+        "total": None,
+        "status": Task.status,
+        "priority": Task.priority,
+        "assignee": Task.assigned_user_id,
+    }
+    counts = {}
+    for dimension, column in columns.items():
+        group = [Task.tenant_id] + ([column] if column is not None else [])
+        query = select(*group, func.count()).where(Task.tenant_id.isnot(None)).group_by(*group)
+        if tenant_id is not None:
+            query = query.where(Task.tenant_id == tenant_id)
+        for row in db.execute(query):
+            value = row[1] if column is not None else None
+            key = "" if value is None else str(getattr(value, "value", value))
+            counts[(row[0], dimension, key)] = row[-1]
+    return counts
+
+
+def _stored_counts(db: Session, tenant_id: Optional[int] = None) -> dict:
+    query = select(TaskStat).where(TaskStat.count != 0)
+    if tenant_id is not None:
+        query = query.where(TaskStat.tenant_id == tenant_id)
+    return {(s.tenant_id, s.dimension, s.key): s.count for s in db.scalars(query)}
+
+
+def check_drift(db: Session, tenant_id: Optional[int] = None) -> List[dict]:
+    """
+    Stored counters ko tasks table se compare karein; har mismatch ek dict hai.
+    """
+    actual = _actual_counts(db, tenant_id)
+    stored = _stored_counts(db, tenant_id)
+    return [
+        {"tenant_id": key[0], "dimension": key[1], "key": key[2],
+         "stored": stored.get(key, 0), "actual": actual.get(key, 0)}
+        for key in sorted(set(actual) | set(stored))
+        if stored.get(key, 0) != actual.get(key, 0)
+    ]
+
+
+def rebuild_stats(db: Session, tenant_id: Optional[int] = None) -> int:
+    """
+    Counters ko tasks table se shuru se banayein, ek transaction mein. Likhi gayi rows lautata hai.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        # Triggers ke upserts rebuild commit hone tak rukte hain, taaki koi delta kho na jaye
+        db.execute(text("LOCK TABLE task_stats IN SHARE ROW EXCLUSIVE MODE"))
+    clear = delete(TaskStat)
+    where, params = "tenant_id IS NOT NULL", {}
+    if tenant_id is not None:
+        clear = clear.where(TaskStat.tenant_id == tenant_id)
+        where, params = "tenant_id = :tenant_id", {"tenant_id": tenant_id}
+    db.execute(clear)
+    result = db.execute(text(REBUILD_SQL.format(where=where)), params)
+    db.commit()
+    return result.rowcount
+
+
+def tenant_stats(db: Session, tenant_id: int, now: Optional[datetime] = None) -> dict:
+    """
+    GET /tasks/stats ka payload: counters task_stats se, overdue ek indexed range query se.
+    """
+    stats = {
+        "total": 0,
+        "by_status": {s.value: 0 for s in TaskStatus},
+        "by_priority": {p.value: 0 for p in TaskPriority},
+        "by_assignee": {},
+    }
+    rows = db.execute(
+        select(TaskStat.dimension, TaskStat.key, TaskStat.count).where(
+            TaskStat.tenant_id == tenant_id, TaskStat.count != 0
+        )
+    )
+    for dimension, key, count in rows:
+        if dimension == "total":
+            stats["total"] = count
+        elif dimension == "assignee":
+            stats["by_assignee"][key or "unassigned"] = count
+        else:
+            stats[f"by_{dimension}"][key] = count
+
+    # Overdue waqt ke saath badalta hai, isliye counter nahi; (tenant_id, due_date) index par range scan
+    stats["overdue"] = db.scalar(
+        select(func.count()).select_from(Task).where(
+            Task.tenant_id == tenant_id,
+            Task.due_date < (now or datetime.utcnow()),
+            Task.status != TaskStatus.done,
+        )
+    )
+    return stats
+
+
+def main(argv=None) -> int:
+    from app.database import SessionLocal, shard_router
+
+    parser = argparse.ArgumentParser(description="Reconcile task_stats counters")
+    parser.add_argument("--tenant", type=int, default=None, help="Sirf is tenant ke counters")
+    parser.add_argument("--rebuild", action="store_true", help="Counters tasks table se dobara banayein")
+    args = parser.parse_args(argv)
+
+    # Tenant diya ho to uska shard, warna har shard
+    if args.tenant is not None:
+        sessions = [SessionLocal(info={"tenant_id": args.tenant})]
+    else:
+        sessions = [SessionLocal(info={"shard": shard}) for shard in shard_router.names]
+    drifted = 0
+    for db in sessions:
+        try:
+            drift = check_drift(db, args.tenant)
+            for row in drift:
+                print(f"drift: {row}")
+            print(f"{len(drift)} drifted counter(s)")
+            drifted += len(drift)
+            if args.rebuild:
+                db.rollback()
+                print(f"rebuilt {rebuild_stats(db, args.tenant)} counter(s)")
+        finally:
+            db.close()
+    if args.rebuild:
+        return 0
+    return 1 if drifted else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+# backend/app/topics.py
+"""
+Websocket subscription topics.
+
+Client in naamon se subscribe karta hai:
+
+    tenant          tenant ke saare events (default)
+    assigned        mujhe assigned tasks ke events
+    task:<id>       ek task ke events
+
+Server par "assigned" user ke hisaab se "assigned:<user_id>" key ban jata hai, taaki ek
+tenant ke saare connections ek hi topic index mein rahein.
+"""
+from typing import Iterable, Optional, Set
+
+TENANT = "tenant"
+ASSIGNED = "assigned"
+TASK_PREFIX = "task:"
+
+# Inke alawa events (members, tenant, bulk/import) tenant ke har connection ko jaate hain
+TASK_EVENTS = {"task_create", "task_update", "task_delete", "task_overdue"}
+
+
+class InvalidTopic(ValueError):
+    pass
+
+
+def resolve_topic(topic: str, user_id: int) -> str:
+    """
+    Client ka topic naam -> index key. Galat naam par InvalidTopic.
+    """
+    if topic == TENANT:
+        return TENANT
+    if topic == ASSIGNED:
+        return f"{ASSIGNED}:{user_id}"
+    if topic.startswith(TASK_PREFIX) and topic[len(TASK_PREFIX):].isdigit():
+        return f"{TASK_PREFIX}{int(topic[len(TASK_PREFIX):])}"
+    raise InvalidTopic(f"Unknown topic: {topic}")
+
+
+def topic_name(key: str) -> str:
+    """
+    Index key -> client ka topic naam ("assigned:7" -> "assigned").
+    """
+    return ASSIGNED if key.startswith(ASSIGNED + ":") else key
+
+
+def resolve_topics(topics: Iterable[str], user_id: int) -> Set[str]:
+    return {resolve_topic(topic.strip(), user_id) for topic in topics if topic.strip()}
+
+
+def event_topics(message: dict) -> Optional[Set[str]]:
+    """
+    Event kin topics se match karta hai; None matlab tenant ke har connection ko.
+
+    Task events task ke topic, tenant topic aur assignee (aur reassignment par pichhle
+    assignee) ke topic par jaate hain, taaki "assigned" view se hata task bhi update ho.
+    """
+    if message.get("type") not in TASK_EVENTS:
+        return None
+    data = message.get("data") or {}
+    topics = {TENANT, f"{TASK_PREFIX}{data.get('id')}"}
+    for key in ("assigned_user_id", "previous_assigned_user_id"):
+        if data.get(key) is not None:
+            topics.add(f"{ASSIGNED}:{data[key]}")
+    return topics
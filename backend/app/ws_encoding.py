@@ -0,0 +1,132 @@
+# backend/app/ws_encoding.py
+"""
+Websocket frame encodings. Connection ?encoding= se chunta hai:
+
+    json        text frames, JSON (default)
+    msgpack     binary frames, msgpack. KEYS table ke keys apne index (int) ban jaate hain;
+                table connection ke pehle "hello" frame mein (plain keys ke saath) aati hai.
+
+?compress=deflate par WS_COMPRESS_MIN_BYTES se bade frames zlib se compress hokar binary
+frame mein jaate hain. zlib stream ka pehla byte 0x78 hota hai aur msgpack message hamesha
+map hota hai, isliye client pehle byte se pehchan sakta hai.
+
+Ek message har wire format ke liye ek hi baar encode hota hai, chahe kitne bhi sockets hon.
+"""
+import zlib
+from datetime import date
+from enum import Enum
+from typing import Dict, NamedTuple, Optional, Union
+
+import msgpack
+import orjson
+
+from app.config import settings
+from app.serialization import dumps
+
+JSON = "json"
+MSGPACK = "msgpack"
+DEFLATE = "deflate"
+
+# Naye keys sirf aakhir mein jodein; index hi wire par jata hai
+KEYS = (
+    "type", "data", "seq", "events",
+    "id", "title", "description", "status", "priority", "due_date", "completed",
+    "user_id", "assigned_user_id", "previous_assigned_user_id", "tenant_id",
+    "created", "updated", "deleted", "failed", "email", "role", "name",
+    "version",
+)
+KEY_INDEX = {key: index for index, key in enumerate(KEYS)}
+
+Encoded = Union[str, bytes]
+
+
+class InvalidEncoding(ValueError):
+    pass
+
+
+class WireFormat(NamedTuple):
+    encoding: str = JSON
+    compress: bool = False
+
+    @property
+    def label(self) -> str:
+        return f"{self.encoding}+{DEFLATE}" if self.compress else self.encoding
+
+
+def negotiate(encoding: str = JSON, compress: Optional[str] = None) -> WireFormat:
+    if encoding not in (JSON, MSGPACK):
+        raise InvalidEncoding(f"Unknown encoding: {encoding}")
+    if compress not in (None, "", DEFLATE):
+        raise InvalidEncoding(f"Unknown compression: {compress}")
+    return WireFormat(encoding, compress == DEFLATE)
+
+
+def _default(obj):
+    # Wahi strings jo orjson JSON payload mein likhta hai
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, date):
+        return obj.isoformat()
+    raise TypeError(f"Cannot encode {type(obj).__name__}")
+
+
+def _compact(obj):
+    if isinstance(obj, dict):
+        return {KEY_INDEX.get(key, key): _compact(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_compact(value) for value in obj]
+    return obj
+
+
+def hello(wire: WireFormat) -> Optional[bytes]:
+    """
+    msgpack connections ka pehla frame: key table. JSON ke liye kuch nahi.
+    """
+    if wire.encoding != MSGPACK:
+        return None
+    return msgpack.packb({"type": "hello", "encoding": wire.label, "keys": list(KEYS)})
+
+
+class Frame:
+    """
+    Ek message ke encoded roop, har wire format ke liye pehli zaroorat par ek baar.
+    Sirf payload (backplane, replay) ya sirf message diya ho to doosra tabhi banta hai
+    jab kisi wire format ko chahiye.
+    """
+
+    __slots__ = ("_payload", "_message", "_encoded")
+
+    def __init__(self, payload: Optional[str] = None, message: Optional[dict] = None):
+        self._payload = payload
+        self._message = message
+        self._encoded: Dict[WireFormat, Encoded] = {}
+
+    @property
+    def payload(self) -> str:
+        if self._payload is None:
+            self._payload = dumps(self._message)
+        return self._payload
+
+    @property
+    def message(self) -> dict:
+        if self._message is None:
+            self._message = orjson.loads(self._payload)
+        return self._message
+
+    def encode(self, wire: WireFormat) -> Encoded:
+        encoded = self._encoded.get(wire)
+        if encoded is None:
+            encoded = self._encoded[wire] = self._encode(wire)
+        return encoded
+
+    def _encode(self, wire: WireFormat) -> Encoded:
+        if wire.encoding == MSGPACK:
+            data: Encoded = msgpack.packb(_compact(self.message), default=_default)
+        else:
+            data = self.payload
+        if wire.compress and len(data) >= settings.WS_COMPRESS_MIN_BYTES:
+            raw = data.encode("utf-8") if isinstance(data, str) else data
+            compressed = zlib.compress(raw, settings.WS_COMPRESS_LEVEL)
+            if len(compressed) < len(raw):
+                return compressed
+        return data
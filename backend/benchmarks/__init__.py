@@ -0,0 +1,2 @@
+# backend/benchmarks/__init__.py
+# Run from the backend directory, e.g. `python -m benchmarks.password_hashing`.
@@ -0,0 +1,60 @@
+# backend/benchmarks/cold_start.py
+"""
+Worker cold-start schema cost: create_all on import vs alembic version check.
+
+    DATABASE_URL=postgresql://... python -m benchmarks.cold_start --repeat 20
+
+Migrates the target database to head, then times what each worker used to do on
+boot (metadata.create_all, one catalog lookup per table) against the startup check
+(one SELECT from alembic_version). Every round uses a fresh engine, as a new worker would.
+"""
+import argparse
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from sqlalchemy import create_engine, pool  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.database import Base  # noqa: E402
+from app import models  # noqa: E402,F401
+from app.schema_version import ALEMBIC_INI, check_schema_version  # noqa: E402
+
+
+def _create_all(engine):
+    Base.metadata.create_all(bind=engine)
+
+
+def _version_check(engine):
+    check_schema_version(engine)
+
+
+def _time(fn, url: str, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        engine = create_engine(url, poolclass=pool.NullPool)
+        start = time.perf_counter()
+        fn(engine)
+        timings.append((time.perf_counter() - start) * 1000)
+        engine.dispose()
+    return {
+        "mode": fn.__name__.strip("_"),
+        "median_ms": round(statistics.median(timings), 2),
+        "max_ms": round(max(timings), 2),
+    }
+
+
+def main(args):
+    command.upgrade(Config(ALEMBIC_INI), "head")
+    for fn in (_create_all, _version_check):
+        print(_time(fn, settings.DATABASE_URL, args.repeat))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    main(parser.parse_args())
@@ -0,0 +1,403 @@
+# backend/benchmarks/e2e.py
+"""
+End-to-end API and websocket benchmark against a real uvicorn server.
+
+    python -m benchmarks.e2e --tenants 5 --users 10 --tasks 2000 --concurrency 32 \\
+        --duration 20 --ws-clients 200 --output bench.json
+    python -m benchmarks.e2e --database-url postgresql://localhost/taskflow_bench ...
+
+Migrates and seeds a private SQLite file in a temp directory (removed afterwards), or the
+database given with --database-url (migrated and seeded, never deleted; the DATABASE_URL
+environment variable is ignored), boots app.main:app with uvicorn in a background thread, and drives a
+weighted mix of auth/task/user/tenant requests from --concurrency clients for --duration
+seconds. Then --ws-clients websockets join one tenant and each manager.broadcast call is
+timed until every client has received it. Results are written as JSON for diffing.
+
+The load generator shares the process (and GIL) with the server: compare runs made on
+the same machine, don't read the numbers as absolute capacity.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+# Settings import par padhe jaate hain, isliye database app import se pehle tay hota hai
+_database = argparse.ArgumentParser(add_help=False)
+_database.add_argument("--database-url")
+DATABASE_URL = _database.parse_known_args()[0].database_url
+SCRATCH_DIR = None
+if DATABASE_URL is None:
+    SCRATCH_DIR = tempfile.mkdtemp(prefix="taskflow-bench-")
+    DATABASE_URL = "sqlite:///" + os.path.join(SCRATCH_DIR, "benchmark_e2e.db")
+    # Private run .env ke shards/replicas ko bhi na chhue
+    os.environ["SHARD_URLS"] = "{}"
+    os.environ["READ_REPLICA_URLS"] = "[]"
+os.environ["DATABASE_URL"] = DATABASE_URL
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+import websockets  # noqa: E402
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app.models.task import Task  # noqa: E402
+from app.models.tenant import Tenant  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+from app.passwords import password_hasher  # noqa: E402
+from app.schema_version import ALEMBIC_INI, BACKEND_DIR  # noqa: E402
+from app.schemas.task import TaskStatus, TaskPriority  # noqa: E402
+
+PASSWORD = "benchmark"
+WORDS = ["deploy", "login", "invoice", "report", "backup", "refactor", "design", "review",
+         "migrate", "release", "customer", "dashboard", "billing", "search", "cache"]
+
+
+def _percentiles(samples: list) -> dict:
+    if not samples:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+    ordered = sorted(samples)
+
+    def rank(p):
+        return round(ordered[max(0, int(len(ordered) * p + 0.5) - 1)] * 1000, 2)
+    return {"p50_ms": rank(0.50), "p95_ms": rank(0.95), "p99_ms": rank(0.99),
+            "max_ms": round(ordered[-1] * 1000, 2)}
+
+
+def _seed(args, run_id: str) -> list:
+    """
+    Tenants, users aur tasks seedha bulk INSERT se; har tenant ka dict lautata hai.
+    """
+    rng = random.Random(args.seed)
+    hashed = password_hasher.hash_sync(PASSWORD)
+    now = datetime.utcnow()
+    tenants = []
+    with SessionLocal() as db:
+        for t in range(args.tenants):
+            tenant = Tenant(name=f"bench-{run_id}-{t}")
+            db.add(tenant)
+            db.flush()
+            user_ids = db.scalars(insert(User).returning(User.id), [
+                {"email": f"u{u}-t{t}-{run_id}@example.com", "hashed_password": hashed,
+                 "tenant_id": tenant.id, "role": UserRole.admin if u == 0 else UserRole.member}
+                for u in range(args.users)
+            ]).all()
+            task_ids = []
+            for start in range(0, args.tasks, 1000):
+                rows = [
+                    {"title": " ".join(rng.sample(WORDS, 3)), "description": " ".join(rng.sample(WORDS, 6)),
+                     "status": rng.choice(list(TaskStatus)), "priority": rng.choice(list(TaskPriority)),
+                     "user_id": user_ids[0], "assigned_user_id": rng.choice(user_ids + [None]),
+                     "tenant_id": tenant.id,
+                     "due_date": now + timedelta(days=rng.randint(-30, 30)) if rng.random() < 0.5 else None}
+                    for _ in range(start, min(start + 1000, args.tasks))
+                ]
+                for row in rows:
+                    # Jaise migration 0007: pehle se overdue tasks ke events startup par na jayein
+                    due_date = row["due_date"]
+                    row["overdue_notified_at"] = due_date if due_date is not None and due_date < now else None
+                task_ids += db.scalars(insert(Task).returning(Task.id), rows).all()
+            tenants.append({
+                "id": tenant.id,
+                "emails": [f"u{u}-t{t}-{run_id}@example.com" for u in range(args.users)],
+                "user_ids": list(user_ids),
+                "task_ids": task_ids,
+            })
+        db.commit()
+    return tenants
+
+
+class ServerThread(threading.Thread):
+    """
+    uvicorn ko apne event loop ke saath background thread mein chalata hai, taaki
+    benchmark usi loop par manager.broadcast schedule kar sake.
+    """
+
+    def __init__(self, port: int):
+        super().__init__(daemon=True)
+        config = uvicorn.Config("app.main:app", host="127.0.0.1", port=port, log_level="warning")
+        self.server = uvicorn.Server(config)
+        self.loop = asyncio.new_event_loop()
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self.server.serve())
+
+    def wait_started(self, timeout: float = 30.0):
+        deadline = time.monotonic() + timeout
+        while not self.server.started:
+            if not self.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError("uvicorn failed to start")
+            time.sleep(0.05)
+
+    def stop(self):
+        self.server.should_exit = True
+        self.join(timeout=10)
+
+
+class Workload:
+    """
+    Weighted request mix; har request (endpoint template, latency, ok) record hoti hai.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, sessions: list, rng: random.Random):
+        self.client = client
+        self.sessions = sessions
+        self.rng = rng
+        self.samples = {}
+        self.errors = {}
+        self.ops = [
+            ("GET /tasks/", 20, self.list_tasks),
+            ("GET /tasks/{id}", 20, self.get_task),
+            ("POST /tasks/", 8, self.create_task),
+            ("PUT /tasks/{id}", 8, self.update_task),
+            ("GET /tasks/search", 5, self.search_tasks),
+            ("GET /tasks/stats", 5, self.task_stats),
+            ("GET /users/", 8, self.list_users),
+            ("GET /users/me", 10, self.me),
+            ("GET /tenants/me", 10, self.tenant),
+            ("POST /auth/login", 1, self.login),
+        ]
+        self.weights = [weight for _, weight, _ in self.ops]
+
+    async def run(self, deadline: float):
+        while time.perf_counter() < deadline:
+            name, _, op = self.rng.choices(self.ops, self.weights)[0]
+            session = self.rng.choice(self.sessions)
+            start = time.perf_counter()
+            try:
+                response = await op(session)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            self.samples.setdefault(name, []).append(time.perf_counter() - start)
+            if not ok:
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+    def list_tasks(self, s):
+        return self.client.get("/tasks/", headers=s["headers"])
+
+    def get_task(self, s):
+        return self.client.get(f"/tasks/{self.rng.choice(s['task_ids'])}", headers=s["headers"])
+
+    def create_task(self, s):
+        return self.client.post("/tasks/", headers=s["headers"], json={
+            "title": " ".join(self.rng.sample(WORDS, 3)), "priority": self.rng.choice(list(TaskPriority)).value,
+        })
+
+    def update_task(self, s):
+        return self.client.put(f"/tasks/{self.rng.choice(s['task_ids'])}", headers=s["headers"],
+                               json={"status": self.rng.choice(list(TaskStatus)).value})
+
+    def search_tasks(self, s):
+        return self.client.get("/tasks/search", params={"q": self.rng.choice(WORDS)}, headers=s["headers"])
+
+    def task_stats(self, s):
+        return self.client.get("/tasks/stats", headers=s["headers"])
+
+    def list_users(self, s):
+        return self.client.get("/users/", headers=s["headers"])
+
+    def me(self, s):
+        return self.client.get("/users/me", headers=s["headers"])
+
+    def tenant(self, s):
+        return self.client.get("/tenants/me", headers=s["headers"])
+
+    def login(self, s):
+        return self.client.post("/auth/login", json={"email": s["email"], "password": PASSWORD})
+
+
+async def _login_all(client: httpx.AsyncClient, tenants: list) -> list:
+    sessions = []
+    for tenant in tenants:
+        for email in tenant["emails"]:
+            response = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+            response.raise_for_status()
+            sessions.append({
+                "email": email,
+                "tenant_id": tenant["id"],
+                "task_ids": tenant["task_ids"],
+                "headers": {"Authorization": f"Bearer {response.json()['access_token']}"},
+            })
+    return sessions
+
+
+async def _http_phase(base_url: str, tenants: list, args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        sessions = await _login_all(client, tenants)
+        rng = random.Random(args.seed)
+        workloads = [Workload(client, sessions, random.Random(rng.random())) for _ in range(args.concurrency)]
+        start = time.perf_counter()
+        await asyncio.gather(*(w.run(start + args.duration) for w in workloads))
+        elapsed = time.perf_counter() - start
+
+    endpoints = {}
+    for name, _, _ in workloads[0].ops:
+        samples = [s for w in workloads for s in w.samples.get(name, [])]
+        endpoints[name] = {
+            "count": len(samples),
+            "errors": sum(w.errors.get(name, 0) for w in workloads),
+            "throughput_rps": round(len(samples) / elapsed, 1),
+            **_percentiles(samples),
+        }
+    total = sum(e["count"] for e in endpoints.values())
+    return {
+        "duration_s": round(elapsed, 2),
+        "concurrency": args.concurrency,
+        "total_requests": total,
+        "total_errors": sum(e["errors"] for e in endpoints.values()),
+        "throughput_rps": round(total / elapsed, 1),
+        "endpoints": endpoints,
+    }
+
+
+async def _ws_client(url: str, received: dict, connected: list, expected: int, ready: asyncio.Event):
+    async with websockets.connect(url, max_queue=None) as ws:
+        async for raw in ws:
+            now = time.perf_counter()
+            message = json.loads(raw)
+            if message.get("type") == "sync":
+                connected.append(ws)
+                if len(connected) == expected:
+                    ready.set()
+                continue
+            events = message["events"] if message.get("type") == "batch" else [message]
+            for event in events:
+                if event.get("type") == "bench":
+                    received.setdefault(event["data"]["n"], []).append(now - event["data"]["sent"])
+
+
+async def _ws_phase(server: ServerThread, base_url: str, tenant: dict, args) -> dict:
+    from app.dependencies import create_access_token
+    from app.routers.websocket import manager
+
+    tenant_id = tenant["id"]
+    token = create_access_token({"sub": str(tenant["user_ids"][0])})
+    url = base_url.replace("http://", "ws://") + f"/ws?token={token}"
+    ready = asyncio.Event()
+    received, connected = {}, []
+    clients = [asyncio.create_task(_ws_client(url, received, connected, args.ws_clients, ready))
+               for _ in range(args.ws_clients)]
+    try:
+        await asyncio.wait_for(ready.wait(), timeout=60)
+        fanout, per_client, incomplete = [], [], 0
+        for n in range(args.ws_messages):
+            sent = time.perf_counter()
+            message = {"type": "bench", "data": {"n": n, "sent": sent}}
+            asyncio.run_coroutine_threadsafe(manager.broadcast(str(tenant_id), message), server.loop)
+            deadline = sent + 10
+            while len(received.get(n, [])) < args.ws_clients and time.perf_counter() < deadline:
+                await asyncio.sleep(0.001)
+            latencies = received.get(n, [])
+            if len(latencies) < args.ws_clients:
+                incomplete += 1
+            else:
+                fanout.append(max(latencies))
+            per_client += latencies
+            await asyncio.sleep(args.ws_interval_ms / 1000)
+    finally:
+        for client in clients:
+            client.cancel()
+        await asyncio.gather(*clients, return_exceptions=True)
+
+    return {
+        "clients": args.ws_clients,
+        "messages": args.ws_messages,
+        "incomplete_messages": incomplete,
+        "coalesce_window_ms": settings.WS_COALESCE_WINDOW_MS,
+        "per_client": _percentiles(per_client),
+        # Broadcast se aakhri client tak pahunchne ka samay
+        "fanout_complete": _percentiles(fanout),
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(args):
+    command.upgrade(Config(ALEMBIC_INI), "head")
+
+    run_id = format(int(time.time()), "x")
+    started = time.perf_counter()
+    tenants = _seed(args, run_id)
+    seed_seconds = time.perf_counter() - started
+
+    port = args.port or _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = ServerThread(port)
+    server.start()
+    try:
+        server.wait_started()
+        http = asyncio.run(_http_phase(base_url, tenants, args))
+        ws = asyncio.run(_ws_phase(server, base_url, tenants[0], args)) if args.ws_clients else None
+    finally:
+        server.stop()
+        engine.dispose()
+        if SCRATCH_DIR is not None:
+            shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "database": engine.dialect.name,
+            "python": platform.python_version(),
+            "seed_seconds": round(seed_seconds, 2),
+            "params": vars(args),
+        },
+        "http": http,
+        "websocket": ws,
+    }
+    for name, stats in http["endpoints"].items():
+        print(f"{name:<20} n={stats['count']:<6} err={stats['errors']:<4} {stats['throughput_rps']:>7} rps  "
+              f"p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms p99={stats['p99_ms']}ms")
+    print(f"total: {http['total_requests']} requests, {http['throughput_rps']} rps")
+    if ws:
+        print(f"websocket fan-out ({ws['clients']} clients): per-client {ws['per_client']}, "
+              f"complete {ws['fanout_complete']}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tenants", type=int, default=3)
+    parser.add_argument("--users", type=int, default=5, help="Users per tenant")
+    parser.add_argument("--tasks", type=int, default=1000, help="Tasks per tenant")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of HTTP load")
+    parser.add_argument("--ws-clients", type=int, default=100)
+    parser.add_argument("--ws-messages", type=int, default=50)
+    parser.add_argument("--ws-interval-ms", type=float, default=20.0)
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--database-url", help="Scratch database to migrate and seed (never deleted); "
+                                               "default: a private temp SQLite file")
+    main(parser.parse_args())
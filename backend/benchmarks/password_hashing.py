@@ -0,0 +1,80 @@
+# backend/benchmarks/password_hashing.py
+"""
+Event-loop latency during concurrent logins: inline bcrypt vs PasswordHasher.
+
+    python -m benchmarks.password_hashing --logins 20
+
+A ticker coroutine sleeps for --tick-ms in a loop and records how late it wakes up.
+Inline bcrypt calls freeze the loop, so the lag grows with every login; through the
+executor the ticker should stay close to its schedule.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+from bcrypt import hashpw, gensalt, checkpw  # noqa: E402
+from app.passwords import PasswordHasher  # noqa: E402
+
+PASSWORD = "correct horse battery staple"
+
+
+async def _ticker(tick: float, lags: list, stop: asyncio.Event):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(tick)
+        lags.append(time.perf_counter() - start - tick)
+
+
+async def _inline_login(hashed: bytes):
+    # Purane invite_user jaisa: async handler ke andar seedha bcrypt
+    checkpw(PASSWORD.encode("utf-8"), hashed)
+
+
+async def _executor_login(hasher: PasswordHasher, hashed: bytes):
+    await hasher.verify(PASSWORD, hashed.decode("utf-8"))
+
+
+async def _run(label: str, logins, tick: float) -> dict:
+    lags: list = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(tick, lags, stop))
+    await asyncio.sleep(tick * 2)
+    start = time.perf_counter()
+    await asyncio.gather(*logins)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+    lags_ms = sorted(lag * 1000 for lag in lags)
+    return {
+        "mode": label,
+        "wall_s": round(elapsed, 3),
+        "loop_lag_p50_ms": round(statistics.median(lags_ms), 2),
+        "loop_lag_p99_ms": round(lags_ms[int(len(lags_ms) * 0.99) - 1], 2),
+        "loop_lag_max_ms": round(lags_ms[-1], 2),
+    }
+
+
+async def main(args):
+    hashed = hashpw(PASSWORD.encode("utf-8"), gensalt())
+    tick = args.tick_ms / 1000
+    hasher = PasswordHasher(max_workers=args.workers, max_pending=args.logins)
+    results = [
+        await _run("inline", [_inline_login(hashed) for _ in range(args.logins)], tick),
+        await _run("executor", [_executor_login(hasher, hashed) for _ in range(args.logins)], tick),
+    ]
+    hasher.shutdown()
+    for result in results:
+        print(result)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--tick-ms", type=float, default=5.0)
+    asyncio.run(main(parser.parse_args()))
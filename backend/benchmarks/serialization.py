@@ -0,0 +1,97 @@
+# backend/benchmarks/serialization.py
+"""
+Task list serialization: ORM + pydantic + json vs column rows + orjson.
+
+    python -m benchmarks.serialization --tasks 10000
+
+Seeds a throwaway SQLite db with --tasks tasks for one tenant, then times the old
+GET /tasks/ path (ORM objects, Task.from_orm, response_model re-validation, stdlib
+json) against the fast path (column select, row dicts, orjson) for the same list.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from app.database import Base  # noqa: E402
+from app import models  # noqa: E402,F401
+from app.models.task import Task as TaskModel  # noqa: E402
+from app.models.tenant import Tenant  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.routers.task import TASK_COLUMNS  # noqa: E402
+from app.schemas.task import Task, TaskPage  # noqa: E402
+from app.serialization import fast_json_response, rows_to_dicts  # noqa: E402
+
+
+def _seed(db, count: int) -> int:
+    tenant = Tenant(name="bench")
+    db.add(tenant)
+    db.flush()
+    user = User(email="bench@example.com", hashed_password="x", tenant_id=tenant.id, role="admin")
+    db.add(user)
+    db.flush()
+    db.execute(insert(TaskModel), [
+        {"title": f"task {i}", "description": "benchmark task " * 4, "user_id": user.id,
+         "tenant_id": tenant.id, "assigned_user_id": user.id}
+        for i in range(count)
+    ])
+    db.commit()
+    return tenant.id
+
+
+def _orm_path(db, tenant_id: int) -> bytes:
+    # Purana path: ORM objects -> pydantic -> response_model validation -> json
+    tasks = db.query(TaskModel).filter(TaskModel.tenant_id == tenant_id).order_by(TaskModel.id).all()
+    page = TaskPage.model_validate({"tasks": [Task.from_orm(t) for t in tasks], "next_cursor": None})
+    return json.dumps(page.model_dump(mode="json")).encode("utf-8")
+
+
+def _fast_path(db, tenant_id: int) -> bytes:
+    rows = db.query(*TASK_COLUMNS).filter(TaskModel.tenant_id == tenant_id).order_by(TaskModel.id).all()
+    return fast_json_response({"tasks": rows_to_dicts(rows), "next_cursor": None}).body
+
+
+def _time(fn, db, tenant_id: int, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        db.expunge_all()
+        start = time.perf_counter()
+        body = fn(db, tenant_id)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "mode": fn.__name__.strip("_"),
+        "median_ms": round(statistics.median(timings), 2),
+        "min_ms": round(min(timings), 2),
+        "bytes": len(body),
+    }
+
+
+def main(args):
+    scratch = tempfile.mkdtemp(prefix="taskflow-bench-")
+    path = os.path.join(scratch, "benchmark_serialization.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        tenant_id = _seed(db, args.tasks)
+        for fn in (_orm_path, _fast_path):
+            print(_time(fn, db, tenant_id, args.repeat))
+    finally:
+        db.close()
+        engine.dispose()
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
@@ -0,0 +1,147 @@
+# backend/benchmarks/ws_broadcast.py
+"""
+Broadcast latency with many sockets per tenant: sequential send loop vs ConnectionManager.
+
+    python -m benchmarks.ws_broadcast --sockets 1000 --slow 10 --messages 20
+    python -m benchmarks.ws_broadcast --encoding msgpack --compress deflate
+
+Sockets are in-process fakes. --slow of them take --slow-ms per send, like a
+client on a bad mobile link. Latency is measured from the broadcast call until a
+socket's send returns. The manager run uses the --encoding/--compress wire format;
+bytes_per_delivery compares its frame size against the sequential JSON baseline.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+import zlib
+
+import msgpack
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+from app.config import settings  # noqa: E402
+from app.routers.websocket import ConnectionManager  # noqa: E402
+from app.ws_encoding import JSON, KEY_INDEX, MSGPACK, negotiate  # noqa: E402
+
+TENANT = "1"
+
+
+class FakeWebSocket:
+    def __init__(self, delay: float, latencies: list, sizes: list):
+        self.delay = delay
+        self.latencies = latencies
+        self.sizes = sizes
+
+    async def accept(self):
+        pass
+
+    async def close(self, code: int = 1000):
+        pass
+
+    async def send_text(self, payload: str):
+        await self._received(payload, len(payload.encode("utf-8")), json.loads(payload))
+
+    async def send_bytes(self, payload: bytes):
+        size = len(payload)
+        if payload[:1] == b"\x78":
+            payload = zlib.decompress(payload)
+        if payload[:1] == b"{":
+            await self._received(payload, size, json.loads(payload))
+            return
+        message = msgpack.unpackb(payload, strict_map_key=False)
+        if message.get("type") == "hello":
+            return
+        await self._received(payload, size, {"data": message[KEY_INDEX["data"]]})
+
+    async def _received(self, payload, size: int, message: dict):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sizes.append(size)
+        self.latencies.append(time.perf_counter() - message["data"]["sent_at"])
+
+
+def _message(seq: int) -> dict:
+    return {
+        "type": "task_update",
+        "data": {
+            "id": seq, "title": f"Task {seq}", "description": "Follow up with the design review " * 3,
+            "status": "in_progress", "user_id": 1, "assigned_user_id": 2, "tenant_id": 1,
+            "sent_at": time.perf_counter(),
+        },
+        "seq": seq,
+    }
+
+
+async def _sequential(sockets, messages: int):
+    # Purana ConnectionManager.broadcast: har socket ka intezaar, har baar json.dumps
+    for seq in range(messages):
+        message = _message(seq)
+        for ws in sockets:
+            await ws.send_text(json.dumps(message))
+
+
+async def _managed(sockets, messages: int, args):
+    manager = ConnectionManager(queue_size=args.queue_size, slow_consumer_policy=args.policy)
+    wire = negotiate(args.encoding, args.compress)
+    for ws in sockets:
+        await manager.connect(ws, TENANT, wire=wire)
+    for seq in range(messages):
+        await manager.broadcast(TENANT, _message(seq))
+        await asyncio.sleep(0)
+    # Fast sockets ke drain hone ka intezaar
+    deadline = time.perf_counter() + 30
+    while manager.queue_depth(TENANT) and time.perf_counter() < deadline:
+        await asyncio.sleep(0.01)
+    for ws in list(manager.active_connections.get(TENANT, {})):
+        manager.disconnect(ws, TENANT)
+    return manager
+
+
+def _summary(label: str, fast: list, sizes: list, wall: float, manager=None) -> dict:
+    ms = sorted(lat * 1000 for lat in fast)
+    result = {
+        "mode": label,
+        "wall_s": round(wall, 3),
+        "bytes_per_delivery": round(statistics.mean(sizes), 1),
+        "fast_deliveries": len(ms),
+        "fast_p50_ms": round(statistics.median(ms), 2),
+        "fast_p99_ms": round(ms[int(len(ms) * 0.99) - 1], 2),
+        "fast_max_ms": round(ms[-1], 2),
+    }
+    if manager is not None:
+        result.update(evicted=manager.evicted, dropped=manager.dropped)
+    return result
+
+
+async def main(args):
+    delay = args.slow_ms / 1000
+    for label in ("sequential", "manager"):
+        fast: list = []
+        slow: list = []
+        sizes: list = []
+        sockets = [FakeWebSocket(delay, slow, sizes) for _ in range(args.slow)]
+        sockets += [FakeWebSocket(0, fast, sizes) for _ in range(args.sockets - args.slow)]
+        start = time.perf_counter()
+        if label == "sequential":
+            await _sequential(sockets, args.messages)
+            manager = None
+        else:
+            manager = await _managed(sockets, args.messages, args)
+        print(_summary(label, fast, sizes, time.perf_counter() - start, manager))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sockets", type=int, default=1000)
+    parser.add_argument("--slow", type=int, default=10)
+    parser.add_argument("--slow-ms", type=float, default=50.0)
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--queue-size", type=int, default=settings.WS_SEND_QUEUE_SIZE)
+    parser.add_argument("--policy", choices=["disconnect", "drop_oldest"], default=settings.WS_SLOW_CONSUMER_POLICY)
+    parser.add_argument("--encoding", choices=[JSON, MSGPACK], default=JSON)
+    parser.add_argument("--compress", choices=["deflate"], default=None)
+    asyncio.run(main(parser.parse_args()))
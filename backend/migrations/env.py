@@ -0,0 +1,67 @@
+# backend/migrations/env.py
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import create_engine, pool
+from app.config import settings
+from app.database import Base
+from app.search import FTS_TABLE, GLOBAL_SEARCH_INDEX, SEARCH_INDEX
+import app.models  # noqa: F401  (saare tables metadata mein register hon)
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+url = config.get_main_option("sqlalchemy.url") or settings.DATABASE_URL
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    # Search index raw DDL se banta hai (0004), models mein nahi; autogenerate use na chhede
+    if type_ == "table" and name.startswith(FTS_TABLE):
+        return False
+    if type_ == "column" and name == "search_vector":
+        return False
+    if type_ == "index" and name in (GLOBAL_SEARCH_INDEX, SEARCH_INDEX):
+        return False
+    return True
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=url.startswith("sqlite"),
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connectable = config.attributes.get("connection")
+    if connectable is not None:
+        _run(connectable)
+        return
+    engine = create_engine(url, poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        _run(connection)
+
+
+def _run(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        # SQLite ALTER TABLE limited hai; batch mode table copy karke badalta hai
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
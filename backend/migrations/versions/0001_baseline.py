@@ -0,0 +1,73 @@
+"""baseline: tenants, users, tasks
+
+Pehle create_all / create_tables.sql se bane databases par tables pehle se hote hain;
+unhe chhod diya jata hai taaki woh is revision par adopt ho sakein.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(name: str) -> bool:
+    if context.is_offline_mode():
+        return False
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    if not _has_table("tenants"):
+        op.create_table(
+            "tenants",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(255)),
+        )
+        op.create_index("ix_tenants_id", "tenants", ["id"])
+        op.create_index("ix_tenants_name", "tenants", ["name"], unique=True)
+
+    if not _has_table("users"):
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("email", sa.String()),
+            sa.Column("hashed_password", sa.String()),
+            sa.Column("tenant_id", sa.Integer(), sa.ForeignKey("tenants.id")),
+            sa.Column("role", sa.Enum("admin", "member", name="userrole")),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    if not _has_table("tasks"):
+        op.create_table(
+            "tasks",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("title", sa.String(255)),
+            sa.Column("description", sa.String(500), nullable=True),
+            sa.Column("status", sa.Enum("todo", "in_progress", "done", name="taskstatus")),
+            sa.Column("completed", sa.Boolean()),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+            sa.Column("assigned_user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+            sa.Column("tenant_id", sa.Integer(), sa.ForeignKey("tenants.id")),
+            sa.Column("due_date", sa.DateTime(), nullable=True),
+            sa.Column("priority", sa.Enum("low", "medium", "high", name="taskpriority")),
+        )
+        op.create_index("ix_tasks_id", "tasks", ["id"])
+        op.create_index("ix_tasks_title", "tasks", ["title"])
+
+
+def downgrade() -> None:
+    op.drop_table("tasks")
+    op.drop_table("users")
+    op.drop_table("tenants")
+    if op.get_context().dialect.name == "postgresql":
+        for enum_name in ("taskpriority", "taskstatus", "userrole"):
+            op.execute(f"DROP TYPE IF EXISTS {enum_name}")
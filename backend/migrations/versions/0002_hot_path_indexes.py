@@ -0,0 +1,39 @@
+"""hot-path indexes for task lists, filters and FK lookups
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns); if_not_exists taaki create_all se bane databases bhi chal jayein
+INDEXES = [
+    # Keyset pagination / filters on GET /tasks/
+    ("ix_tasks_tenant_id_id", "tasks", ["tenant_id", "id"]),
+    ("ix_tasks_tenant_status_id", "tasks", ["tenant_id", "status", "id"]),
+    ("ix_tasks_tenant_priority_id", "tasks", ["tenant_id", "priority", "id"]),
+    ("ix_tasks_tenant_assignee_id", "tasks", ["tenant_id", "assigned_user_id", "id"]),
+    ("ix_tasks_tenant_due_date", "tasks", ["tenant_id", "due_date"]),
+    # remove_user ka unassign UPDATE aur creator FK
+    ("ix_tasks_assigned_user_id", "tasks", ["assigned_user_id"]),
+    ("ix_tasks_user_id", "tasks", ["user_id"]),
+    # GET /users/ (tenant ke members)
+    ("ix_users_tenant_id", "users", ["tenant_id"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,132 @@
+"""task_stats board counters with sync triggers
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Triggers aur backfill jaise is revision mein the; app.stats ke baad ke badlaav (e.g. 0006 ke
+# statement-level triggers) yahan nahi aate
+
+
+# Ek task row (new/old) ke liye chaaron counters par +delta/-delta ka upsert
+def _sqlite_upsert(row: str, delta: int) -> str:
+    return f"""INSERT INTO task_stats (tenant_id, dimension, key, count) VALUES
+        ({row}.tenant_id, 'total', '', {delta}),
+        ({row}.tenant_id, 'status', coalesce({row}.status, ''), {delta}),
+        ({row}.tenant_id, 'priority', coalesce({row}.priority, ''), {delta}),
+        ({row}.tenant_id, 'assignee', coalesce(CAST({row}.assigned_user_id AS TEXT), ''), {delta})
+        ON CONFLICT (tenant_id, dimension, key) DO UPDATE SET count = count + excluded.count;"""
+
+
+_SQLITE_CHANGED = (
+    "old.tenant_id IS NOT new.tenant_id OR old.status IS NOT new.status "
+    "OR old.priority IS NOT new.priority OR old.assigned_user_id IS NOT new.assigned_user_id"
+)
+
+SQLITE_DDL = [
+    f"""CREATE TRIGGER IF NOT EXISTS task_stats_ai AFTER INSERT ON tasks
+        WHEN new.tenant_id IS NOT NULL BEGIN {_sqlite_upsert("new", 1)} END""",
+    f"""CREATE TRIGGER IF NOT EXISTS task_stats_ad AFTER DELETE ON tasks
+        WHEN old.tenant_id IS NOT NULL BEGIN {_sqlite_upsert("old", -1)} END""",
+    f"""CREATE TRIGGER IF NOT EXISTS task_stats_au
+        AFTER UPDATE OF tenant_id, status, priority, assigned_user_id ON tasks
+        WHEN {_SQLITE_CHANGED} BEGIN
+        {_sqlite_upsert("old", -1)}
+        {_sqlite_upsert("new", 1)}
+    END""",
+]
+
+POSTGRES_DDL = [
+    """CREATE OR REPLACE FUNCTION task_stats_apply(t integer, s text, p text, a text, delta integer)
+        RETURNS void AS $$
+        BEGIN
+            IF t IS NULL THEN RETURN; END IF;
+            -- "total" row pehle lock hota hai, isliye ek tenant ke writers ek hi order mein lock lete hain
+            INSERT INTO task_stats (tenant_id, dimension, key, count) VALUES
+                (t, 'total', '', delta),
+                (t, 'status', coalesce(s, ''), delta),
+                (t, 'priority', coalesce(p, ''), delta),
+                (t, 'assignee', coalesce(a, ''), delta)
+            ON CONFLICT (tenant_id, dimension, key)
+            DO UPDATE SET count = task_stats.count + EXCLUDED.count;
+        END $$ LANGUAGE plpgsql""",
+    """CREATE OR REPLACE FUNCTION task_stats_sync() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' AND (OLD.tenant_id, OLD.status, OLD.priority, OLD.assigned_user_id)
+                IS NOT DISTINCT FROM (NEW.tenant_id, NEW.status, NEW.priority, NEW.assigned_user_id) THEN
+                RETURN NULL;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM task_stats_apply(OLD.tenant_id, OLD.status::text, OLD.priority::text,
+                                         OLD.assigned_user_id::text, -1);
+            END IF;
+            IF TG_OP IN ('UPDATE', 'INSERT') THEN
+                PERFORM task_stats_apply(NEW.tenant_id, NEW.status::text, NEW.priority::text,
+                                         NEW.assigned_user_id::text, 1);
+            END IF;
+            RETURN NULL;
+        END $$ LANGUAGE plpgsql""",
+    "DROP TRIGGER IF EXISTS task_stats_sync ON tasks",
+    """CREATE TRIGGER task_stats_sync
+        AFTER INSERT OR DELETE OR UPDATE OF tenant_id, status, priority, assigned_user_id ON tasks
+        FOR EACH ROW EXECUTE FUNCTION task_stats_sync()""",
+]
+
+# tasks table se saare counters ek INSERT ... SELECT mein
+REBUILD_SQL = """INSERT INTO task_stats (tenant_id, dimension, key, count)
+    SELECT tenant_id, 'total', '', count(*) FROM tasks WHERE {where} GROUP BY tenant_id
+    UNION ALL
+    SELECT tenant_id, 'status', coalesce(CAST(status AS TEXT), ''), count(*)
+        FROM tasks WHERE {where} GROUP BY tenant_id, status
+    UNION ALL
+    SELECT tenant_id, 'priority', coalesce(CAST(priority AS TEXT), ''), count(*)
+        FROM tasks WHERE {where} GROUP BY tenant_id, priority
+    UNION ALL
+    SELECT tenant_id, 'assignee', coalesce(CAST(assigned_user_id AS TEXT), ''), count(*)
+        FROM tasks WHERE {where} GROUP BY tenant_id, assigned_user_id"""
+
+
+def _has_table(name: str) -> bool:
+    if context.is_offline_mode():
+        return False
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    created = not _has_table("task_stats")
+    if created:
+        op.create_table(
+            "task_stats",
+            sa.Column("tenant_id", sa.Integer(), sa.ForeignKey("tenants.id"), primary_key=True),
+            sa.Column("dimension", sa.String(20), primary_key=True),
+            sa.Column("key", sa.String(50), primary_key=True),
+            sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        )
+    dialect = op.get_context().dialect.name
+    for statement in {"sqlite": SQLITE_DDL, "postgresql": POSTGRES_DDL}.get(dialect, []):
+        op.execute(statement)
+    if created:
+        # Existing tasks ke counters; iske baad triggers sync rakhte hain
+        op.execute(REBUILD_SQL.format(where="tenant_id IS NOT NULL"))
+
+
+def downgrade() -> None:
+    dialect = op.get_context().dialect.name
+    if dialect == "sqlite":
+        for trigger in ("task_stats_ai", "task_stats_ad", "task_stats_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    elif dialect == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS task_stats_sync ON tasks")
+        op.execute("DROP FUNCTION IF EXISTS task_stats_sync()")
+        op.execute("DROP FUNCTION IF EXISTS task_stats_apply(integer, text, text, text, integer)")
+    op.drop_table("task_stats")
@@ -0,0 +1,119 @@
+"""task_stats: statement-level triggers on Postgres
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Tuple, Union
+
+from alembic import op
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 0005 wale row-level trigger, downgrade ke liye jaise the waise
+ROW_LEVEL_DDL = [
+    """CREATE OR REPLACE FUNCTION task_stats_apply(t integer, s text, p text, a text, delta integer)
+        RETURNS void AS $$
+        BEGIN
+            IF t IS NULL THEN RETURN; END IF;
+            INSERT INTO task_stats (tenant_id, dimension, key, count) VALUES
+                (t, 'total', '', delta),
+                (t, 'status', coalesce(s, ''), delta),
+                (t, 'priority', coalesce(p, ''), delta),
+                (t, 'assignee', coalesce(a, ''), delta)
+            ON CONFLICT (tenant_id, dimension, key)
+            DO UPDATE SET count = task_stats.count + EXCLUDED.count;
+        END $$ LANGUAGE plpgsql""",
+    """CREATE OR REPLACE FUNCTION task_stats_sync() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' AND (OLD.tenant_id, OLD.status, OLD.priority, OLD.assigned_user_id)
+                IS NOT DISTINCT FROM (NEW.tenant_id, NEW.status, NEW.priority, NEW.assigned_user_id) THEN
+                RETURN NULL;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM task_stats_apply(OLD.tenant_id, OLD.status::text, OLD.priority::text,
+                                         OLD.assigned_user_id::text, -1);
+            END IF;
+            IF TG_OP IN ('UPDATE', 'INSERT') THEN
+                PERFORM task_stats_apply(NEW.tenant_id, NEW.status::text, NEW.priority::text,
+                                         NEW.assigned_user_id::text, 1);
+            END IF;
+            RETURN NULL;
+        END $$ LANGUAGE plpgsql""",
+    """CREATE TRIGGER task_stats_sync
+        AFTER INSERT OR DELETE OR UPDATE OF tenant_id, status, priority, assigned_user_id ON tasks
+        FOR EACH ROW EXECUTE FUNCTION task_stats_sync()""",
+]
+
+
+
+# Statement-level triggers jaise is revision mein bane (app.stats ki frozen copy).
+# Ek statement ki saari changed rows (transition tables) ke deltas ek hi upsert mein.
+def _postgres_upsert(*sources: Tuple[str, int]) -> str:
+    rows = " UNION ALL ".join(
+        f"SELECT tenant_id, status::text AS s, priority::text AS p, "
+        f"assigned_user_id::text AS a, {delta} AS delta FROM {table}"
+        for table, delta in sources
+    )
+    return f"""INSERT INTO task_stats (tenant_id, dimension, key, count)
+                SELECT r.tenant_id, d.dimension, d.key, sum(r.delta)
+                FROM ({rows}) r
+                CROSS JOIN LATERAL (VALUES ('total', ''), ('status', coalesce(r.s, '')),
+                    ('priority', coalesce(r.p, '')), ('assignee', coalesce(r.a, '')))
+                    AS d (dimension, key)
+                WHERE r.tenant_id IS NOT NULL
+                GROUP BY r.tenant_id, d.dimension, d.key
+                HAVING sum(r.delta) <> 0
+                -- Sab writers counters ek hi order mein lock karte hain
+                ORDER BY 1, 2, 3
+                ON CONFLICT (tenant_id, dimension, key)
+                DO UPDATE SET count = task_stats.count + EXCLUDED.count"""
+
+
+STATEMENT_LEVEL_DDL = [
+    "DROP TRIGGER IF EXISTS task_stats_sync ON tasks",
+    "DROP FUNCTION IF EXISTS task_stats_apply(integer, text, text, text, integer)",
+    f"""CREATE OR REPLACE FUNCTION task_stats_sync() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {_postgres_upsert(("new_rows", 1))};
+            ELSIF TG_OP = 'DELETE' THEN
+                {_postgres_upsert(("old_rows", -1))};
+            ELSE
+                -- Sirf title/description badle to deltas zero hote hain aur kuch nahi likha jata
+                {_postgres_upsert(("old_rows", -1), ("new_rows", 1))};
+            END IF;
+            RETURN NULL;
+        END $$ LANGUAGE plpgsql""",
+    # Transition tables ek trigger mein ek hi event aur bina column list ke milti hain
+    "DROP TRIGGER IF EXISTS task_stats_ins ON tasks",
+    """CREATE TRIGGER task_stats_ins AFTER INSERT ON tasks
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION task_stats_sync()""",
+    "DROP TRIGGER IF EXISTS task_stats_del ON tasks",
+    """CREATE TRIGGER task_stats_del AFTER DELETE ON tasks
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION task_stats_sync()""",
+    "DROP TRIGGER IF EXISTS task_stats_upd ON tasks",
+    """CREATE TRIGGER task_stats_upd AFTER UPDATE ON tasks
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION task_stats_sync()""",
+]
+
+
+def upgrade() -> None:
+    # SQLite ke row triggers waise hi rehte hain; wahan same-row updates sasti hain
+    if op.get_context().dialect.name == "postgresql":
+        for statement in STATEMENT_LEVEL_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        for trigger in ("task_stats_ins", "task_stats_del", "task_stats_upd"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger} ON tasks")
+        for statement in ROW_LEVEL_DDL:
+            op.execute(statement)
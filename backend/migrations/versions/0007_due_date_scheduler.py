@@ -0,0 +1,38 @@
+"""overdue_notified_at and pending due-date index for the due-date scheduler
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partial index ka predicate jaisa is revision mein bana (app.models.task.DUE_PENDING ki copy)
+DUE_PENDING = "due_date IS NOT NULL AND overdue_notified_at IS NULL"
+
+
+def upgrade() -> None:
+    op.add_column("tasks", sa.Column("overdue_notified_at", sa.DateTime(), nullable=True))
+    # Pehle se overdue tasks notified maane jaate hain, warna pehle startup par sabke events jaate.
+    # due_date naive UTC hai.
+    if op.get_context().dialect.name == "postgresql":
+        now = "timezone('utc', now())"
+    else:
+        now = "CURRENT_TIMESTAMP"
+    op.execute(f"UPDATE tasks SET overdue_notified_at = due_date WHERE due_date < {now}")
+    op.create_index(
+        "ix_tasks_due_pending", "tasks", ["due_date"],
+        postgresql_where=sa.text(DUE_PENDING), sqlite_where=sa.text(DUE_PENDING),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_due_pending", table_name="tasks")
+    op.drop_column("tasks", "overdue_notified_at")
@@ -0,0 +1,44 @@
+"""tenant_shards directory and id_blocks for tenant-sharded storage
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# ShardIds in tables ke ids deta hai
+SHARDED_ID_TABLES = ("tenants", "users", "tasks")
+
+
+def upgrade() -> None:
+    # Har shard par chalti hai, par directory aur id blocks sirf default shard (DATABASE_URL) ke use hote hain
+    op.create_table(
+        "tenant_shards",
+        sa.Column("tenant_id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("shard", sa.String(length=50), nullable=False),
+        sa.Column("moving", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.PrimaryKeyConstraint("tenant_id"),
+    )
+    op.create_table(
+        "id_blocks",
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.Column("next_id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    # Maujooda tenants default shard par hain
+    op.execute("INSERT INTO tenant_shards (tenant_id, shard) SELECT id, 'default' FROM tenants")
+    for name in SHARDED_ID_TABLES:
+        op.execute(f"INSERT INTO id_blocks (name, next_id) SELECT '{name}', COALESCE(MAX(id), 0) + 1 FROM {name}")
+
+
+def downgrade() -> None:
+    op.drop_table("id_blocks")
+    op.drop_table("tenant_shards")
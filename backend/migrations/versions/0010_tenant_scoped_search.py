@@ -0,0 +1,99 @@
+"""tenant-scoped search indexes (tenant column in FTS5, GIN on (tenant_id, search_vector))
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Is revision ka DDL jaisa tha; app.search badle to bhi yeh revision wahi kare
+FTS_TABLE = "tasks_fts"
+TRIGGERS = ("tasks_fts_ai", "tasks_fts_ad", "tasks_fts_au")
+
+SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE}
+        USING fts5(title, description, tenant, tokenize = 'porter unicode61')""",
+    f"""INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('rank', 'bm25(1.0, 1.0, 0.0)')""",
+    f"""CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description, tenant)
+        VALUES (new.id, new.title, new.description, CAST(new.tenant_id AS TEXT));
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description, tenant_id ON tasks BEGIN
+        UPDATE {FTS_TABLE} SET title = new.title, description = new.description,
+            tenant = CAST(new.tenant_id AS TEXT)
+        WHERE rowid = old.id;
+    END""",
+    f"""INSERT INTO {FTS_TABLE}(rowid, title, description, tenant)
+        SELECT id, title, description, CAST(tenant_id AS TEXT) FROM tasks
+        WHERE id NOT IN (SELECT rowid FROM {FTS_TABLE})""",
+]
+
+# 0004 wala global FTS5 shape (downgrade ke liye)
+SQLITE_GLOBAL_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE}
+        USING fts5(title, description, tokenize = 'porter unicode61')""",
+    f"""CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN
+        UPDATE {FTS_TABLE} SET title = new.title, description = new.description
+        WHERE rowid = old.id;
+    END""",
+    f"""INSERT INTO {FTS_TABLE}(rowid, title, description)
+        SELECT id, title, description FROM tasks
+        WHERE id NOT IN (SELECT rowid FROM {FTS_TABLE})""",
+]
+
+# btree_gin na ho (jaise kuch managed/minimal installs) to global index hi rehta hai
+POSTGRES_DDL = """DO $$
+    BEGIN
+        IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'btree_gin') THEN
+            CREATE EXTENSION IF NOT EXISTS btree_gin;
+            CREATE INDEX IF NOT EXISTS ix_tasks_tenant_search_vector ON tasks USING GIN (tenant_id, search_vector);
+            DROP INDEX IF EXISTS ix_tasks_search_vector;
+        ELSE
+            RAISE NOTICE 'btree_gin is not available; task search uses a GIN index on search_vector only';
+            CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING GIN (search_vector);
+        END IF;
+    END $$"""
+
+
+def _rebuild_sqlite(ddl: list) -> None:
+    # FTS5 table ke columns ALTER nahi hote; triggers aur table dobara banake backfill karein
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    for statement in ddl:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    dialect = op.get_context().dialect.name
+    if dialect == "sqlite":
+        _rebuild_sqlite(SQLITE_DDL)
+    elif dialect == "postgresql":
+        op.execute(POSTGRES_DDL)
+
+
+def downgrade() -> None:
+    dialect = op.get_context().dialect.name
+    if dialect == "sqlite":
+        _rebuild_sqlite(SQLITE_GLOBAL_DDL)
+    elif dialect == "postgresql":
+        # btree_gin extension rehne dete hain; doosre objects us par depend kar sakte hain
+        op.execute("CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING GIN (search_vector)")
+        op.execute("DROP INDEX IF EXISTS ix_tasks_tenant_search_vector")
@@ -0,0 +1,33 @@
+# backend/tests/conftest.py
+import os
+import tempfile
+
+# App modules settings import par padhte hain; tests kabhi configured database ko na chhuein
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+os.environ.setdefault("SCHEMA_VERSION_CHECK", "false")
+
+import uuid  # noqa: E402
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from app.database import Base, engine
+    from app.main import app
+
+    Base.metadata.create_all(bind=engine)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def auth_headers(client):
+    # Har test ka apna tenant, taaki tests ek doosre ka data na dekhein
+    name = uuid.uuid4().hex
+    response = client.post("/auth/signup", json={
+        "email": f"{name}@example.com", "password": "pw", "tenant_name": name,
+    })
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
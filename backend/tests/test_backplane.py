@@ -0,0 +1,87 @@
+# backend/tests/test_backplane.py
+import asyncio
+
+from app.backplane import PostgresBackplane
+from app.routers.websocket import ConnectionManager
+
+
+class FakeListener:
+    """
+    asyncpg connection ki jagah: sirf LISTEN state yaad rakhta hai.
+    """
+    def __init__(self):
+        self.channels = set()
+
+    def is_closed(self):
+        return False
+
+    async def add_listener(self, channel, callback):
+        await asyncio.sleep(0)
+        self.channels.add(channel)
+
+    async def remove_listener(self, channel, callback):
+        await asyncio.sleep(0)
+        self.channels.discard(channel)
+
+
+class FakeWebSocket:
+    async def accept(self):
+        pass
+
+    async def send_text(self, data):
+        pass
+
+    async def send_bytes(self, data):
+        pass
+
+    async def close(self, code=1000):
+        pass
+
+
+def _manager():
+    backplane = PostgresBackplane("postgresql://unused")
+    backplane._listener = FakeListener()
+    return ConnectionManager(backplane=backplane, coalesce_window_ms=0), backplane
+
+
+async def _settle():
+    # Background UNLISTEN tasks ko chalne dein
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def test_reconnect_before_pending_unlisten_keeps_listening():
+    async def scenario():
+        manager, backplane = _manager()
+        first = FakeWebSocket()
+        await manager.connect(first, "1")
+        manager.disconnect(first, "1")
+        # Page reload: naya socket purane ka UNLISTEN chalne se pehle aa gaya
+        await manager.connect(FakeWebSocket(), "1")
+        await _settle()
+        return backplane
+
+    backplane = asyncio.run(scenario())
+    assert backplane._listener.channels == {PostgresBackplane._channel("1")}
+    assert backplane._listening == {"1"}
+
+
+def test_last_disconnect_unlistens():
+    async def scenario():
+        manager, backplane = _manager()
+        websocket = FakeWebSocket()
+        await manager.connect(websocket, "1")
+        manager.disconnect(websocket, "1")
+        await _settle()
+        return manager, backplane
+
+    manager, backplane = asyncio.run(scenario())
+    assert backplane._listener.channels == set()
+    assert "1" not in manager.active_connections
+
+
+def test_chunks_round_trip_multibyte_payload():
+    payload = "é" * (PostgresBackplane.CHUNK_BYTES + 10) + "x"
+    chunks = PostgresBackplane._chunks(payload)
+    assert "".join(chunks) == payload
+    assert all(len(chunk.encode("utf-8")) <= PostgresBackplane.CHUNK_BYTES for chunk in chunks)
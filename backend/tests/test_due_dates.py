@@ -0,0 +1,65 @@
+# backend/tests/test_due_dates.py
+
+# 22:56 +05:00 == 17:56 UTC; column naive UTC hai
+OFFSET_DUE = "2030-01-01T22:56:00+05:00"
+UTC_DUE = "2030-01-01T17:56:00"
+
+
+def test_create_converts_offset_due_date_to_utc(client, auth_headers):
+    response = client.post("/tasks/", json={"title": "offset", "due_date": OFFSET_DUE}, headers=auth_headers)
+    assert response.status_code == 200
+    task = client.get(f"/tasks/{response.json()['id']}", headers=auth_headers).json()
+    assert task["due_date"] == UTC_DUE
+
+
+def test_due_date_filters_accept_offsets(client, auth_headers):
+    client.post("/tasks/", json={"title": "offset", "due_date": OFFSET_DUE}, headers=auth_headers)
+    before = client.get("/tasks/", params={"due_before": "2030-01-01T22:57:00+05:00"}, headers=auth_headers)
+    after = client.get("/tasks/", params={"due_after": "2030-01-01T22:57:00+05:00"}, headers=auth_headers)
+    assert [t["due_date"] for t in before.json()["tasks"]] == [UTC_DUE]
+    assert after.json()["tasks"] == []
+
+
+def _notified_at(task_id):
+    from sqlalchemy import text
+    from app.database import engine
+
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT overdue_notified_at FROM tasks WHERE id = :id"), {"id": task_id}).scalar()
+
+
+def _mark_notified(task_id):
+    from sqlalchemy import text
+    from app.database import engine
+
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE tasks SET overdue_notified_at = due_date WHERE id = :id"), {"id": task_id})
+
+
+def test_put_and_patch_convert_offset_due_date(client, auth_headers):
+    task_id = client.post("/tasks/", json={"title": "edit"}, headers=auth_headers).json()["id"]
+    patched = client.patch(f"/tasks/{task_id}", json={"due_date": OFFSET_DUE, "version": 1}, headers=auth_headers)
+    assert patched.json()["due_date"] == UTC_DUE
+    put = client.put(f"/tasks/{task_id}", json={"due_date": "2030-01-01T16:56:00-01:00"}, headers=auth_headers)
+    assert put.json()["due_date"] == UTC_DUE
+
+
+def test_same_instant_in_another_offset_keeps_overdue_notification(client, auth_headers):
+    # UPDATE ke andar "due date badli?" check bhi converted value se hota hai
+    task_id = client.post("/tasks/", json={"title": "edit", "due_date": OFFSET_DUE}, headers=auth_headers).json()["id"]
+    _mark_notified(task_id)
+    client.patch(f"/tasks/{task_id}", json={"due_date": UTC_DUE + "Z", "version": 1}, headers=auth_headers)
+    assert _notified_at(task_id) is not None
+    client.patch(f"/tasks/{task_id}", json={"due_date": "2030-01-01T22:57:00+05:00", "version": 2}, headers=auth_headers)
+    assert _notified_at(task_id) is None
+
+
+def test_bulk_create_and_update_convert_offset_due_dates(client, auth_headers):
+    created = client.post("/tasks/bulk", json={"tasks": [{"title": "bulk", "due_date": OFFSET_DUE}]}, headers=auth_headers)
+    assert [t["due_date"] for t in created.json()] == [UTC_DUE]
+    task_id = created.json()[0]["id"]
+    _mark_notified(task_id)
+    updated = client.put(
+        "/tasks/bulk", json={"tasks": [{"id": task_id, "due_date": "2030-01-01T18:56:00+01:00"}]}, headers=auth_headers
+    )
+    assert [t["due_date"] for t in updated.json()] == [UTC_DUE]
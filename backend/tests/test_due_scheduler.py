@@ -0,0 +1,31 @@
+# backend/tests/test_due_scheduler.py
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from app.database import engine
+
+
+def _overdue_events(task_id):
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT count(*) FROM tenant_events WHERE type = 'task_overdue' AND payload LIKE :id"),
+            {"id": f'%"id":{task_id},%'},
+        ).scalar()
+
+
+def test_offset_due_date_fires_task_overdue_on_time(client, auth_headers):
+    # app.main (client fixture) ke baad import, warna routers ke saath circular import
+    from app.due_scheduler import scheduler
+
+    # Ek second baad due, lekin +05:00 offset mein likha hua
+    due = datetime.now(timezone(timedelta(hours=5))) + timedelta(seconds=1)
+    response = client.post("/tasks/", json={"title": "soon", "due_date": due.isoformat()}, headers=auth_headers)
+    task_id = response.json()["id"]
+    assert scheduler._due[task_id] == due.astimezone(timezone.utc).replace(tzinfo=None)
+
+    deadline = time.monotonic() + 5
+    while not _overdue_events(task_id) and time.monotonic() < deadline:
+        time.sleep(0.1)
+    assert _overdue_events(task_id) == 1
@@ -0,0 +1,26 @@
+# backend/tests/test_importer.py
+import io
+
+from app.importer import _parse_chunk, _records
+
+
+def test_parse_chunk_splits_rows_and_errors():
+    body = b'{"title": "a"}\n{"title": 5}\n\n{"title": "c"}\n{"title": "d"}\n'
+    records = _records(io.BytesIO(body), "ndjson")
+
+    rows, failures, done = _parse_chunk(records, 3)
+    assert [number for number, _ in rows] == [1, 4]
+    assert [number for number, _ in failures] == [2]
+    assert not done
+
+    rows, failures, done = _parse_chunk(records, 3)
+    assert [(number, row.title) for number, row in rows] == [(5, "d")]
+    assert failures == []
+    assert done
+
+
+def test_parse_chunk_csv_uses_defaults_for_empty_cells():
+    body = b"title,priority\nfirst,\nsecond,high\n"
+    rows, failures, done = _parse_chunk(_records(io.BytesIO(body), "csv"), 10)
+    assert done and not failures
+    assert [(row.title, row.priority.value) for _, row in rows] == [("first", "medium"), ("second", "high")]
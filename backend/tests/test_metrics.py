@@ -0,0 +1,25 @@
+# backend/tests/test_metrics.py
+
+
+def test_principal_cache_counters_are_on_metrics_not_the_api(client, auth_headers):
+    client.get("/users/me", headers=auth_headers)
+    body = client.get("/metrics").text
+    assert "principal_cache_hits_total" in body
+    assert "principal_cache_size" in body
+    # Saare tenants ke counters; kisi bhi signed-in user ko nahi dikhte
+    assert client.get("/auth/cache-stats", headers=auth_headers).status_code == 404
+
+
+def test_websocket_counters_are_on_metrics_not_the_api(client, auth_headers):
+    from app.routers.websocket import ConnectionManager
+
+    manager = ConnectionManager(coalesce_window_ms=0)
+    for size in (1, 3, 3, 200):
+        manager._observe_batch(size)
+    buckets = dict(manager.batch_size_buckets())
+    assert (buckets["1"], buckets["5"], buckets["100"], buckets["+Inf"]) == (1, 3, 3, 4)
+    assert manager.batch_size_sum == 207
+
+    assert "websocket_batch_size_bucket" in client.get("/metrics").text
+    # Doosre tenants ke connection/queue counts kisi signed-in user ko nahi dikhte
+    assert client.get("/ws/stats", headers=auth_headers).status_code == 404
@@ -0,0 +1,50 @@
+# backend/tests/test_shards.py
+import asyncio
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database import AsyncTenantSession, ShardRouter, TenantMoving, tenant_shards
+
+
+def _router():
+    scratch = tempfile.mkdtemp()
+    urls = {name: os.path.join(scratch, f"{name}.db") for name in ("default", "eu1")}
+    engines = {name: create_engine(f"sqlite:///{path}") for name, path in urls.items()}
+    async_engines = {name: create_async_engine(f"sqlite+aiosqlite:///{path}") for name, path in urls.items()}
+    tenant_shards.create(engines["default"])
+    with engines["default"].begin() as conn:
+        conn.execute(insert(tenant_shards), [
+            {"tenant_id": 7, "shard": "eu1", "moving": False},
+            {"tenant_id": 8, "shard": "eu1", "moving": True},
+        ])
+    return ShardRouter(engines, async_engines, ttl_seconds=60)
+
+
+def test_shard_of_async_uses_the_async_directory_engine(monkeypatch):
+    router = _router()
+
+    def blocking_lookup(tenant_id):
+        raise AssertionError("sync directory lookup on the event loop")
+
+    monkeypatch.setattr(router, "lookup", blocking_lookup)
+    assert asyncio.run(router.shard_of_async(7)) == "eu1"
+    assert asyncio.run(router.shard_of_async(99)) == "default"
+    # Cache garam hai: sync callers bhi lookup nahi karte
+    assert router.shard_of(7) == "eu1"
+    with pytest.raises(TenantMoving):
+        asyncio.run(router.shard_of_async(8))
+
+
+def test_async_session_bind_never_looks_up_the_directory(monkeypatch):
+    import app.database as database
+
+    router = _router()
+    monkeypatch.setattr(database, "shard_router", router)
+    with pytest.raises(RuntimeError):
+        AsyncTenantSession(info={"tenant_id": 7}).get_bind()
+    bind = AsyncTenantSession(info={"shard": "eu1"}).get_bind()
+    assert bind is router.async_engines["eu1"].sync_engine
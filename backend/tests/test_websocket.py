@@ -0,0 +1,125 @@
+# backend/tests/test_websocket.py
+import asyncio
+import time
+
+import orjson
+
+from app.backplane import InMemoryBackplane
+from app.routers.websocket import ConnectionManager
+
+
+class RecordingWebSocket:
+    def __init__(self):
+        self.sent = []
+        self.closed_with = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data):
+        self.sent.append(orjson.loads(data))
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+    async def close(self, code=1000, reason=None):
+        self.closed_with = (code, reason)
+
+
+def _manager():
+    return ConnectionManager(backplane=InMemoryBackplane(), coalesce_window_ms=0)
+
+
+async def _settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def test_member_removed_closes_that_members_sockets():
+    async def scenario():
+        manager = _manager()
+        removed, other = RecordingWebSocket(), RecordingWebSocket()
+        await manager.connect(removed, "1", user_id=2)
+        await manager.connect(other, "1", user_id=3)
+        await manager.broadcast("1", {"type": "member_removed", "data": {"id": 2}, "seq": 5})
+        await _settle()
+        return manager, removed, other
+
+    manager, removed, other = asyncio.run(scenario())
+    assert removed.closed_with == (1008, "Removed from team")
+    assert removed.sent == []
+    assert other.closed_with is None
+    assert [m["type"] for m in other.sent] == ["member_removed"]
+    assert set(manager.active_connections["1"]) == {other}
+
+
+def test_member_removed_from_another_worker_closes_socket():
+    async def scenario():
+        manager = _manager()
+        removed = RecordingWebSocket()
+        await manager.connect(removed, "1", user_id=2)
+        # Backplane se aaya coalesced batch
+        manager._deliver("1", orjson.dumps({
+            "type": "batch",
+            "events": [{"type": "member_removed", "data": {"id": 2}, "seq": 7}],
+        }).decode())
+        await _settle()
+        return manager, removed
+
+    manager, removed = asyncio.run(scenario())
+    assert removed.closed_with == (1008, "Removed from team")
+    assert "1" not in manager.active_connections
+
+
+def test_socket_closes_when_token_expires():
+    async def scenario():
+        manager = _manager()
+        websocket = RecordingWebSocket()
+        await manager.connect(websocket, "1", user_id=2, expires_at=time.time() + 0.05)
+        await _settle()
+        still_open = websocket.closed_with is None
+        await asyncio.sleep(0.1)
+        await _settle()
+        return manager, websocket, still_open
+
+    manager, websocket, still_open = asyncio.run(scenario())
+    assert still_open
+    assert websocket.closed_with == (1008, "Token expired")
+    assert "1" not in manager.active_connections
+
+
+class PublishingBackplane(InMemoryBackplane):
+    def __init__(self):
+        self.published = []
+        self.subscribed = set()
+
+    async def publish(self, tenant_id, payload):
+        self.published.append((tenant_id, payload))
+
+    async def subscribe(self, tenant_id):
+        self.subscribed.add(tenant_id)
+
+
+def test_principal_invalidation_reaches_other_workers():
+    from app.models.user import User
+    from app.principal_cache import principal_cache
+    from app.routers.websocket import PRINCIPALS_CHANNEL
+
+    async def scenario():
+        sender, receiver = PublishingBackplane(), PublishingBackplane()
+        here = ConnectionManager(backplane=sender, coalesce_window_ms=0)
+        there = ConnectionManager(backplane=receiver, coalesce_window_ms=0)
+        await here.start()
+        await there.start()
+        principal_cache.put(User(id=41, email="a@x.com", tenant_id=1, role="member"))
+        await here.invalidate_principal(41)
+        assert principal_cache.get(41) is None
+        # Doosre worker ki cache mein abhi bhi entry hai; backplane message use hatata hai
+        principal_cache.put(User(id=41, email="a@x.com", tenant_id=1, role="member"))
+        for channel, payload in sender.published:
+            there._deliver(channel, payload)
+        return receiver
+
+    receiver = asyncio.run(scenario())
+    assert PRINCIPALS_CHANNEL in receiver.subscribed
+    assert principal_cache.get(41) is None
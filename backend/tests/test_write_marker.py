@@ -0,0 +1,22 @@
+# backend/tests/test_write_marker.py
+import time
+
+from app.database import WriteMarker
+
+
+def test_marker_is_valid_on_any_instance_with_the_same_secret():
+    # Doosra worker = doosra WriteMarker object, koi shared memory nahi
+    marker = WriteMarker(5, "secret").issue(7)
+    assert WriteMarker(5, "secret").is_recent(marker, 7)
+    assert not WriteMarker(5, "other").is_recent(marker, 7)
+
+
+def test_marker_rejects_other_users_tampering_and_expiry():
+    writes = WriteMarker(0.05, "secret")
+    marker = writes.issue(7)
+    user, deadline, signature = marker.split(".")
+    assert not writes.is_recent(marker, 8)
+    assert not writes.is_recent(f"{user}.{int(deadline) + 60000}.{signature}", 7)
+    assert not writes.is_recent(None, 7)
+    time.sleep(0.06)
+    assert not writes.is_recent(marker, 7)
@@ -5,6 +5,7 @@ import {
   API_URL,
   logout,
   initializeModalListeners,
+  fetchAllTaskPages,
 } from "./utils.js";
 
 let allUsers = [];
@@ -213,17 +214,7 @@ async function fetchAndRenderTasks(isMyTasks = false) {
     const url = isMyTasks
       ? `${TASKS_ENDPOINT}?assigned_to_me=true`
       : TASKS_ENDPOINT;
-    const response = await fetch(url, {
-      headers: {
-        Authorization: `Bearer ${token}`,
-      },
-    });
-    if (!response.ok) {
-      const errorData = await response.json();
-      throw new Error(errorData.detail || "Failed to fetch tasks.");
-    }
-    const data = await response.json();
-    currentTasks = Array.isArray(data) ? data : data.tasks || [];
+    currentTasks = await fetchAllTaskPages(url, token);
     renderTasks(currentTasks);
     updateSummaryCounts();
   } catch (error) {
@@ -267,6 +258,7 @@ function renderTasks(tasks) {
     const taskCard = document.createElement("div");
     taskCard.className = "task-card";
     taskCard.dataset.taskId = task.id;
+    taskCard.dataset.version = task.version;
     taskCard.draggable = true;
     taskCard.innerHTML = `
       <h3>${task.title || "No Title"}</h3>
@@ -314,18 +306,31 @@ function updateSummaryCounts() {
   if (doneEl) doneEl.textContent = counts.done;
 }
 
-// Search tasks
+// Search tasks (server-side full-text search, typing ruk jaane ke baad)
+const SEARCH_DEBOUNCE_MS = 250;
 function setupSearchListener() {
   const searchInput = document.getElementById("search-tasks");
   if (searchInput) {
+    let debounceTimer = null;
+    let latestQuery = "";
     searchInput.addEventListener("input", () => {
-      const query = searchInput.value.toLowerCase();
-      const filteredTasks = currentTasks.filter(
-        (task) =>
-          task.title?.toLowerCase().includes(query) ||
-          (task.description && task.description.toLowerCase().includes(query))
-      );
-      renderTasks(filteredTasks);
+      clearTimeout(debounceTimer);
+      const query = searchInput.value.trim();
+      latestQuery = query;
+      if (!query) {
+        renderTasks(currentTasks);
+        return;
+      }
+      debounceTimer = setTimeout(async () => {
+        try {
+          const url = `${TASKS_ENDPOINT}/search?q=${encodeURIComponent(query)}`;
+          const results = await fetchAllTaskPages(url, getToken());
+          // Purane (slow) response naye query ke results ko overwrite na karein
+          if (query === latestQuery) renderTasks(results);
+        } catch (error) {
+          console.error("Error searching tasks:", error);
+        }
+      }, SEARCH_DEBOUNCE_MS);
     });
   }
 }
@@ -710,13 +715,20 @@ async function drop(e) {
       logout();
       return;
     }
+    const taskCard = document.querySelector(
+      `.task-card[data-task-id="${taskId}"]`
+    );
+    // Version ke saath PATCH: beech mein kisi aur ka edit overwrite nahi hota (409)
     const response = await fetch(`${TASKS_ENDPOINT}/${taskId}`, {
-      method: "PUT",
+      method: "PATCH",
       headers: {
         "Content-Type": "application/json",
         Authorization: `Bearer ${token}`,
       },
-      body: JSON.stringify({ status: newStatus }),
+      body: JSON.stringify({
+        status: newStatus,
+        version: Number(taskCard?.dataset.version),
+      }),
     });
     if (response.ok) {
       showMessageWithIcon("Success", "Task status updated!", "success");
@@ -724,6 +736,16 @@ async function drop(e) {
         document.getElementById("my-tasks-btn")?.classList.contains("active") ||
           false
       );
+    } else if (response.status === 409) {
+      showMessageWithIcon(
+        "Task Changed",
+        "Someone else updated this task. The board has been refreshed; please try again.",
+        "warning"
+      );
+      await fetchAndRenderTasks(
+        document.getElementById("my-tasks-btn")?.classList.contains("active") ||
+          false
+      );
     } else {
       const errorData = await response.json();
       showMessageWithIcon(
@@ -5,6 +5,7 @@ import {
   logout,
   API_URL,
   showMessageWithIcon,
+  fetchAllTaskPages,
 } from "./utils.js";
 
 // Page load par token check karein
@@ -172,15 +173,10 @@ async function fetchAndRenderTasks(isMyTasks = false) {
   const myTasksQuery = isMyTasks ? "?is_my_tasks=true" : "";
   try {
     const token = getToken();
-    const response = await fetch(`${TASKS_ENDPOINT}/${myTasksQuery}`, {
-      headers: {
-        Authorization: `Bearer ${token}`,
-      },
-    });
-    if (!response.ok) {
-      throw new Error("Failed to fetch tasks.");
-    }
-    currentTasks = await response.json();
+    currentTasks = await fetchAllTaskPages(
+      `${TASKS_ENDPOINT}/${myTasksQuery}`,
+      token
+    );
     renderTasks(currentTasks);
   } catch (error) {
     console.error("Error fetching tasks:", error);
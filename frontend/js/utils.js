@@ -110,6 +110,29 @@ function initializeModalListeners() {
   });
 }
 
+// GET /tasks/ paginated hai; next_cursor khatam hone tak saare pages jama karein
+async function fetchAllTaskPages(url, token) {
+  const tasks = [];
+  let cursor = null;
+  do {
+    const pageUrl = new URL(url);
+    if (cursor) pageUrl.searchParams.set("cursor", cursor);
+    const response = await fetch(pageUrl, {
+      headers: {
+        Authorization: `Bearer ${token}`,
+      },
+    });
+    if (!response.ok) {
+      const errorData = await response.json().catch(() => ({}));
+      throw new Error(errorData.detail || "Failed to fetch tasks.");
+    }
+    const page = await response.json();
+    tasks.push(...page.tasks);
+    cursor = page.next_cursor;
+  } while (cursor);
+  return tasks;
+}
+
 // Expose functions and API_URL globally for non-module scripts
 window.API_URL = API_URL;
 window.getToken = getToken;
@@ -117,6 +140,7 @@ window.logout = logout;
 window.showMessageWithIcon = showMessageWithIcon;
 window.confirmAction = confirmAction;
 window.initializeModalListeners = initializeModalListeners;
+window.fetchAllTaskPages = fetchAllTaskPages;
 
 // Export for ES modules
 export {
@@ -126,4 +150,5 @@ export {
   showMessageWithIcon,
   confirmAction,
   initializeModalListeners,
+  fetchAllTaskPages,
 };